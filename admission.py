@@ -0,0 +1,151 @@
+# === admission.py ===
+"""
+Admission control for expensive routes.
+
+Each limited route gets a ConcurrencyLimiter: a fixed number of requests
+run at once, a bounded number wait for a slot, and a single user can hold
+only a few of either. A request that would exceed any of these is rejected
+straight away (or after waiting too long) with a Retry-After estimate
+instead of queueing behind the burst, so cheap pages keep their threads.
+
+Limits are per web worker process; the effective site-wide limit is the
+per-worker limit times the number of workers.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, Optional
+
+REJECT_QUEUE_FULL = 'queue_full'
+REJECT_TIMEOUT = 'timeout'
+REJECT_USER_LIMIT = 'user_limit'
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when a limiter cannot admit a request"""
+
+    def __init__(self, name: str, reason: str, retry_after: int):
+        super().__init__(f"{name} is saturated ({reason}); retry after {retry_after}s")
+        self.name = name
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """
+    Bounded concurrency with a bounded wait queue and a per-user cap
+
+    Args:
+        name: Route or limiter name used in errors and metrics
+        concurrency: Requests admitted at once
+        max_waiting: Requests allowed to wait for a slot
+        per_user: Requests one user may have admitted or waiting
+        wait_timeout: Seconds a request waits for a slot before rejection
+    """
+
+    def __init__(self, name: str, concurrency: int, max_waiting: int = 0,
+                 per_user: Optional[int] = None, wait_timeout: float = 5.0):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.per_user = per_user
+        self.wait_timeout = wait_timeout
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._by_user: Dict[Hashable, int] = {}
+        # Smoothed time a request holds its slot, for Retry-After
+        self._hold_seconds = 1.0
+        self._stats = {'admitted': 0, 'rejected': 0, 'peak_waiting': 0,
+                       REJECT_QUEUE_FULL: 0, REJECT_TIMEOUT: 0, REJECT_USER_LIMIT: 0}
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog should have drained"""
+        backlog = (self._waiting + self._active) / max(self.concurrency, 1)
+        return max(1, math.ceil(backlog * self._hold_seconds))
+
+    def _reject(self, reason: str):
+        self._stats['rejected'] += 1
+        self._stats[reason] += 1
+        raise AdmissionRejected(self.name, reason, self.retry_after())
+
+    def acquire(self, user: Hashable = None):
+        """Take a slot, waiting up to wait_timeout; raises AdmissionRejected"""
+        with self._cond:
+            if user is not None and self.per_user is not None \
+                    and self._by_user.get(user, 0) >= self.per_user:
+                self._reject(REJECT_USER_LIMIT)
+
+            if self._active >= self.concurrency:
+                if self._waiting >= self.max_waiting:
+                    self._reject(REJECT_QUEUE_FULL)
+                self._waiting += 1
+                self._stats['peak_waiting'] = max(self._stats['peak_waiting'], self._waiting)
+                if user is not None:
+                    self._by_user[user] = self._by_user.get(user, 0) + 1
+                try:
+                    admitted = self._cond.wait_for(lambda: self._active < self.concurrency,
+                                                   timeout=self.wait_timeout)
+                finally:
+                    self._waiting -= 1
+                    if user is not None:
+                        self._release_user(user)
+                if not admitted:
+                    self._reject(REJECT_TIMEOUT)
+
+            self._active += 1
+            if user is not None:
+                self._by_user[user] = self._by_user.get(user, 0) + 1
+            self._stats['admitted'] += 1
+
+    def _release_user(self, user: Hashable):
+        remaining = self._by_user.get(user, 0) - 1
+        if remaining > 0:
+            self._by_user[user] = remaining
+        else:
+            self._by_user.pop(user, None)
+
+    def release(self, user: Hashable = None, held_seconds: Optional[float] = None):
+        with self._cond:
+            self._active -= 1
+            if user is not None:
+                self._release_user(user)
+            if held_seconds is not None:
+                self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held_seconds
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, user: Hashable = None) -> Iterator[None]:
+        self.acquire(user)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(user, time.monotonic() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'concurrency': self.concurrency,
+                'max_waiting': self.max_waiting,
+                'per_user': self.per_user,
+                'active': self._active,
+                'waiting': self._waiting,
+                'avg_hold_ms': round(self._hold_seconds * 1000, 1)
+            })
+        return stats
+
+
+class AdmissionControl:
+    """Named limiters configured from a dict of per-route settings"""
+
+    def __init__(self, limits: Dict[str, Dict[str, Any]]):
+        self.limiters = {name: ConcurrencyLimiter(name, **settings) for name, settings in limits.items()}
+
+    def __getitem__(self, name: str) -> ConcurrencyLimiter:
+        return self.limiters[name]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
@@ -2,20 +2,34 @@ import logging
 import sys
 import os
 import json
-import requests
 import time
 import sqlite3
 from datetime import datetime
 from functools import wraps
 from werkzeug.utils import secure_filename
 from werkzeug.security import generate_password_hash, check_password_hash
-from flask import Flask, request, render_template, jsonify, redirect, url_for, session, flash
+from flask import (Flask, Response, request, render_template, jsonify, redirect, url_for, session, flash,
+                   stream_with_context)
 import traceback
 import random
 import re
 import threading
 from concurrent.futures import ThreadPoolExecutor
-from resume_parser import parse_resume, match_resume_to_job, extract_text_from_file
+from resume_parser import (parse_resume, match_resume_to_job, extract_text_from_file,
+                           PARSER_VERSION, CHUNKING_VERSION, TIER_FULL, TIER_LITE,
+                           NLP_SERVICE_SOCKET)
+from resume_analysis import (APP_TAXONOMY_FINGERPRINT, EXTRACTION_WARMUP_TEXT, extract_contact_info,
+                             extract_skills_from_text, run_extractors)
+from parse_cache import ParseCache
+from text_extraction import DocumentExtractionError, extract_text
+from pipeline import StagedPipeline
+from extraction_pool import ExtractionPool
+from job_queue import JobQueue, QueueFull, STATUS_QUEUED, STATUS_RUNNING, STATUS_DONE, STATUS_FAILED
+from admission import AdmissionControl, AdmissionRejected
+from job_search import JobSearchClient
+from job_prefetch import JobPrefetcher
+from job_corpus import JobCorpus
+from periodic import PeriodicRefresh
 print("🚀 Starting SkillSense Backend with Enhanced Processing...")
 
 # Configure logging
@@ -32,11 +46,67 @@ app.config['PERMANENT_SESSION_LIFETIME'] = 3600
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['ALLOWED_EXTENSIONS'] = {'pdf', 'doc', 'docx', 'txt'}
+app.config['EXTRACT_MAX_PAGES'] = 10
+app.config['EXTRACT_MAX_CHARS'] = 200000
 app.config['DATABASE'] = 'database.db'
+app.config['PARSE_CACHE_DB'] = 'parse_cache.db'
+app.config['PARSE_CACHE_MEMORY_SIZE'] = 128
+app.config['PARSE_CACHE_MAX_ENTRIES'] = 5000
 
-# Thread pool for parallel processing
+# Keep uploaded files on disk; analysis itself always runs from memory
+app.config['RETAIN_UPLOADS'] = os.environ.get('RETAIN_UPLOADS', '1') != '0'
+
+# Per-request deadline and stage budgets (seconds) for /analyze and /job-match
+app.config['ANALYZE_DEADLINE'] = float(os.environ.get('ANALYZE_DEADLINE', '8'))
+app.config['ANALYZE_STAGE_BUDGETS'] = {
+    'parse': 5.0,
+    'roles': 0.5,
+    'jobs': 3.0,
+    'courses': 0.5
+}
+app.config['JOB_MATCH_DEADLINE'] = float(os.environ.get('JOB_MATCH_DEADLINE', '10'))
+app.config['JOB_MATCH_STAGE_BUDGETS'] = {
+    'resume': 5.0,
+    'job_description': 5.0
+}
+
+# Background analysis queue: concurrent jobs and the backlog accepted per worker
+app.config['ANALYSIS_WORKERS'] = int(os.environ.get('ANALYSIS_WORKERS', '2'))
+app.config['ANALYSIS_MAX_PENDING'] = int(os.environ.get('ANALYSIS_MAX_PENDING', '50'))
+# A job queued or running longer than this is re-queued (its worker died) or
+# failed (stuck in this worker); checked while clients poll job status
+app.config['ANALYSIS_STALE_AFTER'] = float(os.environ.get('ANALYSIS_STALE_AFTER', '600'))
+# Progress streams close after this long; EventSource reconnects with Last-Event-ID
+app.config['ANALYSIS_STREAM_SECONDS'] = 60
+app.config['ANALYSIS_STREAM_KEEPALIVE'] = 15
+
+# Worker processes for the CPU-bound resume extractors (0 runs them inline)
+app.config['EXTRACTION_WORKERS'] = int(os.environ.get('EXTRACTION_WORKERS', str(min(os.cpu_count() or 1, 4))))
+
+# Admission control for heavy upload routes (per worker process). Over the
+# limit, or after waiting 'wait_timeout' seconds for a slot, requests get
+# 429 with Retry-After so light pages keep their threads.
+app.config['ADMISSION_LIMITS'] = {
+    'analyze': {
+        'concurrency': int(os.environ.get('ANALYZE_CONCURRENCY', '4')),
+        'max_waiting': int(os.environ.get('ANALYZE_MAX_WAITING', '8')),
+        'per_user': 2,
+        'wait_timeout': 5.0
+    },
+    'job_match': {
+        'concurrency': int(os.environ.get('JOB_MATCH_CONCURRENCY', '2')),
+        'max_waiting': int(os.environ.get('JOB_MATCH_MAX_WAITING', '4')),
+        'per_user': 1,
+        'wait_timeout': 5.0
+    }
+}
+
+# Thread pool for background work (upload persistence)
 executor = ThreadPoolExecutor(max_workers=3)
 
+# Threads that run deadline-bounded pipeline stages
+stage_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='stage')
+
 # Create necessary directories
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs('templates', exist_ok=True)
@@ -48,213 +118,28 @@ JSEARCH_API_KEY = "d7c16a9efdmsh3f85b85a7b8ae51p14e8cfjsnfda220ee5c6f"
 JSEARCH_API_HOST = "jsearch.p.rapidapi.com"
 JSEARCH_API_URL = "https://jsearch.p.rapidapi.com/search"
 
-# --------------------------
-# COMPREHENSIVE SKILL DATABASE BY DEPARTMENT
-# --------------------------
-SKILL_DATABASE = {
-    # TECHNOLOGY SKILLS
-    'technology': {
-        'Programming Languages': [
-            'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Ruby', 'PHP', 'Swift', 
-            'Kotlin', 'Go', 'Rust', 'Scala', 'Perl', 'R', 'MATLAB', 'Dart', 'Elixir', 'Haskell'
-        ],
-        'Web Development': [
-            'HTML', 'HTML5', 'CSS', 'CSS3', 'SASS', 'LESS', 'React', 'React.js', 'Angular', 
-            'Angular.js', 'Vue', 'Vue.js', 'Next.js', 'Nuxt.js', 'Node.js', 'Express.js', 
-            'Django', 'Flask', 'FastAPI', 'Spring', 'Spring Boot', 'ASP.NET', 'Laravel', 
-            'Ruby on Rails', 'jQuery', 'Bootstrap', 'Tailwind', 'Material UI', 'Redux', 
-            'Webpack', 'Babel', 'REST API', 'GraphQL', 'API Development'
-        ],
-        'Databases': [
-            'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Cassandra', 'Oracle', 
-            'SQL Server', 'SQLite', 'DynamoDB', 'Firebase', 'MariaDB', 'CouchDB', 'Elasticsearch',
-            'Database Design', 'Data Modeling', 'Query Optimization'
-        ],
-        'Cloud & DevOps': [
-            'AWS', 'Amazon Web Services', 'Azure', 'Google Cloud', 'GCP', 'Docker', 
-            'Kubernetes', 'Jenkins', 'GitHub Actions', 'GitLab CI', 'CircleCI', 'Terraform', 
-            'Ansible', 'Puppet', 'Chef', 'CloudFormation', 'CI/CD', 'DevOps', 'Linux', 
-            'Unix', 'Bash', 'Shell Scripting', 'Nginx', 'Apache', 'Infrastructure as Code'
-        ],
-        'Data Science & ML': [
-            'Machine Learning', 'Deep Learning', 'Neural Networks', 'NLP', 'Natural Language Processing',
-            'Computer Vision', 'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'Pandas', 
-            'NumPy', 'SciPy', 'Matplotlib', 'Seaborn', 'Plotly', 'Jupyter', 'Data Analysis',
-            'Data Visualization', 'Statistics', 'Statistical Analysis', 'Feature Engineering',
-            'Model Deployment', 'MLOps', 'Big Data', 'Spark', 'Hadoop', 'Data Mining'
-        ],
-        'Mobile Development': [
-            'iOS', 'Android', 'Swift', 'Kotlin', 'React Native', 'Flutter', 'Xamarin', 
-            'Ionic', 'Mobile App Development', 'UI/UX for Mobile'
-        ],
-        'Testing': [
-            'Testing', 'Unit Testing', 'Integration Testing', 'Jest', 'Mocha', 'Chai',
-            'Selenium', 'Cypress', 'Puppeteer', 'JUnit', 'PyTest', 'QA', 'Quality Assurance',
-            'Test Automation', 'Manual Testing'
-        ],
-        'Tools & Methodologies': [
-            'Git', 'GitHub', 'GitLab', 'Bitbucket', 'JIRA', 'Confluence', 'Slack', 'Trello',
-            'Agile', 'Scrum', 'Kanban', 'Waterfall', 'Project Management', 'VS Code', 
-            'IntelliJ', 'Eclipse', 'Postman', 'Swagger', 'Figma', 'Adobe XD'
-        ],
-        'Security': [
-            'Cybersecurity', 'Network Security', 'Information Security', 'Encryption',
-            'Penetration Testing', 'Ethical Hacking', 'Security Auditing', 'CISSP',
-            'CompTIA Security+', 'Firewalls', 'SIEM', 'Incident Response'
-        ]
-    },
-    
-    # FINANCE SKILLS
-    'finance': {
-        'Financial Analysis': [
-            'Financial Analysis', 'Financial Modeling', 'Valuation', 'DCF', 'LBO', 'M&A',
-            'Financial Planning', 'Budgeting', 'Forecasting', 'Financial Reporting',
-            'Investment Analysis', 'Portfolio Management', 'Risk Management'
-        ],
-        'Accounting': [
-            'Accounting', 'Bookkeeping', 'GAAP', 'IFRS', 'Tax Preparation', 'Auditing',
-            'Accounts Payable', 'Accounts Receivable', 'General Ledger', 'Financial Statements',
-            'Balance Sheet', 'Income Statement', 'Cash Flow'
-        ],
-        'Investment': [
-            'Investment Banking', 'Private Equity', 'Venture Capital', 'Asset Management',
-            'Equity Research', 'Fixed Income', 'Derivatives', 'Trading', 'Hedge Funds',
-            'Wealth Management', 'Financial Advisory'
-        ],
-        'Financial Software': [
-            'Excel', 'Advanced Excel', 'VBA', 'Bloomberg Terminal', 'Reuters Eikon',
-            'QuickBooks', 'SAP FI', 'Oracle Financials', 'Peachtree', 'Tableau', 'Power BI'
-        ],
-        'Banking': [
-            'Commercial Banking', 'Retail Banking', 'Corporate Banking', 'Credit Analysis',
-            'Loan Processing', 'Mortgage', 'Wealth Management', 'Private Banking'
-        ],
-        'FinTech': [
-            'Blockchain', 'Cryptocurrency', 'Smart Contracts', 'Payments', 'Digital Banking',
-            'FinTech Regulations', 'Payment Gateways', 'Mobile Payments'
-        ]
-    },
-    
-    # MARKETING SKILLS
-    'marketing': {
-        'Digital Marketing': [
-            'SEO', 'Search Engine Optimization', 'SEM', 'Search Engine Marketing',
-            'PPC', 'Pay Per Click', 'Google Ads', 'Facebook Ads', 'Social Media Marketing',
-            'Content Marketing', 'Email Marketing', 'Marketing Automation'
-        ],
-        'Analytics': [
-            'Google Analytics', 'Data Analytics', 'Marketing Analytics', 'Conversion Rate Optimization',
-            'A/B Testing', 'Customer Analytics', 'Market Research', 'Competitive Analysis'
-        ],
-        'Brand Management': [
-            'Brand Strategy', 'Brand Management', 'Brand Development', 'Brand Identity',
-            'Marketing Strategy', 'Campaign Management', 'Product Marketing'
-        ],
-        'Content Creation': [
-            'Copywriting', 'Content Writing', 'Blogging', 'Technical Writing', 'Creative Writing',
-            'Video Production', 'Photography', 'Graphic Design', 'Adobe Creative Suite',
-            'Photoshop', 'Illustrator', 'InDesign', 'Canva'
-        ],
-        'Social Media': [
-            'Social Media Management', 'Community Management', 'Instagram', 'Facebook',
-            'Twitter', 'LinkedIn', 'TikTok', 'YouTube', 'Social Media Strategy'
-        ],
-        'PR & Communications': [
-            'Public Relations', 'Media Relations', 'Corporate Communications',
-            'Crisis Communication', 'Press Releases', 'Event Planning'
-        ]
-    },
-    
-    # HUMAN RESOURCES SKILLS
-    'hr': {
-        'Recruitment': [
-            'Recruiting', 'Talent Acquisition', 'Sourcing', 'Interviewing', 'Candidate Screening',
-            'Headhunting', 'Executive Search', 'Applicant Tracking Systems', 'Workday', 'Greenhouse'
-        ],
-        'HR Operations': [
-            'HR Management', 'HRIS', 'Employee Relations', 'Performance Management',
-            'Compensation & Benefits', 'Payroll', 'HR Policies', 'Compliance'
-        ],
-        'Training & Development': [
-            'Training', 'Learning & Development', 'Onboarding', 'Employee Training',
-            'Talent Management', 'Succession Planning', 'Coaching', 'Mentoring'
-        ],
-        'HR Strategy': [
-            'HR Strategy', 'Organizational Development', 'Workforce Planning',
-            'Change Management', 'Culture Building', 'Employee Engagement'
-        ],
-        'HR Compliance': [
-            'Labor Law', 'Employment Law', 'HR Compliance', 'EEO', 'OSHA',
-            'Workplace Safety', 'HR Auditing'
-        ]
-    },
-    
-    # SALES SKILLS
-    'sales': {
-        'Sales Techniques': [
-            'Sales', 'Business Development', 'Account Management', 'Lead Generation',
-            'Cold Calling', 'Negotiation', 'Closing', 'Upselling', 'Cross-selling'
-        ],
-        'Sales Management': [
-            'Sales Management', 'Sales Strategy', 'Sales Operations', 'Sales Forecasting',
-            'Territory Management', 'Team Leadership', 'Sales Training'
-        ],
-        'CRM': [
-            'Salesforce', 'HubSpot', 'Zoho CRM', 'Microsoft Dynamics', 'CRM Software',
-            'Customer Relationship Management'
-        ],
-        'B2B Sales': [
-            'B2B Sales', 'Enterprise Sales', 'Solution Selling', 'Consultative Selling',
-            'Strategic Partnerships', 'Channel Sales'
-        ],
-        'B2C Sales': [
-            'B2C Sales', 'Retail Sales', 'E-commerce', 'Direct Sales', 'Inside Sales'
-        ]
-    }
-}
+# Job search cache: results stay fresh for JOB_CACHE_TTL seconds; the URL can
+# be pointed at a local stub (see benchmarks/stub_jsearch.py)
+app.config['JSEARCH_API_URL'] = os.environ.get('JSEARCH_API_URL', JSEARCH_API_URL)
+app.config['JOB_CACHE_TTL'] = float(os.environ.get('JOB_CACHE_TTL', '3600'))
+app.config['JOB_CACHE_MEMORY_SIZE'] = 256
+# Analysis fetches jobs for this many predicted roles at once; lookups in
+# flight are capped at JOB_SEARCH_CONCURRENCY across all requests
+app.config['JOB_FANOUT_ROLES'] = int(os.environ.get('JOB_FANOUT_ROLES', '5'))
+app.config['JOB_SEARCH_CONCURRENCY'] = int(os.environ.get('JOB_SEARCH_CONCURRENCY', '8'))
 
-# Flatten skills with department info for better matching
-ALL_SKILLS_WITH_DEPT = []
-for dept, categories in SKILL_DATABASE.items():
-    for category, skills in categories.items():
-        for skill in skills:
-            ALL_SKILLS_WITH_DEPT.append({
-                'skill': skill.lower(),
-                'display': skill,
-                'category': category,
-                'department': dept
-            })
+# Postings from API responses (and JSONL imports, see job_corpus.py) are kept
+# here and searched when the API is unavailable
+app.config['JOB_CORPUS_DB'] = os.environ.get('JOB_CORPUS_DB', 'job_corpus.db')
 
-# Skill variations for better matching
-SKILL_VARIATIONS = {
-    'js': 'javascript',
-    'ts': 'typescript',
-    'py': 'python',
-    'ml': 'machine learning',
-    'dl': 'deep learning',
-    'k8s': 'kubernetes',
-    'tf': 'tensorflow',
-    'sklearn': 'scikit-learn',
-    'aws': 'amazon web services',
-    'gcp': 'google cloud platform',
-    'cpp': 'c++',
-    'csharp': 'c#',
-    'reactjs': 'react',
-    'vuejs': 'vue.js',
-    'nodejs': 'node.js',
-    'expressjs': 'express.js',
-    'd3': 'd3.js',
-    'ai': 'artificial intelligence',
-    'nlp': 'natural language processing',
-    'cv': 'computer vision',
-    'fintech': 'financial technology',
-    'seo': 'search engine optimization',
-    'sem': 'search engine marketing',
-    'ppc': 'pay per click',
-    'crm': 'customer relationship management',
-    'erp': 'enterprise resource planning',
-    'hris': 'human resource information system'
-}
+# Background prefetch of job listings for popular roles; the budget caps
+# upstream calls per hour (0 disables prefetching)
+app.config['JOB_PREFETCH_BUDGET_PER_HOUR'] = float(os.environ.get('JOB_PREFETCH_BUDGET_PER_HOUR', '60'))
+app.config['JOB_PREFETCH_TOP_ROLES'] = int(os.environ.get('JOB_PREFETCH_TOP_ROLES', '10'))
+app.config['JOB_PREFETCH_INTERVAL'] = 60
+
+# Shared dashboard content is rebuilt in the background this often (seconds)
+app.config['DASHBOARD_REFRESH_SECONDS'] = float(os.environ.get('DASHBOARD_REFRESH_SECONDS', '900'))
 
 # --------------------------
 # COMPREHENSIVE ROLE REQUIREMENTS BY DEPARTMENT
@@ -545,6 +430,10 @@ def init_database():
             education TEXT,
             experience TEXT,
             department TEXT,
+            pipeline_timings TEXT,
+            analysis_status TEXT,
+            analysis_job_id TEXT,
+            jobs_by_role TEXT,
             FOREIGN KEY (user_id) REFERENCES users(id)
         )
         ''')
@@ -610,6 +499,40 @@ def login_required(f):
             return redirect(url_for('login'))
         return f(*args, **kwargs)
     return decorated_function
+
+# --------------------------
+# ADMISSION CONTROL
+# --------------------------
+ADMISSION = AdmissionControl(app.config['ADMISSION_LIMITS'])
+
+def admission_limited(name):
+    """Run POSTs to the route under the named limiter; 429 when it is saturated"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != 'POST':
+                return f(*args, **kwargs)
+            # Checked before the upload body is parsed
+            try:
+                ADMISSION[name].acquire(session.get('user_id'))
+            except AdmissionRejected as e:
+                logger.warning(f"Rejected {request.path} for user {session.get('user_id')}: {e.reason}")
+                if request.path.startswith('/api/') or request.accept_mimetypes.best == 'application/json':
+                    response = jsonify({'error': 'Too many requests, retry shortly', 'retry_after': e.retry_after})
+                else:
+                    response = Response(render_template(
+                        'error.html', error=f'The server is busy. Please try again in {e.retry_after} seconds.'))
+                response.status_code = 429
+                response.headers['Retry-After'] = str(e.retry_after)
+                return response
+            start = time.monotonic()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                ADMISSION[name].release(session.get('user_id'), time.monotonic() - start)
+        return decorated_function
+    return decorator
+
 def migrate_database():
     """Add missing columns to existing tables"""
     try:
@@ -622,7 +545,8 @@ def migrate_database():
         
         # Columns that should exist
         required_columns = ['skills', 'top_roles', 'jobs', 'courses', 'ai_response', 
-                           'contact_info', 'education', 'experience', 'department']
+                           'contact_info', 'education', 'experience', 'department',
+                           'pipeline_timings', 'analysis_status', 'analysis_job_id', 'jobs_by_role']
         
         # Add missing columns
         for col in required_columns:
@@ -644,183 +568,74 @@ def migrate_database():
 migrate_database()
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
+
+def persist_upload(data, filepath):
+    """Write upload bytes to disk in the background, off the request path"""
+    def write():
+        try:
+            with open(filepath, 'wb') as f:
+                f.write(data)
+        except OSError as e:
+            logger.error(f"Could not persist upload {filepath}: {e}")
+    
+    executor.submit(write)
 # --------------------------
 # ADVANCED RESUME PARSING
 # --------------------------
-def extract_text_from_pdf(filepath):
-    """Fast text extraction"""
+def extract_text_from_pdf(source):
+    """Fast text extraction for PDF, DOCX and TXT uploads (path or bytes)"""
     try:
-        if filepath.lower().endswith('.pdf'):
-            try:
-                import PyPDF2
-                text = ""
-                with open(filepath, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages[:5]:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                if text.strip():
-                    return text
-            except:
-                pass
-        
-        # Try reading as text
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
-    except:
+        return extract_text(
+            source,
+            max_pages=app.config['EXTRACT_MAX_PAGES'],
+            max_chars=app.config['EXTRACT_MAX_CHARS']
+        )
+    except DocumentExtractionError as e:
+        logger.warning(f"Text extraction failed: {e}")
         return ""
 
-def extract_contact_info(text):
-    """Extract contact information"""
-    contact = {
-        'name': None,
-        'email': None,
-        'phone': None,
-        'linkedin': None,
-        'github': None
-    }
-    
-    lines = text.split('\n')[:10]
-    
-    # Extract name (usually first non-empty line)
-    for line in lines:
-        line = line.strip()
-        if line and len(line.split()) <= 4 and not any(x in line.lower() for x in ['@', 'http', 'www', 'phone', 'email']):
-            contact['name'] = line
-            break
-    
-    # Extract email
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    if emails:
-        contact['email'] = emails[0]
-    
-    # Extract phone
-    phone_pattern = r'(\+\d{1,3}[-.]?)?\(?\d{3}\)?[-.]?\d{3}[-.]?\d{4}'
-    phones = re.findall(phone_pattern, text)
-    if phones:
-        contact['phone'] = phones[0]
-    
-    # Extract LinkedIn
-    linkedin_pattern = r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+'
-    linkedin = re.findall(linkedin_pattern, text, re.IGNORECASE)
-    if linkedin:
-        contact['linkedin'] = linkedin[0]
-    
-    # Extract GitHub
-    github_pattern = r'(?:https?://)?(?:www\.)?github\.com/[\w-]+'
-    github = re.findall(github_pattern, text, re.IGNORECASE)
-    if github:
-        contact['github'] = github[0]
-    
-    return contact
+# --------------------------
+# PARSE RESULT CACHE
+# --------------------------
+PARSE_CACHE = ParseCache(
+    app.config['PARSE_CACHE_DB'],
+    memory_size=app.config['PARSE_CACHE_MEMORY_SIZE'],
+    max_entries=app.config['PARSE_CACHE_MAX_ENTRIES']
+)
 
-def extract_education(text):
-    """Extract education information"""
-    education = []
-    edu_keywords = ['bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'b.sc', 'm.sc', 
-                    'bca', 'mca', 'mba', 'degree', 'university', 'college', 'institute']
-    
-    lines = text.split('\n')
-    for i, line in enumerate(lines):
-        line_lower = line.lower()
-        if any(keyword in line_lower for keyword in edu_keywords):
-            edu_text = line.strip()
-            # Get next line if it's part of education
-            if i + 1 < len(lines) and len(lines[i + 1].strip()) > 0:
-                next_line = lines[i + 1].strip()
-                if not any(x in next_line.lower() for x in ['experience', 'skill', 'project']):
-                    edu_text += " " + next_line
-            education.append(edu_text)
-    
-    return list(set(education))[:3]
+# Bump when analyze_resume_text output changes for the same input text
+ANALYZE_REVISION = 4
 
-def extract_experience_summary(text):
-    """Extract work experience summary"""
-    exp_keywords = ['experience', 'work', 'employment', 'job']
-    experience = []
-    
-    lines = text.split('\n')
-    exp_section = False
-    
-    for i, line in enumerate(lines):
-        line_lower = line.lower()
-        
-        # Find experience section
-        if any(keyword in line_lower for keyword in exp_keywords) and 'summary' not in line_lower:
-            exp_section = True
-            continue
-        
-        # Extract experience entries (usually with dates)
-        if exp_section and re.search(r'\b(19|20)\d{2}\b', line):
-            exp_text = line.strip()
-            # Get next few lines for context
-            for j in range(1, 4):
-                if i + j < len(lines) and lines[i + j].strip():
-                    next_line = lines[i + j].strip()
-                    if not any(x in next_line.lower() for x in ['education', 'skill', 'project']):
-                        exp_text += " " + next_line
-                    else:
-                        break
-            experience.append(exp_text)
-        
-        # End of experience section
-        if exp_section and any(keyword in line_lower for keyword in ['education', 'skill', 'project']):
-            exp_section = False
-    
-    return experience[:5]
+# Namespaces tie cached results to the producer and its taxonomy/model revision
+ANALYZE_CACHE_NAMESPACE = f"analyze:{ANALYZE_REVISION}:{APP_TAXONOMY_FINGERPRINT[:16]}"
+RESUME_CACHE_NAMESPACE = f"resume:{PARSER_VERSION}"
+JOB_CACHE_NAMESPACE = f"job:{PARSER_VERSION}:{CHUNKING_VERSION}"
 
-def extract_skills_from_text(text):
-    """Extract ALL skills from text with department categorization"""
-    text_lower = text.lower()
-    found_skills = []
-    skills_by_department = {}
-    
-    # Check each skill
-    for skill_info in ALL_SKILLS_WITH_DEPT:
-        skill = skill_info['skill']
-        # Check exact match
-        if skill in text_lower:
-            found_skills.append(skill_info['display'])
-            
-            # Track by department
-            dept = skill_info['department']
-            if dept not in skills_by_department:
-                skills_by_department[dept] = []
-            skills_by_department[dept].append(skill_info['display'])
-        
-        # Check word boundary match
-        elif re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-            found_skills.append(skill_info['display'])
-            dept = skill_info['department']
-            if dept not in skills_by_department:
-                skills_by_department[dept] = []
-            skills_by_department[dept].append(skill_info['display'])
-    
-    # Check variations
-    for abbr, full in SKILL_VARIATIONS.items():
-        if abbr in text_lower:
-            # Find the full skill info
-            for skill_info in ALL_SKILLS_WITH_DEPT:
-                if skill_info['skill'] == full:
-                    if skill_info['display'] not in found_skills:
-                        found_skills.append(skill_info['display'])
-                        dept = skill_info['department']
-                        if dept not in skills_by_department:
-                            skills_by_department[dept] = []
-                        skills_by_department[dept].append(skill_info['display'])
-                    break
-    
-    # Remove duplicates while preserving order
-    unique_skills = []
-    for skill in found_skills:
-        if skill not in unique_skills:
-            unique_skills.append(skill)
-    
+# --------------------------
+# EXTRACTION PROCESS POOL
+# --------------------------
+# The extractors are GIL-bound regex work, so they run in long-lived worker
+# processes forked after the taxonomy is loaded; the text is shipped once per task
+EXTRACTION_POOL = ExtractionPool(app.config['EXTRACTION_WORKERS'],
+                                 warmup=lambda: run_extractors(EXTRACTION_WARMUP_TEXT))
+EXTRACTION_POOL.start()
+
+def analyze_resume_text(resume_text, timeout=None):
+    """Run every app-level extractor over resume text; raises TimeoutError past timeout"""
+    return EXTRACTION_POOL.run(run_extractors, resume_text, timeout=timeout)
+
+def analyze_resume_quick(file_bytes):
+    """Degraded analysis for an overrun parse stage: first page, contact and skills"""
+    try:
+        resume_text = extract_text(file_bytes, max_pages=1, max_chars=20000)
+    except DocumentExtractionError as e:
+        logger.warning(f"Quick extraction failed: {e}")
+        resume_text = ""
     return {
-        'all': unique_skills[:30],
-        'by_department': skills_by_department
+        'contact_info': extract_contact_info(resume_text),
+        'education': [],
+        'experience': [],
+        'skills': extract_skills_from_text(resume_text)
     }
 
 # --------------------------
@@ -879,31 +694,54 @@ def predict_top_roles(skills_result):
 # --------------------------
 # JOB SEARCH
 # --------------------------
-def get_jobs_for_role(role):
-    """Get job listings"""
-    try:
-        headers = {
-            "X-RapidAPI-Key": JSEARCH_API_KEY,
-            "X-RapidAPI-Host": JSEARCH_API_HOST
-        }
-        querystring = {"query": role, "num_pages": "1", "page": "1"}
-        
-        response = requests.get(JSEARCH_API_URL, headers=headers, params=querystring, timeout=3)
-        
-        if response.status_code == 200:
-            data = response.json()
-            jobs = []
-            for job in data.get("data", [])[:5]:
-                title = job.get("job_title", "No Title")
-                link = job.get("job_apply_link") or "#"
-                company = job.get("employer_name", "")
-                jobs.append((f"{title} at {company}", link))
-            if jobs:
-                return jobs
-    except:
-        pass
-    
-    # Fallback
+JOB_CORPUS = JobCorpus(app.config['JOB_CORPUS_DB'])
+
+JOB_SEARCH = JobSearchClient(
+    app.config['JSEARCH_API_URL'],
+    JSEARCH_API_KEY,
+    JSEARCH_API_HOST,
+    app.config['PARSE_CACHE_DB'],
+    ttl=app.config['JOB_CACHE_TTL'],
+    memory_size=app.config['JOB_CACHE_MEMORY_SIZE'],
+    fanout_workers=app.config['JOB_SEARCH_CONCURRENCY'],
+    on_fetch=JOB_CORPUS.add_api_results
+)
+
+JOB_PREFETCHER = JobPrefetcher(
+    JOB_SEARCH,
+    app.config['DATABASE'],
+    known_roles=list(ROLE_REQUIREMENTS),
+    top_n=app.config['JOB_PREFETCH_TOP_ROLES'],
+    budget_per_hour=app.config['JOB_PREFETCH_BUDGET_PER_HOUR'],
+    interval=app.config['JOB_PREFETCH_INTERVAL'],
+    # Refresh a little before the entry would expire for a user request
+    refresh_margin=min(300, app.config['JOB_CACHE_TTL'] / 4)
+)
+if app.config['JOB_PREFETCH_BUDGET_PER_HOUR'] > 0:
+    JOB_PREFETCHER.start()
+
+def get_jobs_for_role(role, timeout=3, skills=()):
+    """Get job listings (cached per role; local corpus or search links if none)"""
+    jobs = JOB_SEARCH.search(role, timeout=timeout)
+    if jobs:
+        return jobs
+    return fallback_job_links(role, skills)
+
+def get_jobs_for_roles(roles, timeout=3, skills=()):
+    """Job listings for several roles fetched concurrently, as [role, jobs] pairs"""
+    # Keep a little of the budget for gathering, so partial results make it back
+    found = JOB_SEARCH.search_roles(roles, timeout=max(timeout - 0.2, 0.1))
+    return [[role, jobs or fallback_job_links(role, skills)] for role, jobs in found.items()]
+
+def fallback_job_links(role, skills=()):
+    """Offline job suggestions: best local corpus matches, else static job-board search links"""
+    jobs = JOB_CORPUS.search(role, skills)
+    if jobs:
+        return jobs
+    return static_job_links(role)
+
+def static_job_links(role):
+    """Static job-board search links, used when nothing else is available"""
     search_term = role.lower().replace(' ', '-')
     return [
         (f"{role} - LinkedIn", f"https://www.linkedin.com/jobs/search/?keywords={search_term}"),
@@ -916,6 +754,13 @@ def get_jobs_for_role(role):
 # --------------------------
 # COURSE RECOMMENDATIONS (PRESERVED)
 # --------------------------
+# Popular courses used to pad short recommendation lists
+BASELINE_COURSES = [
+    ('Python', 'Python for Everybody – Coursera'),
+    ('JavaScript', 'Modern JavaScript – The Odin Project'),
+    ('SQL', 'The Complete SQL Bootcamp – Udemy')
+]
+
 def recommend_courses(skills):
     """Fast course recommendations"""
     recommended = []
@@ -932,12 +777,7 @@ def recommend_courses(skills):
                 break
     
     if len(recommended) < 3:
-        popular = [
-            ('Python', 'Python for Everybody – Coursera'),
-            ('JavaScript', 'Modern JavaScript – The Odin Project'),
-            ('SQL', 'The Complete SQL Bootcamp – Udemy')
-        ]
-        for item in popular:
+        for item in BASELINE_COURSES:
             if item[1] not in added_courses:
                 recommended.append(item)
                 added_courses.add(item[1])
@@ -1055,6 +895,28 @@ def logout():
     flash('Logged out', 'info')
     return redirect(url_for('login'))
 
+# Demo content shown on every dashboard; identical for all users, so it is
+# built in the background and the page never waits on the job search API
+DASHBOARD_DEMO_SKILLS = ['Python', 'JavaScript', 'SQL', 'Communication']
+DASHBOARD_DEMO_ROLES = [['Software Engineer', 92], ['Data Scientist', 88], ['DevOps Engineer', 85]]
+
+def build_dashboard_payload(offline=False):
+    """Shared dashboard sections; offline uses static job links instead of the API"""
+    role = DASHBOARD_DEMO_ROLES[0][0]
+    return {
+        'skills': DASHBOARD_DEMO_SKILLS,
+        'top_roles': DASHBOARD_DEMO_ROLES,
+        'jobs': fallback_job_links(role) if offline else get_jobs_for_role(role),
+        'courses': recommend_courses({'all': DASHBOARD_DEMO_SKILLS})
+    }
+
+DASHBOARD_PAYLOAD = PeriodicRefresh(
+    'dashboard',
+    build_dashboard_payload,
+    interval=app.config['DASHBOARD_REFRESH_SECONDS'],
+    seed=lambda: build_dashboard_payload(offline=True)
+).start()
+
 @app.route('/dashboard')
 @login_required
 def dashboard():
@@ -1071,93 +933,210 @@ def dashboard():
     db.close()
     
     recent_uploads = [dict(r) for r in recent]
-    
-    skills = ['Python', 'JavaScript', 'SQL', 'Communication']
-    top_roles = [['Software Engineer', 92], ['Data Scientist', 88], ['DevOps Engineer', 85]]
-    jobs = get_jobs_for_role('Software Engineer')
-    courses = recommend_courses({'all': skills})
+    payload = DASHBOARD_PAYLOAD.get()
     
     return render_template('index.html',
                           user=user_data,
                           recent_uploads=recent_uploads,
-                          skills=skills,
-                          top_roles=top_roles,
-                          jobs=jobs,
-                          courses=courses,
+                          skills=payload['skills'],
+                          top_roles=payload['top_roles'],
+                          jobs=payload['jobs'],
+                          courses=payload['courses'],
                           show_results=False,
                           now=datetime.now())
 
-@app.route('/analyze', methods=['POST'])
-@login_required
-def analyze():
-    """Fast resume analysis with comprehensive parsing"""
+def run_analysis_job(payload, file_bytes, progress):
+    """Background job: analyze an upload and fill in its user_uploads row"""
+    upload_id = payload['upload_id']
+    db = get_db()
+    db.execute('UPDATE user_uploads SET analysis_status = ? WHERE id = ?', (STATUS_RUNNING, upload_id))
+    db.commit()
+    db.close()
+    
+    # The row already points at filepath, so write it whatever the analysis outcome
+    if payload['filepath']:
+        persist_upload(file_bytes, payload['filepath'])
+    
     try:
-        if 'resume_file' not in request.files:
-            flash('No file selected', 'error')
-            return redirect(url_for('dashboard'))
+        # Every stage runs under its own budget and the request deadline;
+        # an overrunning or failing stage is replaced by a cheap fallback
+        pipeline = StagedPipeline(stage_executor, app.config['ANALYZE_DEADLINE'],
+                                  app.config['ANALYZE_STAGE_BUDGETS'])
         
-        file = request.files['resume_file']
-        if file.filename == '':
-            flash('No file selected', 'error')
-            return redirect(url_for('dashboard'))
+        # Partial results are published as each stage finishes (see /api/jobs/<id>/events)
+        parse_finished = threading.Event()
+        text_reported = threading.Event()
         
-        if not allowed_file(file.filename):
-            flash('Invalid file type', 'error')
-            return redirect(url_for('dashboard'))
-        
-        # Save file
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{filename}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        extracted = {'characters': 0}
         
-        # Extract text
-        resume_text = extract_text_from_pdf(filepath)
+        def extract_and_analyze(timeout):
+            started = time.monotonic()
+            resume_text = extract_text_from_pdf(file_bytes)
+            extracted['characters'] = len(resume_text.strip())
+            # A parse that overran its budget finishes in the background; stay quiet then
+            if not parse_finished.is_set():
+                progress('text', {'characters': len(resume_text), 'cached': False})
+                text_reported.set()
+            # Bound the pool call by what is left of the stage budget, so a hung
+            # extraction worker cannot hold this thread indefinitely
+            return analyze_resume_text(resume_text, timeout=max(0.1, timeout - (time.monotonic() - started)))
         
-        # Extract all information in parallel
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            contact_future = executor.submit(extract_contact_info, resume_text)
-            education_future = executor.submit(extract_education, resume_text)
-            experience_future = executor.submit(extract_experience_summary, resume_text)
-            skills_future = executor.submit(extract_skills_from_text, resume_text)
-            
-            contact_info = contact_future.result()
-            education = education_future.result()
-            experience = experience_future.result()
-            skills_result = skills_future.result()
+        # Identical uploads reuse the stored extraction results. An empty or
+        # failed extraction is not cached, so a re-upload gets another try
+        cache_key = ParseCache.make_key(file_bytes, ANALYZE_CACHE_NAMESPACE)
+        analysis = pipeline.run(
+            'parse',
+            lambda timeout: PARSE_CACHE.get_or_compute(
+                cache_key, lambda: extract_and_analyze(timeout),
+                cacheable=lambda result: extracted['characters'] > 0
+            ),
+            fallback=lambda: analyze_resume_quick(file_bytes)
+        )
+        parse_finished.set()
+        if pipeline.stages[-1]['status'] != 'ok':
+            progress('text', {'degraded': True})
+        elif not text_reported.is_set():
+            progress('text', {'cached': True})
+        contact_info = analysis['contact_info']
+        education = analysis['education']
+        experience = analysis['experience']
+        skills_result = analysis['skills']
+        progress('contacts', {'contact_info': contact_info, 'education': education, 'experience': experience})
+        progress('skills', {'skills': skills_result['all'], 'by_department': skills_result['by_department']})
         
         # Predict roles based on extracted skills
-        top_roles = predict_top_roles(skills_result)
+        top_roles = pipeline.run('roles', lambda timeout: predict_top_roles(skills_result),
+                                 fallback=lambda: [])
+        progress('roles', {'top_roles': top_roles})
         
-        # Get jobs and courses
-        primary_role = top_roles[0][0] if top_roles else "Software Engineer"
-        jobs = get_jobs_for_role(primary_role)
-        courses = recommend_courses(skills_result)
+        # Get jobs for every suggested role in one concurrent round trip, and courses
+        job_roles = [role for role, _ in top_roles[:app.config['JOB_FANOUT_ROLES']]] or ["Software Engineer"]
+        job_skills = skills_result['all']
+        jobs_by_role = pipeline.run('jobs', lambda timeout: get_jobs_for_roles(job_roles, timeout, job_skills),
+                                    fallback=lambda: [[role, fallback_job_links(role, job_skills)]
+                                                      for role in job_roles])
+        jobs = jobs_by_role[0][1]
+        progress('jobs', {'jobs': jobs, 'jobs_by_role': jobs_by_role})
+        courses = pipeline.run('courses', lambda timeout: recommend_courses(skills_result),
+                               fallback=lambda: list(BASELINE_COURSES))
+        progress('courses', {'courses': courses})
+        timings = pipeline.report()
+        if timings['fallbacks']:
+            logger.warning(f"Analysis degraded, fallbacks used: {', '.join(timings['fallbacks'])}")
         
         # Save to database
         db = get_db()
-        cursor = db.execute('''
-            INSERT INTO user_uploads 
-            (user_id, filename, filepath, skills, top_roles, jobs, courses, contact_info, education, experience)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        db.execute('''
+            UPDATE user_uploads
+            SET skills = ?, top_roles = ?, jobs = ?, jobs_by_role = ?, courses = ?, contact_info = ?,
+                education = ?, experience = ?, pipeline_timings = ?, analysis_status = ?
+            WHERE id = ?
         ''', (
-            session['user_id'],
-            filename,
-            filepath,
             json.dumps(skills_result['all']),
             json.dumps(top_roles),
             json.dumps(jobs),
+            json.dumps(jobs_by_role),
             json.dumps(courses),
             json.dumps(contact_info),
             json.dumps(education),
-            json.dumps(experience)
+            json.dumps(experience),
+            json.dumps(timings),
+            STATUS_DONE,
+            upload_id
         ))
         db.commit()
-        upload_id = cursor.lastrowid
         db.close()
+    except Exception:
+        db = get_db()
+        db.execute('UPDATE user_uploads SET analysis_status = ? WHERE id = ?', (STATUS_FAILED, upload_id))
+        db.commit()
+        db.close()
+        raise
+    
+    return {'upload_id': upload_id, 'skills_found': len(skills_result['all'])}
+
+def mark_analysis_abandoned(payload):
+    """A stuck analysis job was failed by the queue; let its upload show that"""
+    db = get_db()
+    db.execute('UPDATE user_uploads SET analysis_status = ? WHERE id = ? AND analysis_status IN (?, ?)',
+               (STATUS_FAILED, payload.get('upload_id'), STATUS_QUEUED, STATUS_RUNNING))
+    db.commit()
+    db.close()
+
+# --------------------------
+# BACKGROUND ANALYSIS QUEUE
+# --------------------------
+ANALYSIS_QUEUE = JobQueue(
+    app.config['DATABASE'],
+    'analyze',
+    run_analysis_job,
+    max_workers=app.config['ANALYSIS_WORKERS'],
+    max_pending=app.config['ANALYSIS_MAX_PENDING'],
+    stale_after=app.config['ANALYSIS_STALE_AFTER'],
+    on_abandon=mark_analysis_abandoned
+)
+ANALYSIS_QUEUE.recover()
+
+def submit_analysis(file):
+    """Validate an uploaded resume, create its upload row and queue the analysis"""
+    filename = secure_filename(file.filename)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{timestamp}_{filename}"
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename) if app.config['RETAIN_UPLOADS'] else ''
+    file_bytes = file.read()
+    
+    # The row exists from the start so /view can show the pending analysis
+    db = get_db()
+    cursor = db.execute('''
+        INSERT INTO user_uploads (user_id, filename, filepath, analysis_status)
+        VALUES (?, ?, ?, ?)
+    ''', (session['user_id'], filename, filepath, STATUS_QUEUED))
+    db.commit()
+    upload_id = cursor.lastrowid
+    
+    try:
+        job_id = ANALYSIS_QUEUE.submit(
+            session['user_id'],
+            {'upload_id': upload_id, 'filename': filename, 'filepath': filepath},
+            file_bytes
+        )
+    except QueueFull:
+        db.execute('DELETE FROM user_uploads WHERE id = ?', (upload_id,))
+        db.commit()
+        db.close()
+        raise
+    
+    db.execute('UPDATE user_uploads SET analysis_job_id = ? WHERE id = ?', (job_id, upload_id))
+    db.commit()
+    db.close()
+    return job_id, upload_id
+
+@app.route('/analyze', methods=['POST'])
+@login_required
+@admission_limited('analyze')
+def analyze():
+    """Queue resume analysis and show the upload page while it runs"""
+    try:
+        if 'resume_file' not in request.files:
+            flash('No file selected', 'error')
+            return redirect(url_for('dashboard'))
+        
+        file = request.files['resume_file']
+        if file.filename == '':
+            flash('No file selected', 'error')
+            return redirect(url_for('dashboard'))
+        
+        if not allowed_file(file.filename):
+            flash('Invalid file type', 'error')
+            return redirect(url_for('dashboard'))
+        
+        try:
+            _, upload_id = submit_analysis(file)
+        except QueueFull:
+            flash('We are processing many resumes right now. Please try again in a minute.', 'error')
+            return redirect(url_for('dashboard'))
         
-        flash('Analysis complete! Found {} skills'.format(len(skills_result['all'])), 'success')
+        flash('Resume received! Analysis is running...', 'success')
         return redirect(url_for('view_upload', upload_id=upload_id))
         
     except Exception as e:
@@ -1165,6 +1144,97 @@ def analyze():
         flash('Analysis failed', 'error')
         return redirect(url_for('dashboard'))
 
+@app.route('/api/analyze', methods=['POST'])
+@login_required
+@admission_limited('analyze')
+def api_analyze():
+    """Queue resume analysis; returns the job id immediately"""
+    file = request.files.get('resume_file')
+    if file is None or file.filename == '' or not allowed_file(file.filename):
+        return jsonify({'error': 'A PDF, DOCX or TXT file is required in resume_file'}), 400
+    
+    try:
+        job_id, upload_id = submit_analysis(file)
+    except QueueFull:
+        return jsonify({'error': 'Analysis queue is full, retry shortly'}), 429, {'Retry-After': '30'}
+    
+    return jsonify({
+        'job_id': job_id,
+        'upload_id': upload_id,
+        'status': STATUS_QUEUED,
+        'status_url': url_for('api_job_status', job_id=job_id),
+        'view_url': url_for('view_upload', upload_id=upload_id)
+    }), 202
+
+@app.route('/api/jobs/<job_id>')
+@login_required
+def api_job_status(job_id):
+    """Status of a background analysis job"""
+    job = ANALYSIS_QUEUE.get(job_id)
+    if not job or job['user_id'] != session['user_id']:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    upload_id = job['payload'].get('upload_id')
+    return jsonify({
+        'job_id': job_id,
+        'status': job['status'],
+        'upload_id': upload_id,
+        'view_url': url_for('view_upload', upload_id=upload_id),
+        'result': job['result'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'finished_at': job['finished_at']
+    })
+
+def sse_message(event, data, event_id=None):
+    """Format one Server-Sent Events message"""
+    message = f"id: {event_id}\n" if event_id is not None else ''
+    return message + f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/jobs/<job_id>/events')
+@login_required
+def api_job_events(job_id):
+    """Server-Sent Events stream of partial results while an analysis job runs"""
+    job = ANALYSIS_QUEUE.get(job_id)
+    if not job or job['user_id'] != session['user_id']:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    try:
+        last_seq = int(request.headers.get('Last-Event-ID') or request.args.get('after') or 0)
+    except ValueError:
+        last_seq = 0
+    view_url = url_for('view_upload', upload_id=job['payload'].get('upload_id'))
+    
+    def stream():
+        seq = last_seq
+        started = last_sent = time.monotonic()
+        yield 'retry: 2000\n\n'
+        while True:
+            job = ANALYSIS_QUEUE.get(job_id)
+            # Progress is recorded before the job finishes, so drain after reading the status
+            for event in ANALYSIS_QUEUE.events(job_id, seq):
+                seq = event['seq']
+                last_sent = time.monotonic()
+                yield sse_message(event['stage'], event['data'], seq)
+            
+            if job is None or job['status'] in (STATUS_DONE, STATUS_FAILED):
+                status = job['status'] if job else STATUS_FAILED
+                yield sse_message(status, {'view_url': view_url, 'error': job['error'] if job else 'Job not found'})
+                return
+            
+            now = time.monotonic()
+            if now - started >= app.config['ANALYSIS_STREAM_SECONDS']:
+                return
+            if now - last_sent >= app.config['ANALYSIS_STREAM_KEEPALIVE']:
+                last_sent = now
+                yield ': keepalive\n\n'
+            ANALYSIS_QUEUE.wait(0.5)
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/view/<int:upload_id>')
 @login_required
 def view_upload(upload_id):
@@ -1179,25 +1249,44 @@ def view_upload(upload_id):
         flash('Upload not found', 'error')
         return redirect(url_for('dashboard'))
     
+    user_data = {
+        'username': session.get('username', 'User'),
+        'full_name': session.get('full_name', 'User')
+    }
+    
+    # Analysis still queued or running: the page polls the job and reloads
+    if upload['analysis_status'] in (STATUS_QUEUED, STATUS_RUNNING):
+        return render_template('index.html',
+                              user=user_data,
+                              filename=upload['filename'],
+                              pending_job={
+                                  'status': upload['analysis_status'],
+                                  'status_url': url_for('api_job_status', job_id=upload['analysis_job_id']),
+                                  'events_url': url_for('api_job_events', job_id=upload['analysis_job_id'])
+                              },
+                              show_results=False,
+                              now=datetime.now())
+    
+    if upload['analysis_status'] == STATUS_FAILED:
+        flash('Analysis failed for this upload. Please try uploading it again.', 'error')
+        return redirect(url_for('dashboard'))
+    
     # Parse data
     skills = json.loads(upload['skills']) if upload['skills'] else []
     top_roles = json.loads(upload['top_roles']) if upload['top_roles'] else []
     jobs = json.loads(upload['jobs']) if upload['jobs'] else []
+    jobs_by_role = json.loads(upload['jobs_by_role']) if upload['jobs_by_role'] else []
     courses = json.loads(upload['courses']) if upload['courses'] else []
     contact_info = json.loads(upload['contact_info']) if upload['contact_info'] else {}
     education = json.loads(upload['education']) if upload['education'] else []
     experience = json.loads(upload['experience']) if upload['experience'] else []
     
-    user_data = {
-        'username': session.get('username', 'User'),
-        'full_name': session.get('full_name', 'User')
-    }
-    
     return render_template('index.html',
                           user=user_data,
                           skills=skills,
                           top_roles=top_roles,
                           jobs=jobs,
+                          jobs_by_role=jobs_by_role,
                           courses=courses,
                           contact_info=contact_info,
                           education=education,
@@ -1269,6 +1358,7 @@ def get_db_connection():
     return get_db()
 @app.route('/job-match', methods=['GET', 'POST'])
 @login_required
+@admission_limited('job_match')
 def job_match():
     """Professional job matching using your resume_parser.py"""
     if request.method == 'POST':
@@ -1293,24 +1383,60 @@ def job_match():
                 flash('Please select a job description file', 'error')
                 return redirect(url_for('job_match'))
             
-            # Save files temporarily
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Save resume
-            resume_filename = secure_filename(resume_file.filename)
-            resume_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"match_resume_{timestamp}_{resume_filename}")
-            resume_file.save(resume_filepath)
-            
-            # Save job description
-            job_filename = secure_filename(job_file.filename)
-            job_filepath = os.path.join(app.config['UPLOAD_FOLDER'], f"match_job_{timestamp}_{job_filename}")
-            job_file.save(job_filepath)
+            # Both documents are parsed straight from memory; nothing touches disk
+            resume_bytes = resume_file.read()
+            job_bytes = job_file.read()
             
             # ========== USE YOUR RESUME_PARSER ==========
-            from resume_parser import parse_resume, extract_text_from_file, nlp, extract_skills_advanced
+            from resume_parser import parse_resume, extract_text_from_file, analyze_text_chunked, extract_skills_advanced
+            
+            def parse_job_description(use_nlp=True):
+                # Parse job description (extract text and skills)
+                job_text = extract_text_from_file(job_bytes)
+                if not job_text:
+                    return None
+                
+                # Long postings go through spaCy in bounded chunks, stopping at
+                # the character budget or once new chunks stop adding skills
+                if use_nlp:
+                    job_skills_result = analyze_text_chunked(job_text)
+                else:
+                    job_skills_result = extract_skills_advanced(job_text, None)
+                return {
+                    'skills': job_skills_result.get('all_skills', []),
+                    'year_mentions': len(re.findall(r'\b(19|20)\d{2}\b', job_text))
+                }
             
-            # Parse resume using your function
-            resume_data = parse_resume(resume_filepath)
+            # Parse resume using your function; identical uploads are served from cache.
+            # "tier" (lite/full) may be forced by the client; otherwise the parser
+            # picks lite for very large documents or when NER is backed up. Only
+            # full results are cached, and they also satisfy lite requests.
+            # Overrunning stages fall back to the matcher-only parse (no NER).
+            requested_tier = request.values.get('tier')
+            pipeline = StagedPipeline(stage_executor, app.config['JOB_MATCH_DEADLINE'],
+                                      app.config['JOB_MATCH_STAGE_BUDGETS'])
+            resume_data = pipeline.run(
+                'resume',
+                lambda timeout: PARSE_CACHE.get_or_compute(
+                    ParseCache.make_key(resume_bytes, RESUME_CACHE_NAMESPACE),
+                    lambda: parse_resume(resume_bytes, tier=requested_tier),
+                    cacheable=lambda result: "error" not in result and result.get("tier") == TIER_FULL
+                ),
+                fallback=lambda: parse_resume(resume_bytes, tier=TIER_LITE)
+            )
+            job_data = None
+            if "error" not in resume_data:
+                job_data = pipeline.run(
+                    'job_description',
+                    lambda timeout: PARSE_CACHE.get_or_compute(
+                        ParseCache.make_key(job_bytes, JOB_CACHE_NAMESPACE),
+                        parse_job_description,
+                        cacheable=lambda result: result is not None
+                    ),
+                    fallback=lambda: parse_job_description(use_nlp=False)
+                )
+            if pipeline.fallbacks:
+                logger.warning(f"Job match degraded: {pipeline.report()}")
             
             if "error" in resume_data:
                 flash(f'Error parsing resume: {resume_data["error"]}', 'error')
@@ -1320,24 +1446,11 @@ def job_match():
             resume_skills = resume_data.get('skills', {}).get('all_skills', [])
             resume_experience = resume_data.get('experience', {}).get('total_years', 0)
             
-            # Parse job description (extract text and skills)
-            job_text = extract_text_from_file(job_filepath)
-            
-            if not job_text:
+            if not job_data:
                 flash('Could not extract text from job description', 'error')
                 return redirect(url_for('job_match'))
             
-            # Extract skills from job description using your function
-            job_doc = nlp(job_text[:500000])  # Limit text length
-            job_skills_result = extract_skills_advanced(job_text[:500000], job_doc)
-            job_skills = job_skills_result.get('all_skills', [])
-            
-            # Clean up temp files
-            try:
-                os.remove(resume_filepath)
-                os.remove(job_filepath)
-            except:
-                pass
+            job_skills = job_data['skills']
             
             # ========== CALCULATE MATCH ==========
             if not job_skills:
@@ -1383,7 +1496,7 @@ def job_match():
                     recommendation = f"Your skills don't align strongly with this role. You matched {len(matched_skills_raw)} out of {len(job_set)} required skills."
             
             # Estimate required experience from job description
-            exp_years_job = len(re.findall(r'\b(19|20)\d{2}\b', job_text)) // 3
+            exp_years_job = job_data['year_mentions'] // 3
             exp_years_job = min(max(exp_years_job, 2), 15)
             
             if resume_experience >= exp_years_job:
@@ -1412,7 +1525,8 @@ def job_match():
                 'total_resume_skills': len(resume_skills),
                 'resume_experience': resume_experience,
                 'required_experience': exp_years_job,
-                'recommendation': recommendation
+                'recommendation': recommendation,
+                'parse_tier': resume_data.get('tier', TIER_FULL)
             }
             
             # Store in database
@@ -1537,6 +1651,15 @@ def quick_actions():
 def health():
     return jsonify({'status': 'healthy', 'time': datetime.now().isoformat()})
 
+@app.route('/metrics')
+def metrics():
+    """Load counters for this worker: admission queues and the analysis backlog"""
+    return jsonify({
+        'pid': os.getpid(),
+        'admission': ADMISSION.stats(),
+        'analysis_queue': {'pending': ANALYSIS_QUEUE.pending(), 'max_pending': app.config['ANALYSIS_MAX_PENDING']}
+    })
+
 @app.route('/debug')
 @login_required
 def debug():
@@ -1548,7 +1671,15 @@ def debug():
         'session': dict(session),
         'user_id': session.get('user_id'),
         'username': session.get('username'),
-        'uploads_count': uploads_count['c'] if uploads_count else 0
+        'uploads_count': uploads_count['c'] if uploads_count else 0,
+        'parse_cache': PARSE_CACHE.stats(),
+        'extraction_pool': EXTRACTION_POOL.stats(),
+        'nlp_service': NLP_SERVICE_SOCKET,
+        'admission': ADMISSION.stats(),
+        'job_search': JOB_SEARCH.stats(),
+        'job_prefetch': JOB_PREFETCHER.stats(),
+        'job_corpus': JOB_CORPUS.stats(),
+        'dashboard_payload': DASHBOARD_PAYLOAD.stats()
     })
 
 @app.errorhandler(404)
@@ -0,0 +1,163 @@
+# === benchmarks/bench_docx_extraction.py ===
+"""
+Speed and peak RSS of the streaming lxml DOCX extractor in text_extraction
+against python-docx (docx.Document + paragraphs + tables) on large
+synthetic documents.
+
+Before timing, a small fixture with a text box in a paragraph and in a
+table cell (mc:Choice plus the legacy mc:Fallback copy) checks that
+text-box content is extracted exactly once.
+
+Each measurement runs in a fresh interpreter so peak RSS is not polluted by
+earlier runs; the reported RSS is the increase over an interpreter that has
+only imported the libraries.
+
+Usage:
+    python benchmarks/bench_docx_extraction.py [--paragraphs 2000 20000 100000] [--repeat 3]
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LINE = "Built REST APIs with Flask and PostgreSQL; deployed with Docker on AWS."
+
+
+def build_docx(path, paragraphs):
+    """Mostly paragraphs, with a 4-column skills table every 50 paragraphs"""
+    import docx
+
+    document = docx.Document()
+    for index in range(paragraphs):
+        document.add_paragraph(f"{index}. {LINE}")
+        if index % 50 == 49:
+            table = document.add_table(rows=5, cols=4)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = "Kubernetes, Terraform"
+    document.save(path)
+
+
+_W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_MC_NS = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
+
+
+def _text_box(text):
+    """A run holding a text box, as Word writes it: a DrawingML copy and a VML fallback"""
+    content = f'<w:txbxContent><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:txbxContent>'
+    return (f'<w:r><mc:AlternateContent>'
+            f'<mc:Choice Requires="wps"><w:drawing>{content}</w:drawing></mc:Choice>'
+            f'<mc:Fallback><w:pict>{content}</w:pict></mc:Fallback>'
+            f'</mc:AlternateContent></w:r>')
+
+
+def build_text_box_docx(path):
+    """Fixture: text boxes anchored in a body paragraph and inside a table cell"""
+    body = (f'<w:p><w:r><w:t>Anchor paragraph</w:t></w:r>{_text_box("Paragraph text box")}</w:p>'
+            f'<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Cell</w:t></w:r>{_text_box("Cell text box")}</w:p></w:tc>'
+            f'<w:tc><w:p><w:r><w:t>Second cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+            f'<w:p><w:r><w:t>Closing paragraph</w:t></w:r></w:p>')
+    document = (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:document xmlns:w="{_W_NS}" xmlns:mc="{_MC_NS}"><w:body>{body}</w:body></w:document>')
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('[Content_Types].xml',
+                         '<?xml version="1.0" encoding="UTF-8"?>'
+                         '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                         '<Default Extension="xml" ContentType="application/xml"/>'
+                         '<Override PartName="/word/document.xml" ContentType="application/'
+                         'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+        archive.writestr('word/document.xml', document)
+
+
+def check_text_boxes(workdir):
+    """Every fixture string is extracted exactly once, text boxes included"""
+    path = os.path.join(workdir, 'text_boxes.docx')
+    build_text_box_docx(path)
+    text = extract_streaming(path)
+    expected = ['Anchor paragraph', 'Paragraph text box', 'Cell text box', 'Second cell', 'Closing paragraph']
+    counts = {phrase: text.count(phrase) for phrase in expected}
+    if any(count != 1 for count in counts.values()):
+        raise SystemExit(f"Text box fixture extracted incorrectly: {counts}\n{text!r}")
+    print(f"Text box fixture: each of {len(expected)} strings extracted once")
+
+
+def extract_streaming(path):
+    from text_extraction import extract_text
+    return extract_text(path, max_chars=10 ** 9)
+
+
+def extract_python_docx(path):
+    import docx
+
+    document = docx.Document(path)
+    parts = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            parts.append('\t'.join(cell.text for cell in row.cells))
+    return '\n'.join(parts)
+
+
+EXTRACTORS = {
+    'lxml-stream': extract_streaming,
+    'python-docx': extract_python_docx
+}
+
+
+def run_child(extractor, path, repeat):
+    """Child mode: time the extractor and report (ms, chars, peak KB)"""
+    import docx  # noqa: F401  same imports for every child
+    import text_extraction  # noqa: F401
+    from lxml import etree  # noqa: F401
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    best, chars = float('inf'), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chars = len(EXTRACTORS[extractor](path))
+        best = min(best, time.perf_counter() - start)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{best * 1000:.1f} {chars} {peak - baseline}")
+
+
+def measure(extractor, path, repeat):
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', extractor, path, '--repeat', str(repeat)],
+        check=True, capture_output=True, text=True
+    ).stdout.split()
+    return float(output[0]), int(output[1]), int(output[2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, nargs='+', default=[2000, 20000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--child', nargs=2, metavar=('EXTRACTOR', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        check_text_boxes(workdir)
+
+    print(f"{'paragraphs':>10}{'size KB':>10}  {'extractor':<13}{'ms':>10}{'chars':>10}{'peak RSS +MB':>14}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for paragraphs in args.paragraphs:
+            path = os.path.join(workdir, f"synthetic_{paragraphs}.docx")
+            build_docx(path, paragraphs)
+            size_kb = os.path.getsize(path) // 1024
+            for extractor in EXTRACTORS:
+                elapsed, chars, peak_kb = measure(extractor, path, args.repeat)
+                print(f"{paragraphs:>10}{size_kb:>10}  {extractor:<13}{elapsed:>10.1f}{chars:>10}{peak_kb / 1024:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+# === benchmarks/bench_extraction_pool.py ===
+"""
+Requests/sec of the /analyze extractors under concurrent load: the old
+per-request ThreadPoolExecutor(3) against the shared extraction process pool.
+
+Client threads stand in for gunicorn request threads; each "request" runs
+all four extractors over one resume from uploads/.
+
+Before timing, run_extractors is checked on small resumes whose experience
+section uses a heading without the word "experience" (Career History,
+Professional Background, Internships); each must yield its entry.
+
+Usage:
+    python benchmarks/bench_extraction_pool.py [--concurrency 1 4 8] [--requests 400] [--workers 4]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from extraction_pool import ExtractionPool
+from resume_analysis import (EXTRACTION_WARMUP_TEXT, extract_contact_info, extract_education,
+                             extract_experience_summary, extract_skills_from_text, run_extractors)
+from resume_sections import segment_resume
+from text_extraction import DocumentExtractionError, extract_text
+
+
+def per_request_threads(resume_text):
+    """The previous analyze_resume_text: a new ThreadPoolExecutor per request"""
+    sections = segment_resume(resume_text)
+    experience_text = sections.text_of('experience')
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        contact_future = executor.submit(extract_contact_info, resume_text)
+        education_future = executor.submit(extract_education, sections.section_text('education'))
+        experience_future = executor.submit(extract_experience_summary, experience_text or resume_text,
+                                            bool(experience_text))
+        skills_future = executor.submit(extract_skills_from_text, resume_text)
+        return {
+            'contact_info': contact_future.result(),
+            'education': education_future.result(),
+            'experience': experience_future.result(),
+            'skills': skills_future.result()
+        }
+
+
+EXPERIENCE_HEADINGS = ['Work Experience', 'Career History', 'Professional Background', 'Internships']
+
+
+def check_experience_headings():
+    """Experience entries are found under every heading the segmenter recognises"""
+    for heading in EXPERIENCE_HEADINGS:
+        text = (f"Jane Doe\njane@example.com\n{heading}\nAcme Corp 2019 - 2022\nBuilt billing APIs\n"
+                f"Education\nB.Tech, State University 2018")
+        experience = run_extractors(text)['experience']
+        if experience != ['Acme Corp 2019 - 2022 Built billing APIs']:
+            raise SystemExit(f"Experience under {heading!r} extracted incorrectly: {experience}")
+    print(f"Experience headings: entries found under all {len(EXPERIENCE_HEADINGS)} headings")
+
+
+def load_texts():
+    texts = []
+    for path in sorted(glob.glob(os.path.join(ROOT, 'uploads', '*'))):
+        try:
+            text = extract_text(path)
+        except DocumentExtractionError:
+            continue
+        if text:
+            texts.append(text)
+    return texts
+
+
+def run_load(analyze, texts, concurrency, total):
+    latencies = []
+    counter = iter(range(total))
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            start = time.perf_counter()
+            analyze(texts[index % len(texts)])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return total / elapsed, statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=min(os.cpu_count() or 1, 4))
+    args = parser.parse_args()
+
+    check_experience_headings()
+    texts = load_texts()
+    pool = ExtractionPool(args.workers, warmup=lambda: run_extractors(EXTRACTION_WARMUP_TEXT))
+    pool.start()
+
+    # Same answers from both paths
+    assert all(per_request_threads(text) == pool.run(run_extractors, text) for text in texts[:20])
+
+    variants = {
+        'thread-per-request': per_request_threads,
+        f'process pool x{args.workers}': lambda text: pool.run(run_extractors, text)
+    }
+    print(f"{len(texts)} resumes, {args.requests} requests per run, {os.cpu_count()} CPUs\n")
+    print(f"{'variant':<22}{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for concurrency in args.concurrency:
+        for name, analyze in variants.items():
+            rps, p50, p95 = run_load(analyze, texts, concurrency, args.requests)
+            print(f"{name:<22}{concurrency:>8}{rps:>10.1f}{p50:>10.2f}{p95:>10.2f}")
+    pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# === benchmarks/bench_job_corpus.py ===
+"""
+Import throughput and BM25 lookup latency of the local job corpus over a
+synthetic set of postings, plus a relevance check: how many of the top
+results carry the searched role in their title.
+
+Usage:
+    python benchmarks/bench_job_corpus.py [--postings 50000] [--queries 500]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from job_corpus import JobCorpus
+
+ROLES = ['Software Engineer', 'Data Scientist', 'DevOps Engineer', 'Frontend Developer', 'Backend Developer',
+         'Product Manager', 'UX Designer', 'Data Analyst', 'Machine Learning Engineer', 'Cloud Architect',
+         'Registered Nurse', 'Financial Analyst', 'Marketing Manager', 'Accountant', 'Sales Representative']
+SKILLS = ['python', 'java', 'javascript', 'react', 'sql', 'aws', 'docker', 'kubernetes', 'excel', 'tableau',
+          'figma', 'seo', 'salesforce', 'tensorflow', 'spark', 'git', 'linux', 'agile', 'communication']
+SENIORITY = ['', 'Senior ', 'Junior ', 'Lead ', 'Staff ', 'Principal ']
+COMPANIES = [f"Company {i}" for i in range(500)]
+
+
+def synthetic_postings(count, rng):
+    for i in range(count):
+        role = rng.choice(ROLES)
+        skills = rng.sample(SKILLS, 4)
+        yield {
+            'job_title': f"{rng.choice(SENIORITY)}{role}",
+            'employer_name': rng.choice(COMPANIES),
+            'job_apply_link': f"https://jobs.example.com/{i}",
+            'job_description': (f"We are hiring a {role.lower()} to join our team. "
+                                f"You will work with {', '.join(skills)}. " * 6)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--postings', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    workdir = tempfile.mkdtemp()
+    jsonl = os.path.join(workdir, 'postings.jsonl')
+    with open(jsonl, 'w', encoding='utf-8') as f:
+        for posting in synthetic_postings(args.postings, rng):
+            f.write(json.dumps(posting) + '\n')
+
+    corpus = JobCorpus(os.path.join(workdir, 'job_corpus.db'))
+    start = time.perf_counter()
+    stored = corpus.import_jsonl(jsonl)
+    elapsed = time.perf_counter() - start
+    print(f"Imported {stored} postings in {elapsed:.1f}s ({stored / elapsed:.0f}/s), "
+          f"db {os.path.getsize(corpus.db_path) / 1e6:.1f} MB")
+
+    for label, use_skills in (('role only', False), ('role + skills', True)):
+        latencies, relevant, total = [], 0, 0
+        for _ in range(args.queries):
+            role = rng.choice(ROLES)
+            skills = rng.sample(SKILLS, 5) if use_skills else ()
+            start = time.perf_counter()
+            jobs = corpus.search(role, skills)
+            latencies.append((time.perf_counter() - start) * 1000)
+            total += len(jobs)
+            relevant += sum(1 for title, _ in jobs if role.lower() in title.lower())
+        latencies.sort()
+        print(f"{label:<14} median {statistics.median(latencies):6.2f} ms  "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1]:6.2f} ms  "
+              f"role in title {relevant}/{total}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# === benchmarks/bench_job_search.py ===
+"""
+Job lookup latency against a local JSearch stub: the old one-off
+requests.get per call against JobSearchClient (pooled session, memory and
+SQLite cache tiers, coalesced concurrent misses).
+
+Also checks the client's behaviour: a burst of concurrent misses for one
+role makes a single upstream call, a fresh client is served from SQLite,
+an expired entry is served when the API fails, and search_roles fetches
+several roles in about one round trip.
+
+Usage:
+    python benchmarks/bench_job_search.py [--delay-ms 200] [--lookups 2000] [--burst 32]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from job_search import JobSearchClient
+from stub_jsearch import StubJSearch
+
+
+def legacy_lookup(url, role, timeout=3):
+    """The previous app.get_jobs_for_role request: a new connection per call"""
+    response = requests.get(url, headers={'X-RapidAPI-Key': 'stub', 'X-RapidAPI-Host': 'stub'},
+                            params={'query': role, 'num_pages': '1', 'page': '1'}, timeout=timeout)
+    return response.json().get('data', [])[:5]
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def fmt(samples):
+    us = sorted(s * 1e6 for s in samples)
+    return f"median {statistics.median(us):>10.1f} us   p95 {us[int(len(us) * 0.95) - 1]:>10.1f} us"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--delay-ms', type=float, default=200)
+    parser.add_argument('--lookups', type=int, default=2000)
+    parser.add_argument('--burst', type=int, default=32)
+    args = parser.parse_args()
+
+    stub = StubJSearch(delay=args.delay_ms / 1000).start()
+    db_path = os.path.join(tempfile.mkdtemp(), 'job_cache.db')
+
+    def client(**kwargs):
+        return JobSearchClient(stub.url, 'stub', 'stub', db_path, **kwargs)
+
+    print(f"Stub API latency {args.delay_ms:.0f} ms\n")
+
+    # Upstream round trips: new connection each time vs pooled keep-alive
+    stub.delay = 0
+    before = stub.connections
+    legacy = timed(lambda: legacy_lookup(stub.url, 'Warmup'), 200)
+    legacy_connections = stub.connections - before
+    pooled_client = client()
+    before = stub.connections
+    pooled = timed(lambda: pooled_client.fetch('Warmup', timeout=3), 200)
+    pooled_connections = stub.connections - before
+    print("Uncached round trip, zero API delay (200 calls):")
+    print(f"  requests.get per call  {fmt(legacy)}   connections {legacy_connections}")
+    print(f"  pooled session         {fmt(pooled)}   connections {pooled_connections}")
+    stub.delay = args.delay_ms / 1000
+
+    # Cache tiers
+    jobs_client = client()
+    miss = timed(lambda: jobs_client.search('Data Scientist'), 1)
+    memory = timed(lambda: jobs_client.search('Data Scientist'), args.lookups)
+    disk_client = client()
+    disk = timed(lambda: disk_client.search('Data Scientist'), 1)
+    print(f"\nCached lookups ({args.lookups} memory hits):")
+    print(f"  miss (API call)        {fmt(miss)}")
+    print(f"  SQLite tier            {fmt(disk)}")
+    print(f"  memory tier            {fmt(memory)}")
+
+    # Coalescing: a burst of concurrent misses for one role
+    burst_client = client()
+    barrier = threading.Barrier(args.burst)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(burst_client.search('Backend Developer'))
+
+    threads = [threading.Thread(target=worker) for _ in range(args.burst)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    print(f"\n{args.burst} concurrent misses for one role: {stub.requests['Backend Developer']} upstream call(s), "
+          f"{sum(1 for r in results if r)} answered, {elapsed * 1000:.0f} ms wall, "
+          f"{burst_client.stats()['coalesced']} coalesced")
+
+    # Fan-out: five roles serially vs search_roles
+    roles = ['Cloud Architect', 'Data Engineer', 'QA Engineer', 'Mobile Developer', 'Security Engineer']
+    serial_client, fanout_client = client(), client()
+    start = time.perf_counter()
+    for role in roles:
+        serial_client.fetch(role, timeout=3)
+    serial = time.perf_counter() - start
+    start = time.perf_counter()
+    found = fanout_client.search_roles(roles, timeout=3)
+    fanout = time.perf_counter() - start
+    print(f"{len(roles)} roles: serial {serial * 1000:.0f} ms, search_roles {fanout * 1000:.0f} ms "
+          f"({sum(1 for jobs in found.values() if jobs)} answered)")
+
+    # Stale fallback while the API is down
+    stale_client = client(ttl=0.05)
+    stale_client.search('Product Manager')
+    time.sleep(0.1)
+    stub.fail = True
+    stale = stale_client.search('Product Manager')
+    stub.fail = False
+    print(f"Expired entry with the API failing: {'served stale' if stale else 'nothing served'} "
+          f"({stale_client.stats()['stale_served']} stale, {stale_client.stats()['upstream_errors']} errors)")
+
+    stub.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# === benchmarks/bench_nlp_profiles.py ===
+"""
+Throughput (docs/sec) of the spaCy pass for each resume_parser pipeline
+profile, one document at a time and batched through nlp.pipe.
+
+Usage:
+    python benchmarks/bench_nlp_profiles.py [--copies 4] [--n-process 2] [--batch-size 16]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resume_parser import PIPELINE_PROFILES, extract_text_from_file, load_nlp
+
+
+def load_corpus(copies):
+    texts = []
+    for path in sorted(glob.glob(os.path.join(ROOT, 'uploads', '*'))):
+        try:
+            text = extract_text_from_file(path)
+        except ValueError:
+            continue
+        if text:
+            texts.append(text)
+    return texts * copies
+
+
+def docs_per_sec(texts, run):
+    start = time.perf_counter()
+    run(texts)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--copies', type=int, default=4, help='repeat the uploads/ corpus N times')
+    parser.add_argument('--n-process', type=int, default=2)
+    parser.add_argument('--batch-size', type=int, default=16)
+    args = parser.parse_args()
+
+    texts = load_corpus(args.copies)
+    print(f"{len(texts)} documents, {sum(map(len, texts))} characters\n")
+    print(f"{'profile':<10}{'components':<52}{'serial':>10}{'pipe':>10}{'pipe xN':>10}")
+
+    for profile in PIPELINE_PROFILES:
+        nlp = load_nlp(profile)
+        serial = docs_per_sec(texts, lambda docs: [nlp(text) for text in docs])
+        batched = docs_per_sec(texts, lambda docs: list(nlp.pipe(docs, batch_size=args.batch_size)))
+        multi = docs_per_sec(texts, lambda docs: list(nlp.pipe(
+            docs, batch_size=args.batch_size, n_process=args.n_process)))
+        components = ','.join(nlp.pipe_names)
+        print(f"{profile:<10}{components[:51]:<52}{serial:>10.1f}{batched:>10.1f}{multi:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
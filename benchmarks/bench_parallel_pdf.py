@@ -0,0 +1,81 @@
+# === benchmarks/bench_parallel_pdf.py ===
+"""
+Serial vs process-pool PDF extraction by page count, to place
+text_extraction.PARALLEL_PAGE_THRESHOLD at the crossover.
+
+Synthetic PDFs of each size are built with PyMuPDF; pass --pdf to time a
+real document as well. The pool is warmed up before timing, as it is in a
+long-running worker.
+
+Usage:
+    python benchmarks/bench_parallel_pdf.py [--pages 4 8 16 32 64 128 256] [--workers 4] [--repeat 3] [--pdf FILE]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import fitz  # PyMuPDF
+
+import text_extraction
+from text_extraction import extract_text
+
+LINE = "Designed and maintained data pipelines in Python, SQL and Airflow for reporting. "
+
+
+def synthetic_pdf(page_count):
+    doc = fitz.open()
+    for number in range(page_count):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), f"Page {number + 1}\n" + LINE * 40, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def best_ms(data, parallel, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract_text(data, max_pages=10 ** 6, max_chars=10 ** 9, parallel=parallel)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[4, 8, 16, 32, 64, 128, 256])
+    parser.add_argument('--workers', type=int, default=text_extraction.PARALLEL_WORKERS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--pdf', help='also time this PDF')
+    args = parser.parse_args()
+
+    text_extraction.PARALLEL_WORKERS = args.workers
+    extract_text(synthetic_pdf(args.workers), parallel=True)  # start the pool
+
+    documents = [(f"synthetic {pages}p", synthetic_pdf(pages)) for pages in args.pages]
+    if args.pdf:
+        with open(args.pdf, 'rb') as f:
+            documents.append((os.path.basename(args.pdf)[:24], f.read()))
+
+    print(f"{args.workers} workers, {os.cpu_count()} CPUs\n")
+    print(f"{'document':<26}{'pages':>7}{'serial ms':>12}{'parallel ms':>14}{'speedup':>10}")
+    crossover = None
+    for name, data in documents:
+        pages = text_extraction._pdf_page_count(data)
+        serial = best_ms(data, False, args.repeat)
+        parallel = best_ms(data, True, args.repeat)
+        speedup = serial / parallel
+        if crossover is None and speedup > 1.0 and name.startswith('synthetic'):
+            crossover = pages
+        print(f"{name:<26}{pages:>7}{serial:>12.1f}{parallel:>14.1f}{speedup:>9.2f}x")
+
+    print(f"\nparallel first wins at: {crossover or 'never'} pages "
+          f"(PARALLEL_PAGE_THRESHOLD = {text_extraction.PARALLEL_PAGE_THRESHOLD})")
+
+
+if __name__ == '__main__':
+    main()
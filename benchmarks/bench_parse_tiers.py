@@ -0,0 +1,76 @@
+# === benchmarks/bench_parse_tiers.py ===
+"""
+Per-document latency of the resume_parser lite and full tiers over the
+resumes in uploads/, and how much of the full result the lite tier keeps.
+Text extraction is done once up front so only parsing is timed.
+
+Usage:
+    python benchmarks/bench_parse_tiers.py [--repeat 5]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resume_parser import PARSE_TIERS, TIER_FULL, ResumeContext, extract_text_from_file, get_nlp
+
+
+def load_texts():
+    texts = []
+    for path in sorted(glob.glob(os.path.join(ROOT, 'uploads', '*'))):
+        try:
+            text = extract_text_from_file(path)
+        except ValueError:
+            continue
+        if text:
+            texts.append(text)
+    return texts
+
+
+def time_tier(texts, tier, repeat):
+    latencies, results = [], []
+    for text in texts:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = ResumeContext(text, tier=tier).to_dict()
+            best = min(best, time.perf_counter() - start)
+        latencies.append(best * 1000)
+        results.append(result)
+    return latencies, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    texts = load_texts()
+    get_nlp()  # model load is not part of per-request latency
+    print(f"{len(texts)} documents\n")
+    print(f"{'tier':<8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+
+    results = {}
+    for tier in PARSE_TIERS:
+        latencies, results[tier] = time_tier(texts, tier, args.repeat)
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"{tier:<8}{statistics.mean(latencies):>10.2f}{statistics.median(latencies):>10.2f}"
+              f"{p95:>10.2f}{latencies[-1]:>10.2f}")
+
+    kept = total = same_name = 0
+    for full, lite in zip(results[TIER_FULL], results['lite']):
+        full_skills = set(full['skills']['all_skills'])
+        kept += len(full_skills & set(lite['skills']['all_skills']))
+        total += len(full_skills)
+        same_name += full['name'] == lite['name']
+    print(f"\nlite keeps {kept}/{total} full-tier skills; same name on {same_name}/{len(texts)} documents")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# === benchmarks/bench_pdf_backends.py ===
+"""
+Time each PDF backend in text_extraction over the PDFs in uploads/.
+The fastest backend should come first in text_extraction.PDF_BACKENDS.
+
+Usage:
+    python benchmarks/bench_pdf_backends.py [--repeat 3]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from text_extraction import DEFAULT_MAX_PAGES, _PDF_PAGE_ITERATORS
+
+
+def time_backend(backend, data, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        try:
+            text = ''.join(_PDF_PAGE_ITERATORS[backend](data, DEFAULT_MAX_PAGES))
+        except Exception:
+            return None, 0
+    return (time.perf_counter() - start) / repeat * 1000, len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    backends = list(_PDF_PAGE_ITERATORS)
+    totals = {backend: 0.0 for backend in backends}
+    failures = {backend: 0 for backend in backends}
+
+    header = f"{'document':<48}" + ''.join(f"{backend + ' ms':>14}" for backend in backends)
+    print(header)
+    for path in sorted(glob.glob(os.path.join(ROOT, 'uploads', '*.pdf'))):
+        with open(path, 'rb') as f:
+            data = f.read()
+        row = f"{os.path.basename(path)[:47]:<48}"
+        for backend in backends:
+            elapsed, _ = time_backend(backend, data, args.repeat)
+            if elapsed is None:
+                failures[backend] += 1
+                row += f"{'failed':>14}"
+            else:
+                totals[backend] += elapsed
+                row += f"{elapsed:>14.2f}"
+        print(row)
+
+    print()
+    for backend in sorted(backends, key=totals.get):
+        print(f"{backend:<10} total {totals[backend]:>10.1f} ms   failures {failures[backend]}")
+
+
+if __name__ == '__main__':
+    main()
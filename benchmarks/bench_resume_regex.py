@@ -0,0 +1,86 @@
+# === benchmarks/bench_resume_regex.py ===
+"""
+Per-resume cost of the regex stage of resume_parser: the old per-skill
+pattern loop and uncompiled VERBOSE patterns versus the precompiled
+registry and single-pass skill alternation.
+
+Usage:
+    python benchmarks/bench_resume_regex.py [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resume_parser import (ALL_SKILLS, RegexPatterns, extract_experience,
+                           extract_phone_numbers, extract_text_from_file, match_skills)
+
+
+def legacy_regex_stage(text):
+    """Previous skill loop plus uncompiled phone and date range scans"""
+    text_lower = text.lower()
+    skills = set()
+    for skill in ALL_SKILLS:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower):
+            skills.add(skill)
+    phones = re.findall(RegexPatterns.PHONE, text, re.VERBOSE)
+    dates = re.findall(RegexPatterns.DATE_RANGE, text, re.VERBOSE | re.IGNORECASE)
+    return skills, phones, dates
+
+
+def compiled_regex_stage(text):
+    return match_skills(text), extract_phone_numbers(text), extract_experience(text)
+
+
+def load_documents():
+    paths = [os.path.join(ROOT, 'sample_resume.txt')]
+    paths += sorted(glob.glob(os.path.join(ROOT, 'uploads', '*')))
+    documents = []
+    for path in paths:
+        try:
+            text = extract_text_from_file(path)
+        except ValueError:
+            continue
+        if text:
+            documents.append((os.path.basename(path), text))
+    return documents
+
+
+def per_call_ms(func, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    documents = load_documents()
+    total_legacy = total_compiled = 0.0
+
+    print(f"{'document':<48}{'chars':>8}{'before ms':>11}{'after ms':>10}")
+    for name, text in documents:
+        legacy = per_call_ms(legacy_regex_stage, text, args.repeat)
+        compiled = per_call_ms(compiled_regex_stage, text, args.repeat)
+        total_legacy += legacy
+        total_compiled += compiled
+        print(f"{name[:47]:<48}{len(text):>8}{legacy:>11.3f}{compiled:>10.3f}")
+
+    if documents:
+        count = len(documents)
+        print(f"\nmean per resume: before {total_legacy / count:.3f} ms, "
+              f"after {total_compiled / count:.3f} ms "
+              f"({total_legacy / total_compiled:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
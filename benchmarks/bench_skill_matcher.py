@@ -0,0 +1,87 @@
+# === benchmarks/bench_skill_matcher.py ===
+"""
+Compare the Aho-Corasick skill matcher in
+resume_analysis.extract_skills_from_text with the previous per-skill
+substring + regex loop.
+
+Usage:
+    python benchmarks/bench_skill_matcher.py [--repeat 50]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_analysis import ALL_SKILLS_WITH_DEPT, SKILL_VARIATIONS, extract_skills_from_text
+
+
+def legacy_extract_skills_from_text(text):
+    """Previous implementation, kept verbatim for comparison"""
+    text_lower = text.lower()
+    found_skills = []
+    skills_by_department = {}
+
+    for skill_info in ALL_SKILLS_WITH_DEPT:
+        skill = skill_info['skill']
+        if skill in text_lower:
+            found_skills.append(skill_info['display'])
+            dept = skill_info['department']
+            if dept not in skills_by_department:
+                skills_by_department[dept] = []
+            skills_by_department[dept].append(skill_info['display'])
+        elif re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
+            found_skills.append(skill_info['display'])
+            dept = skill_info['department']
+            if dept not in skills_by_department:
+                skills_by_department[dept] = []
+            skills_by_department[dept].append(skill_info['display'])
+
+    for abbr, full in SKILL_VARIATIONS.items():
+        if abbr in text_lower:
+            for skill_info in ALL_SKILLS_WITH_DEPT:
+                if skill_info['skill'] == full:
+                    if skill_info['display'] not in found_skills:
+                        found_skills.append(skill_info['display'])
+                        dept = skill_info['department']
+                        if dept not in skills_by_department:
+                            skills_by_department[dept] = []
+                        skills_by_department[dept].append(skill_info['display'])
+                    break
+
+    unique_skills = []
+    for skill in found_skills:
+        if skill not in unique_skills:
+            unique_skills.append(skill)
+
+    return {'all': unique_skills[:30], 'by_department': skills_by_department}
+
+
+def time_call(func, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(root, 'sample_resume.txt'), encoding='utf-8') as f:
+        sample = f.read()
+
+    print(f"{'input':<22}{'chars':>10}{'legacy ms':>12}{'automaton ms':>14}{'speedup':>10}")
+    for label, multiplier in [('sample_resume.txt', 1), ('sample x10', 10), ('sample x100', 100)]:
+        text = sample * multiplier
+        legacy = time_call(legacy_extract_skills_from_text, text, args.repeat)
+        current = time_call(extract_skills_from_text, text, args.repeat)
+        print(f"{label:<22}{len(text):>10}{legacy:>12.3f}{current:>14.3f}{legacy / current:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# === benchmarks/stub_jsearch.py ===
+"""
+Local stand-in for the JSearch /search endpoint.
+
+Answers GET /search?query=... with a JSearch-shaped payload after a fixed
+delay (simulating API latency), counts requests per query, and can be told
+to fail. Run it standalone and point the app at it:
+
+    python benchmarks/stub_jsearch.py --port 8765 --delay-ms 300
+    JSEARCH_API_URL=http://127.0.0.1:8765/search python app.py
+
+or start it in-process with StubJSearch(...).start().
+"""
+import argparse
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def fake_jobs(query, count=10):
+    return [{
+        'job_title': f"{query} {i + 1}",
+        'employer_name': f"Stub Corp {i + 1}",
+        'job_apply_link': f"https://jobs.example.com/{query.lower().replace(' ', '-')}/{i + 1}"
+    } for i in range(count)]
+
+
+class StubJSearch:
+    """Threaded HTTP stub; .url is the search endpoint, .requests counts calls per query"""
+
+    def __init__(self, port=0, delay=0.3):
+        self.delay = delay
+        self.fail = False
+        self.requests = Counter()
+        self.connections = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, so pooled sessions can reuse connections
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def setup(self):
+                super().setup()
+                stub.connections += 1
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query).get('query', [''])[0]
+                stub.requests[query] += 1
+                time.sleep(stub.delay)
+                if stub.fail or url.path != '/search':
+                    status, body = 503, b'{"message": "unavailable"}'
+                else:
+                    status, body = 200, json.dumps({'status': 'OK', 'data': fake_jobs(query)}).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/search"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Stub JSearch server")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay-ms', type=float, default=300)
+    args = parser.parse_args()
+
+    stub = StubJSearch(args.port, args.delay_ms / 1000)
+    print(f"Stub JSearch listening on {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,332 @@
+# === bulk_parse.py ===
+"""
+Offline bulk resume parsing.
+
+Fans resume_parser.parse_resume out over a pool of worker processes and
+streams one record per document to JSONL or to a Parquet dataset.
+Documents are handed to workers in chunks and results are written as
+they complete, so memory stays flat however many files there are.
+
+Progress is checkpointed: after each batch of records is safely written,
+their paths are appended to <output>.checkpoint, and a rerun with the same
+output skips them. Failed documents are written with an "error" field and
+are also checkpointed; pass --retry-failed to attempt them again. A retry
+appends its record after the old failed one, so the last record per path
+is the current one; documents that have since succeeded are not retried.
+
+Usage:
+    python bulk_parse.py uploads/ --output parsed.jsonl
+    python bulk_parse.py --manifest files.txt --output parsed.parquet --workers 8
+    python bulk_parse.py uploads/ --output parsed.jsonl --tier lite --restart
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+DOCUMENT_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
+
+FORMAT_JSONL = 'jsonl'
+FORMAT_PARQUET = 'parquet'
+
+
+# ==================== INPUTS ====================
+def iter_input_paths(inputs: Iterable[str], manifest: Optional[str] = None) -> Iterator[str]:
+    """Documents under the given files/directories, then those listed in the manifest"""
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in DOCUMENT_EXTENSIONS:
+                        yield os.path.join(root, name)
+        else:
+            yield item
+    if manifest:
+        with open(manifest, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+
+
+# ==================== CHECKPOINT ====================
+class Checkpoint:
+    """Append-only list of paths whose records are already in the output"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        self.failed: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line cut off by a crash; its batch is redone
+                        continue
+                    self.done.add(entry['path'])
+                    # The last entry per path wins, so a retry that succeeded is not retried again
+                    if entry.get('failed'):
+                        self.failed.add(entry['path'])
+                    else:
+                        self.failed.discard(entry['path'])
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def record(self, records: List[Dict[str, Any]]):
+        for record in records:
+            self._file.write(json.dumps({'path': record['path'], 'failed': bool(record.get('error'))}) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+# ==================== OUTPUT SINKS ====================
+class JsonlSink:
+    """One JSON object per line, appended across runs"""
+
+    def __init__(self, path: str):
+        # Drop a trailing partial line left by an interrupted run
+        if os.path.exists(path):
+            with open(path, 'rb+') as f:
+                data = f.read()
+                if data and not data.endswith(b'\n'):
+                    f.truncate(data.rfind(b'\n') + 1)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, records: List[Dict[str, Any]]):
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    """
+    Parquet dataset directory: every batch becomes its own part file
+
+    A Parquet file is only readable once its footer is written, so each
+    batch is a complete file before it is checkpointed; a rerun adds new
+    parts. Read the whole dataset with pyarrow.parquet.read_table(path).
+    """
+
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa, self.pq = pa, pq
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._part = len([name for name in os.listdir(path) if name.endswith('.parquet')])
+        strings = pa.list_(pa.string())
+        self.schema = pa.schema([
+            ('path', pa.string()),
+            ('error', pa.string()),
+            ('seconds', pa.float64()),
+            ('tier', pa.string()),
+            ('name', pa.string()),
+            ('emails', strings),
+            ('phones', strings),
+            ('links', pa.string()),
+            ('all_skills', strings),
+            ('skill_categories', pa.string()),
+            ('education', strings),
+            ('positions', pa.string()),
+            ('total_years', pa.float64()),
+            ('organizations', strings),
+            ('total_skills', pa.int64()),
+        ])
+
+    @staticmethod
+    def flatten(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Columnar row: lists stay lists, nested structures become JSON text"""
+        result = record.get('result') or {}
+        contact = result.get('contact') or {}
+        skills = dict(result.get('skills') or {})
+        experience = result.get('experience') or {}
+        all_skills = skills.pop('all_skills', None)
+        return {
+            'path': record['path'],
+            'error': record.get('error'),
+            'seconds': record.get('seconds'),
+            'tier': result.get('tier'),
+            'name': result.get('name'),
+            'emails': contact.get('emails'),
+            'phones': contact.get('phones'),
+            'links': json.dumps(contact['links']) if 'links' in contact else None,
+            'all_skills': all_skills,
+            'skill_categories': json.dumps(skills) if skills else None,
+            'education': result.get('education'),
+            'positions': json.dumps(experience['positions']) if 'positions' in experience else None,
+            'total_years': experience.get('total_years'),
+            'organizations': experience.get('organizations'),
+            'total_skills': (result.get('summary') or {}).get('total_skills'),
+        }
+
+    def write(self, records: List[Dict[str, Any]]):
+        table = self.pa.Table.from_pylist([self.flatten(record) for record in records], schema=self.schema)
+        final = os.path.join(self.path, f"part-{self._part:05d}.parquet")
+        temp = final + '.tmp'
+        self.pq.write_table(table, temp)
+        os.replace(temp, final)
+        self._part += 1
+
+    def close(self):
+        pass
+
+
+def open_sink(path: str, fmt: str):
+    return ParquetSink(path) if fmt == FORMAT_PARQUET else JsonlSink(path)
+
+
+# ==================== WORKERS ====================
+_tier: Optional[str] = None
+
+
+def _init_worker(tier: Optional[str]):
+    global _tier
+    _tier = tier
+    # The bulk pool already occupies every core; read each PDF serially
+    import text_extraction
+    text_extraction.PARALLEL_WORKERS = 1
+
+
+def _parse_one(path: str) -> Dict[str, Any]:
+    from resume_parser import parse_resume
+
+    start = time.perf_counter()
+    record: Dict[str, Any] = {'path': path}
+    try:
+        result = parse_resume(path, tier=_tier)
+        if 'error' in result and len(result) == 1:
+            record['error'] = result['error']
+        else:
+            record['result'] = result
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+        record['traceback'] = traceback.format_exc(limit=3)
+    record['seconds'] = round(time.perf_counter() - start, 4)
+    return record
+
+
+# ==================== DRIVER ====================
+def run(paths: List[str], output: str, fmt: str, workers: int, chunksize: int,
+        flush_every: int, tier: Optional[str], retry_failed: bool,
+        max_tasks_per_child: Optional[int]) -> Dict[str, Any]:
+    checkpoint = Checkpoint(output + '.checkpoint')
+    skip = checkpoint.done - checkpoint.failed if retry_failed else checkpoint.done
+    todo = [path for path in dict.fromkeys(paths) if path not in skip]
+    print(f"{len(paths)} documents, {len(paths) - len(todo)} already done, {len(todo)} to parse "
+          f"with {workers} workers", file=sys.stderr)
+
+    if tier != 'lite':
+        # Load the pipeline before forking so every worker shares it
+        from resume_parser import get_nlp
+        get_nlp()
+
+    sink = open_sink(output, fmt)
+    stats = {'parsed': 0, 'failed': 0, 'seconds_in_workers': 0.0}
+    failures: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+
+    def flush():
+        if pending:
+            sink.write(pending)
+            checkpoint.record(pending)
+            pending.clear()
+
+    context = multiprocessing.get_context('fork')
+    try:
+        with context.Pool(workers, initializer=_init_worker, initargs=(tier,),
+                          maxtasksperchild=max_tasks_per_child) as pool:
+            for done, record in enumerate(pool.imap_unordered(_parse_one, todo, chunksize=chunksize), 1):
+                stats['seconds_in_workers'] += record['seconds']
+                if record.get('error'):
+                    stats['failed'] += 1
+                    failures.append({'path': record['path'], 'error': record['error']})
+                else:
+                    stats['parsed'] += 1
+                record.pop('traceback', None)
+                pending.append(record)
+                if len(pending) >= flush_every:
+                    flush()
+                if done % 100 == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"  {done}/{len(todo)} ({done / elapsed:.1f} docs/sec)", file=sys.stderr)
+    finally:
+        # Whatever finished before an interrupt is kept and checkpointed
+        flush()
+        sink.close()
+        checkpoint.close()
+
+    elapsed = time.perf_counter() - start
+    processed = stats['parsed'] + stats['failed']
+    return {
+        'documents': len(paths),
+        'skipped': len(paths) - len(todo),
+        'parsed': stats['parsed'],
+        'failed': stats['failed'],
+        'elapsed_seconds': round(elapsed, 2),
+        'docs_per_sec': round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+        'mean_doc_seconds': round(stats['seconds_in_workers'] / processed, 4) if processed else 0.0,
+        'failures': failures
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Parse resumes in bulk with resume_parser")
+    parser.add_argument('inputs', nargs='*', help="Resume files or directories (searched recursively)")
+    parser.add_argument('--manifest', help="File listing one resume path per line")
+    parser.add_argument('--output', required=True, help="parsed.jsonl, or a .parquet dataset directory")
+    parser.add_argument('--format', choices=[FORMAT_JSONL, FORMAT_PARQUET],
+                        help="Output format (default: from the output extension)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunksize', type=int, default=8, help="Documents handed to a worker at a time")
+    parser.add_argument('--flush-every', type=int, default=256, help="Records per write and checkpoint")
+    parser.add_argument('--tier', choices=['lite', 'full'], help="Force a parsing tier")
+    parser.add_argument('--max-tasks-per-child', type=int, help="Recycle workers after this many documents")
+    parser.add_argument('--retry-failed', action='store_true', help="Parse checkpointed failures again")
+    parser.add_argument('--restart', action='store_true', help="Discard the checkpoint and existing output")
+    args = parser.parse_args(argv)
+
+    if not args.inputs and not args.manifest:
+        parser.error("give at least one input path or --manifest")
+    fmt = args.format or (FORMAT_PARQUET if args.output.endswith('.parquet') else FORMAT_JSONL)
+
+    if args.restart:
+        import shutil
+        if os.path.isdir(args.output):
+            shutil.rmtree(args.output)
+        elif os.path.exists(args.output):
+            os.remove(args.output)
+        if os.path.exists(args.output + '.checkpoint'):
+            os.remove(args.output + '.checkpoint')
+
+    paths = list(iter_input_paths(args.inputs, args.manifest))
+    report = run(paths, args.output, fmt, max(1, args.workers), max(1, args.chunksize),
+                 max(1, args.flush_every), args.tier, args.retry_failed, args.max_tasks_per_child)
+
+    print(f"Parsed {report['parsed']}, failed {report['failed']}, skipped {report['skipped']} "
+          f"in {report['elapsed_seconds']}s ({report['docs_per_sec']} docs/sec, "
+          f"{report['mean_doc_seconds']}s per document per worker)", file=sys.stderr)
+    for failure in report['failures'][:10]:
+        print(f"  FAILED {failure['path']}: {failure['error']}", file=sys.stderr)
+    if len(report['failures']) > 10:
+        print(f"  ... and {len(report['failures']) - 10} more (see the 'error' field in the output)",
+              file=sys.stderr)
+    return 1 if report['failed'] and not report['parsed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
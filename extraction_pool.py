@@ -0,0 +1,114 @@
+# === extraction_pool.py ===
+"""
+Long-lived process pool for CPU-bound, pure-Python extraction work.
+
+The regex/dictionary extractors hold the GIL, so running them on threads
+does not add throughput. This pool keeps worker processes alive for the
+life of the web worker. Workers are forked after the caller has warmed up
+(loaded the compiled taxonomy, filled the regex cache), so every worker
+starts with those structures already in memory and nothing is rebuilt or
+re-imported per task. Fork is used explicitly: spawn/forkserver workers
+would re-import the application module and re-run its startup code.
+
+A task ships its input once and runs everything it needs in one call. If
+the pool is disabled (size 0) or breaks, work runs inline in the caller.
+A broken pool is not re-forked: by then the web worker is running
+background threads, and a child forked while one of them holds a lock can
+deadlock on it. Work stays inline until the web worker is restarted.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+class ExtractionPool:
+    """
+    App-wide process pool with inline fallback
+
+    Args:
+        workers: Worker processes; 0 runs every task inline
+        warmup: Called once in the parent before the workers are forked
+    """
+
+    def __init__(self, workers: int, warmup: Optional[Callable[[], Any]] = None):
+        self.workers = workers
+        self.warmup = warmup
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._broken = False
+        self._stats = {'pooled': 0, 'inline': 0, 'breaks': 0, 'timeouts': 0}
+
+    def start(self):
+        """Warm up, fork the workers and wait until each one is running"""
+        if self.warmup is not None:
+            self.warmup()
+        if self.workers < 1:
+            return
+        with self._lock:
+            if self._pool is not None or self._broken:
+                return
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('fork')
+            )
+            # Forked workers are started on the first submit; wait for all of them
+            pids = {future.result() for future in [self._pool.submit(_ready) for _ in range(self.workers)]}
+        logger.info(f"Extraction pool started with {self.workers} workers ({len(pids)} reporting)")
+
+    def _abandon(self, pool: ProcessPoolExecutor):
+        """Drop a broken pool for good; later tasks run inline"""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                self._broken = True
+                self._stats['breaks'] += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, func: Callable, *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run func(*args) in a worker process and return its result
+
+        func must be a module-level function so it can be pickled by name.
+        Raises TimeoutError if the worker does not answer within timeout.
+        """
+        pool = self._pool
+        if pool is None:
+            self._stats['inline'] += 1
+            return func(*args)
+        future = pool.submit(func, *args)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeout:
+            # Not started yet: don't let it run after the caller gave up
+            future.cancel()
+            self._stats['timeouts'] += 1
+            raise
+        except BrokenProcessPool as e:
+            logger.warning(f"Extraction pool broke ({e}); running inline from now on")
+            self._abandon(pool)
+            self._stats['inline'] += 1
+            return func(*args)
+        self._stats['pooled'] += 1
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats['workers'] = self.workers if self._pool is not None else 0
+        stats['broken'] = self._broken
+        return stats
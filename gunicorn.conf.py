@@ -0,0 +1,12 @@
+# === gunicorn.conf.py ===
+# Picked up automatically by `gunicorn app:app` (see Procfile).
+# Threaded workers keep long-lived responses such as the analysis progress
+# stream (/api/jobs/<id>/events) from blocking every other request.
+import os
+
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+
+# With NLP_SERVICE_SOCKET set, workers hand entity extraction to
+# nlp_service.py instead of each loading the spaCy model:
+#   python nlp_service.py --socket /tmp/pathpilot-nlp.sock --workers 2
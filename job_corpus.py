@@ -0,0 +1,294 @@
+# === job_corpus.py ===
+"""
+Local job corpus with full-text search, used when the job search API is
+unavailable.
+
+Postings are collected from successful JSearch responses and can be bulk
+imported from JSONL. They are stored in SQLite with an FTS5 index over
+title, company and description, kept in sync by triggers. Lookups rank
+postings with BM25: postings with the role in their title come first
+(title matches weigh most), and the candidate's extracted skills lift
+postings that mention them. Lookups take milliseconds (see
+benchmarks/bench_job_corpus.py), so the fallback is fast and relevant.
+
+CLI:
+    python job_corpus.py import postings.jsonl [--db job_corpus.db]
+    python job_corpus.py search "Data Scientist" --skills python,sql
+    python job_corpus.py stats
+"""
+import argparse
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Job = Tuple[str, str]
+
+# bm25() weights for the indexed columns: title, company, description
+COLUMN_WEIGHTS = (8.0, 2.0, 1.0)
+MAX_DESCRIPTION_CHARS = 5000
+MAX_SKILL_TERMS = 20
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def _terms(text: str) -> List[str]:
+    """FTS5-safe query terms: each word double-quoted, so no query syntax leaks through"""
+    return [f'"{term}"' for term in _TERM.findall(text.lower())]
+
+
+def normalize_posting(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map a JSearch result or a plain {title, company, description, link} record"""
+    title = (record.get('job_title') or record.get('title') or '').strip()
+    if not title:
+        return None
+    company = (record.get('employer_name') or record.get('company') or '').strip()
+    link = (record.get('job_apply_link') or record.get('job_google_link') or record.get('link') or '').strip()
+    description = (record.get('job_description') or record.get('description') or '')[:MAX_DESCRIPTION_CHARS]
+    location = ', '.join(part for part in (record.get('job_city'), record.get('job_country')) if part) \
+        or record.get('location') or ''
+    key_source = link or f"{title.lower()}|{company.lower()}"
+    return {
+        'job_key': hashlib.sha1(key_source.encode('utf-8')).hexdigest(),
+        'title': title,
+        'company': company,
+        'description': description,
+        'link': link or '#',
+        'location': location
+    }
+
+
+class JobCorpus:
+    """
+    SQLite + FTS5 store of job postings
+
+    Args:
+        db_path: Database file for the postings and their index
+        max_postings: Oldest postings beyond this count are pruned on import
+    """
+
+    def __init__(self, db_path: str, max_postings: int = 100000):
+        self.db_path = db_path
+        self.max_postings = max_postings
+        self.available = True
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _init_db(self):
+        try:
+            conn = self._connect()
+            try:
+                conn.executescript('''
+                CREATE TABLE IF NOT EXISTS job_postings (
+                    id INTEGER PRIMARY KEY,
+                    job_key TEXT UNIQUE NOT NULL,
+                    title TEXT NOT NULL,
+                    company TEXT,
+                    description TEXT,
+                    link TEXT,
+                    location TEXT,
+                    source TEXT,
+                    fetched_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_job_postings_fetched ON job_postings(fetched_at);
+                CREATE VIRTUAL TABLE IF NOT EXISTS job_postings_fts USING fts5(
+                    title, company, description,
+                    content='job_postings', content_rowid='id',
+                    tokenize='porter unicode61'
+                );
+                CREATE TRIGGER IF NOT EXISTS job_postings_ai AFTER INSERT ON job_postings BEGIN
+                    INSERT INTO job_postings_fts(rowid, title, company, description)
+                    VALUES (new.id, new.title, new.company, new.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS job_postings_ad AFTER DELETE ON job_postings BEGIN
+                    INSERT INTO job_postings_fts(job_postings_fts, rowid, title, company, description)
+                    VALUES ('delete', old.id, old.title, old.company, old.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS job_postings_au AFTER UPDATE ON job_postings BEGIN
+                    INSERT INTO job_postings_fts(job_postings_fts, rowid, title, company, description)
+                    VALUES ('delete', old.id, old.title, old.company, old.description);
+                    INSERT INTO job_postings_fts(rowid, title, company, description)
+                    VALUES (new.id, new.title, new.company, new.description);
+                END;
+                ''')
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # e.g. an SQLite build without FTS5; callers fall back to static links
+            self.available = False
+            logger.error(f"Job corpus unavailable: {e}")
+
+    # ---------- writes ----------
+    def add_postings(self, records: Iterable[Dict[str, Any]], source: str = 'api') -> int:
+        """Insert or refresh postings; returns how many were stored"""
+        if not self.available:
+            return 0
+        now = time.time()
+        rows = []
+        for record in records:
+            posting = normalize_posting(record)
+            if posting:
+                rows.append((posting['job_key'], posting['title'], posting['company'], posting['description'],
+                             posting['link'], posting['location'], source, now))
+        if not rows:
+            return 0
+        try:
+            conn = self._connect()
+            try:
+                conn.executemany('''
+                    INSERT INTO job_postings (job_key, title, company, description, link, location, source, fetched_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(job_key) DO UPDATE SET
+                        title = excluded.title, company = excluded.company, description = excluded.description,
+                        link = excluded.link, location = excluded.location, source = excluded.source,
+                        fetched_at = excluded.fetched_at
+                ''', rows)
+                overflow = conn.execute('SELECT COUNT(*) FROM job_postings').fetchone()[0] - self.max_postings
+                if overflow > 0:
+                    conn.execute('DELETE FROM job_postings WHERE id IN '
+                                 '(SELECT id FROM job_postings ORDER BY fetched_at ASC LIMIT ?)', (overflow,))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Job corpus write error: {e}")
+            return 0
+        return len(rows)
+
+    def add_api_results(self, role: str, results: List[Dict[str, Any]]):
+        """JobSearchClient on_fetch hook: keep every posting the API returned"""
+        self.add_postings(results, source='api')
+
+    def import_jsonl(self, path: str, batch_size: int = 1000, source: str = 'import') -> int:
+        """Bulk import one JSON posting per line; returns the number stored"""
+        stored, batch = 0, []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    batch.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"Skipping malformed line in {path}")
+                    continue
+                if len(batch) >= batch_size:
+                    stored += self.add_postings(batch, source)
+                    batch = []
+        if batch:
+            stored += self.add_postings(batch, source)
+        return stored
+
+    # ---------- reads ----------
+    @staticmethod
+    def build_queries(role: str, skills: Sequence[str] = ()) -> List[str]:
+        """
+        FTS5 queries from narrowest to broadest
+
+        The strict query needs every role word in the title; the broad one
+        accepts any role word in any column. In both, role words and skills
+        are OR-ed into a second clause that only affects the BM25 score.
+        """
+        role_terms = _terms(role)
+        if not role_terms:
+            return []
+        skill_terms = list(dict.fromkeys(term for skill in skills for term in _terms(skill)))
+        skill_terms = [term for term in skill_terms if term not in role_terms][:MAX_SKILL_TERMS]
+        boosters = ' OR '.join(role_terms + skill_terms)
+        return [
+            f"({{title}} : ({' '.join(role_terms)})) AND ({boosters})",
+            f"({' OR '.join(role_terms)}) AND ({boosters})"
+        ]
+
+    def _ranked(self, conn, query: str, limit: int) -> List[Tuple[str, str, str]]:
+        # Rank inside the index and join only the winners back to their rows
+        return conn.execute(f'''
+            SELECT p.title, p.company, p.link
+            FROM (
+                SELECT rowid, bm25(job_postings_fts, {', '.join(str(w) for w in COLUMN_WEIGHTS)}) AS score
+                FROM job_postings_fts
+                WHERE job_postings_fts MATCH ?
+                ORDER BY score
+                LIMIT ?
+            ) AS hits
+            JOIN job_postings p ON p.id = hits.rowid
+            ORDER BY hits.score
+        ''', (query, limit)).fetchall()
+
+    def search(self, role: str, skills: Sequence[str] = (), limit: int = 5) -> List[Job]:
+        """Best-matching postings as (title, link) pairs, in the API client's format"""
+        if not self.available:
+            return []
+        jobs, seen = [], set()
+        try:
+            conn = self._connect()
+            try:
+                # The broad query scores far more rows; only run it to fill a short list
+                for query in self.build_queries(role, skills):
+                    for title, company, link in self._ranked(conn, query, limit * 3):
+                        label = f"{title} at {company}" if company else title
+                        if label.lower() not in seen:
+                            seen.add(label.lower())
+                            jobs.append((label, link))
+                    if len(jobs) >= limit:
+                        break
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Job corpus search error: {e}")
+        return jobs[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.available:
+            return {'available': False}
+        try:
+            conn = self._connect()
+            try:
+                count, newest = conn.execute('SELECT COUNT(*), MAX(fetched_at) FROM job_postings').fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            return {'available': False, 'error': str(e)}
+        return {
+            'available': True,
+            'postings': count,
+            'newest_age_seconds': round(time.time() - newest, 1) if newest else None
+        }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Manage the local job corpus")
+    parser.add_argument('--db', default='job_corpus.db')
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_cmd = commands.add_parser('import', help="Import postings from JSONL files")
+    import_cmd.add_argument('files', nargs='+')
+    search_cmd = commands.add_parser('search', help="Search postings for a role")
+    search_cmd.add_argument('role')
+    search_cmd.add_argument('--skills', default='', help="Comma-separated skills")
+    search_cmd.add_argument('--limit', type=int, default=5)
+    commands.add_parser('stats', help="Corpus size")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    corpus = JobCorpus(args.db)
+    if args.command == 'import':
+        for path in args.files:
+            start = time.perf_counter()
+            stored = corpus.import_jsonl(path)
+            print(f"{path}: {stored} postings in {time.perf_counter() - start:.1f}s")
+    elif args.command == 'search':
+        start = time.perf_counter()
+        skills = [skill.strip() for skill in args.skills.split(',') if skill.strip()]
+        jobs = corpus.search(args.role, skills, args.limit)
+        for label, link in jobs:
+            print(f"{label}\n    {link}")
+        print(f"{len(jobs)} result(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+    print(json.dumps(corpus.stats()))
@@ -0,0 +1,218 @@
+# === job_prefetch.py ===
+"""
+Background prefetch of job listings for popular roles.
+
+Role popularity comes from the predicted roles stored on recent uploads
+(user_uploads.top_roles), weighted by rank. On every tick the scheduler
+takes the hottest roles, finds those whose cached listings are missing or
+about to expire, and refreshes them through the JobSearchClient before a
+user request would miss. Known roles fill the list until there is enough
+upload history.
+
+Upstream calls are drawn from a token bucket sized to the API quota, and a
+lease row in the cache database ensures that only one worker process
+prefetches at a time, so the budget is not multiplied by the number of
+workers.
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import requests
+
+from job_search import JobSearchClient, role_key
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """At most `rate` tokens per second on average, with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class JobPrefetcher:
+    """
+    Keeps cached listings for the most popular roles fresh
+
+    Args:
+        client: Shared job search client (its cache is what gets warmed)
+        uploads_db: Database holding user_uploads
+        known_roles: Roles that can be predicted; only these are counted,
+            and they fill the list, in order, when upload history is thin
+        top_n: Roles kept warm
+        budget_per_hour: Upstream calls the prefetcher may make per hour
+        interval: Seconds between scheduling passes
+        refresh_margin: Refresh entries expiring within this many seconds
+        window_days: Upload history considered for popularity
+        rank_depth: Predicted roles per upload that count towards popularity
+    """
+
+    def __init__(self, client: JobSearchClient, uploads_db: str, known_roles: Sequence[str] = (),
+                 top_n: int = 10, budget_per_hour: float = 60, interval: float = 60,
+                 refresh_margin: float = 300, window_days: int = 30, rank_depth: int = 5):
+        self.client = client
+        self.uploads_db = uploads_db
+        self.known_roles = list(known_roles)
+        self.top_n = top_n
+        self.interval = interval
+        self.refresh_margin = refresh_margin
+        self.window_days = window_days
+        self.rank_depth = rank_depth
+        self.bucket = TokenBucket(budget_per_hour / 3600.0, capacity=max(1.0, budget_per_hour / 12))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._hot: List[str] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'passes': 0, 'refreshed': 0, 'failed': 0, 'deferred': 0, 'last_due': 0}
+        self._init_db()
+
+    def _init_db(self):
+        try:
+            conn = sqlite3.connect(self.client.db_path, timeout=5)
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS prefetch_lease (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            ''')
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Prefetch lease initialization error: {e}")
+
+    def _hold_lease(self) -> bool:
+        """Take or renew the prefetch lease; False if another live worker holds it"""
+        now = time.time()
+        expires_at = now + self.interval * 3
+        try:
+            conn = sqlite3.connect(self.client.db_path, timeout=5)
+            conn.execute('INSERT OR IGNORE INTO prefetch_lease (name, owner, expires_at) VALUES (?, ?, ?)',
+                         ('jobs', self.owner, expires_at))
+            held = conn.execute(
+                'UPDATE prefetch_lease SET owner = ?, expires_at = ? '
+                'WHERE name = ? AND (owner = ? OR expires_at < ?)',
+                (self.owner, expires_at, 'jobs', self.owner, now)
+            ).rowcount
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Prefetch lease error: {e}")
+            return False
+        return bool(held)
+
+    def popularity(self) -> Counter:
+        """Rank-weighted counts of predicted roles over the recent upload window"""
+        scores: Counter = Counter()
+        try:
+            conn = sqlite3.connect(self.uploads_db, timeout=5)
+            rows = conn.execute(
+                "SELECT top_roles FROM user_uploads WHERE top_roles IS NOT NULL "
+                "AND upload_time >= datetime('now', ?)",
+                (f"-{self.window_days} days",)
+            ).fetchall()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read role popularity: {e}")
+            return scores
+        # Only roles the app can predict count; older rows hold free-form titles
+        known = {role_key(role): role for role in self.known_roles}
+        for (top_roles,) in rows:
+            try:
+                ranked = json.loads(top_roles)
+            except ValueError:
+                continue
+            for rank, entry in enumerate(ranked[:self.rank_depth]):
+                role = known.get(role_key(entry[0])) if known else entry[0]
+                if role:
+                    scores[role] += 1.0 / (rank + 1)
+        return scores
+
+    def hottest(self) -> List[str]:
+        """Roles to keep warm, most popular first"""
+        roles = [role for role, _ in self.popularity().most_common(self.top_n)]
+        seen = {role_key(role) for role in roles}
+        for role in self.known_roles:
+            if len(roles) >= self.top_n:
+                break
+            if role_key(role) not in seen:
+                roles.append(role)
+                seen.add(role_key(role))
+        return roles
+
+    def due(self, roles: Sequence[str]) -> List[str]:
+        """Roles whose cached listings are missing or expire within the margin"""
+        deadline = time.time() + self.refresh_margin
+        due = []
+        for role in roles:
+            expires_at = self.client.expires_at(role)
+            if expires_at is None or expires_at <= deadline:
+                due.append(role)
+        return due
+
+    def run_once(self) -> int:
+        """One scheduling pass; returns the number of roles refreshed"""
+        self._stats['passes'] += 1
+        if not self._hold_lease():
+            return 0
+        self._hot = self.hottest()
+        due = self.due(self._hot)
+        self._stats['last_due'] = len(due)
+        refreshed = 0
+        for index, role in enumerate(due):
+            if not self.bucket.try_take():
+                # Out of budget; the rest waits for the next pass
+                self._stats['deferred'] += len(due) - index
+                break
+            try:
+                self.client.refresh(role)
+            except (requests.RequestException, ValueError) as e:
+                self._stats['failed'] += 1
+                logger.warning(f"Prefetch of {role!r} failed: {e}")
+                continue
+            refreshed += 1
+        self._stats['refreshed'] += refreshed
+        if refreshed:
+            logger.info(f"Prefetched job listings for {refreshed} role(s)")
+        return refreshed
+
+    def _loop(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Job prefetch pass failed: {e}")
+            time.sleep(self.interval)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='job-prefetch', daemon=True)
+            self._thread.start()
+        return self
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats['hot_roles'] = self._hot
+        stats['owner'] = self.owner
+        return stats
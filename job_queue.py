@@ -0,0 +1,350 @@
+# === job_queue.py ===
+"""
+In-process background job queue with SQLite-backed job state.
+
+Jobs run on a bounded thread pool inside the web worker. Their state,
+and the input bytes until the job finishes, live in SQLite, so a job
+accepted by a worker that is restarted or killed is picked up again by
+recover() on the next start. Workers claim a job with an atomic status
+update, so two processes never run the same job.
+
+While the process runs, status reads also sweep for stale jobs (at most
+every few seconds): a job queued or running longer than stale_after in
+another process is re-queued here, and one whose handler is stuck in this
+process is failed. A run that has been replaced can no longer record an
+outcome, because every outcome is written against the claim it came from.
+
+Handlers can publish progress events (partial results) while they run;
+events are stored per job with a sequence number so any worker process can
+stream them, and a reconnecting client can resume after the last one seen.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+class QueueFull(RuntimeError):
+    """Raised when a queue already holds its maximum number of pending jobs"""
+
+
+class JobQueue:
+    """
+    Bounded background queue for one kind of job
+
+    Args:
+        db_path: SQLite database holding the background_jobs table
+        kind: Job kind; several queues can share one table
+        handler: Called as handler(payload, data, progress) on a worker
+            thread and returns a JSON-serialisable result; progress(stage,
+            data) publishes a partial result
+        max_workers: Jobs run concurrently
+        max_pending: Queued plus running jobs accepted before QueueFull
+        stale_after: Seconds after which a queued or running job is presumed
+            to belong to a dead worker (re-queued) or to be stuck in this
+            one (failed)
+        on_abandon: Called with the payload of a job failed as stuck, since
+            its handler never gets to record the failure itself
+    """
+
+    def __init__(self, db_path: str, kind: str, handler: Callable[[Dict, bytes, Callable], Any],
+                 max_workers: int = 2, max_pending: int = 50, stale_after: float = 600,
+                 on_abandon: Optional[Callable[[Dict], None]] = None):
+        self.db_path = db_path
+        self.kind = kind
+        self.handler = handler
+        self.max_pending = max_pending
+        self.stale_after = stale_after
+        self.on_abandon = on_abandon
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{kind}-job")
+        self._pending = 0
+        # Jobs scheduled on this process's executor, queued or running
+        self._local: Set[str] = set()
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+        # Wakes event streams in this process as soon as a job makes progress
+        self._changed = threading.Condition()
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS background_jobs (
+            id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            user_id INTEGER,
+            status TEXT NOT NULL,
+            payload TEXT,
+            data BLOB,
+            result TEXT,
+            error TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL
+        )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_background_jobs_status ON background_jobs(kind, status)')
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS background_job_events (
+            job_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            stage TEXT NOT NULL,
+            data TEXT,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (job_id, seq)
+        )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def pending(self) -> int:
+        """Jobs accepted by this process that have not finished"""
+        return self._pending
+
+    def submit(self, user_id: Optional[int], payload: Dict, data: bytes = b'') -> str:
+        """Persist a job and schedule it; returns the job id immediately"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"{self.kind} queue is full ({self.max_pending} pending jobs)")
+            self._pending += 1
+
+        job_id = uuid.uuid4().hex
+        try:
+            conn = self._connect()
+            conn.execute(
+                'INSERT INTO background_jobs (id, kind, user_id, status, payload, data, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, self.kind, user_id, STATUS_QUEUED, json.dumps(payload), data, time.time())
+            )
+            conn.commit()
+            conn.close()
+        except sqlite3.Error:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        with self._lock:
+            self._local.add(job_id)
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def _schedule(self, job_id: str):
+        with self._lock:
+            self._pending += 1
+            self._local.add(job_id)
+        self._executor.submit(self._run, job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job state without its input bytes, or None if unknown"""
+        self._maybe_sweep()
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT id, kind, user_id, status, payload, result, error, created_at, started_at, finished_at '
+            'FROM background_jobs WHERE id = ? AND kind = ?',
+            (job_id, self.kind)
+        ).fetchone()
+        conn.close()
+        if not row:
+            return None
+        job = dict(row)
+        job['payload'] = json.loads(job['payload']) if job['payload'] else {}
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        """Progress events of a job with a sequence number above `after`"""
+        conn = self._connect()
+        rows = conn.execute(
+            'SELECT seq, stage, data FROM background_job_events WHERE job_id = ? AND seq > ? ORDER BY seq',
+            (job_id, after)
+        ).fetchall()
+        conn.close()
+        return [{'seq': row['seq'], 'stage': row['stage'],
+                 'data': json.loads(row['data']) if row['data'] else None} for row in rows]
+
+    def wait(self, timeout: float):
+        """Block until a job in this process makes progress, or timeout"""
+        with self._changed:
+            self._changed.wait(timeout)
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def _progress_reporter(self, job_id: str) -> Callable[[str, Any], None]:
+        # Resume numbering after events stored by an earlier, interrupted run
+        existing = self.events(job_id)
+        sequence = [existing[-1]['seq'] if existing else 0]
+
+        def progress(stage: str, data: Any = None):
+            sequence[0] += 1
+            try:
+                conn = self._connect()
+                conn.execute(
+                    'INSERT INTO background_job_events (job_id, seq, stage, data, created_at) VALUES (?, ?, ?, ?, ?)',
+                    (job_id, sequence[0], stage, json.dumps(data), time.time())
+                )
+                conn.commit()
+                conn.close()
+            except sqlite3.Error as e:
+                # Progress is best effort; never fail the job over it
+                logger.warning(f"Could not record progress for job {job_id}: {e}")
+            self._notify()
+
+        return progress
+
+    def _claim(self, job_id: str):
+        """Mark the job running if it is still queued; returns (payload, data, started_at) or None"""
+        started_at = time.time()
+        conn = self._connect()
+        claimed = conn.execute(
+            'UPDATE background_jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?',
+            (STATUS_RUNNING, started_at, job_id, STATUS_QUEUED)
+        ).rowcount
+        conn.commit()
+        row = None
+        if claimed:
+            row = conn.execute('SELECT payload, data FROM background_jobs WHERE id = ?', (job_id,)).fetchone()
+        conn.close()
+        if not row:
+            return None
+        return json.loads(row['payload']), row['data'] or b'', started_at
+
+    def _finish(self, job_id: str, started_at: float, status: str, result: Any = None,
+                error: Optional[str] = None) -> bool:
+        """Record the outcome of the run claimed at started_at; False if it was since replaced"""
+        # The input bytes are no longer needed once the job has an outcome
+        conn = self._connect()
+        finished = conn.execute(
+            'UPDATE background_jobs SET status = ?, result = ?, error = ?, data = NULL, finished_at = ? '
+            'WHERE id = ? AND status = ? AND started_at = ?',
+            (status, json.dumps(result) if result is not None else None, error, time.time(),
+             job_id, STATUS_RUNNING, started_at)
+        ).rowcount
+        conn.commit()
+        conn.close()
+        self._notify()
+        if not finished:
+            logger.warning(f"{self.kind} job {job_id} was re-queued or failed as stale; dropping this run's outcome")
+        return bool(finished)
+
+    def _run(self, job_id: str):
+        try:
+            claimed = self._claim(job_id)
+            if claimed is None:
+                return
+            payload, data, started_at = claimed
+            try:
+                result = self.handler(payload, data, self._progress_reporter(job_id))
+            except Exception as e:
+                logger.error(f"{self.kind} job {job_id} failed: {e}")
+                self._finish(job_id, started_at, STATUS_FAILED, error=str(e))
+            else:
+                self._finish(job_id, started_at, STATUS_DONE, result=result)
+        except sqlite3.Error as e:
+            logger.error(f"{self.kind} job {job_id} state error: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._local.discard(job_id)
+
+    def recover(self) -> int:
+        """Re-schedule queued jobs and stale running jobs left by a previous worker"""
+        conn = self._connect()
+        conn.execute(
+            'UPDATE background_jobs SET status = ? WHERE kind = ? AND status = ? AND started_at < ?',
+            (STATUS_QUEUED, self.kind, STATUS_RUNNING, time.time() - self.stale_after)
+        )
+        conn.commit()
+        job_ids = [row['id'] for row in conn.execute(
+            'SELECT id FROM background_jobs WHERE kind = ? AND status = ? ORDER BY created_at',
+            (self.kind, STATUS_QUEUED)
+        )]
+        conn.close()
+
+        for job_id in job_ids:
+            self._schedule(job_id)
+        if job_ids:
+            logger.info(f"Recovered {len(job_ids)} {self.kind} job(s)")
+        return len(job_ids)
+
+    def _maybe_sweep(self):
+        """recover_stale(), at most once per sweep interval in this process"""
+        now = time.time()
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + min(30.0, self.stale_after / 4)
+        try:
+            self.recover_stale()
+        except sqlite3.Error as e:
+            logger.warning(f"{self.kind} stale job sweep failed: {e}")
+
+    def recover_stale(self) -> int:
+        """
+        Handle jobs queued or running for longer than stale_after
+
+        Jobs this process is not running belonged to a dead worker and are
+        re-queued here; a job whose handler is still running in this process
+        is stuck and is failed. Returns the number of jobs handled.
+        """
+        cutoff = time.time() - self.stale_after
+        conn = self._connect()
+        rows = conn.execute(
+            'SELECT id, status, payload, started_at FROM background_jobs WHERE kind = ? AND '
+            '((status = ? AND started_at < ?) OR (status = ? AND created_at < ?))',
+            (self.kind, STATUS_RUNNING, cutoff, STATUS_QUEUED, cutoff)
+        ).fetchall()
+        with self._lock:
+            local = set(self._local)
+
+        requeued, failed = [], []
+        for row in rows:
+            if row['id'] not in local:
+                # The row's started_at is the claim being replaced, so only one
+                # process re-queues it; _claim then lets one of them run it
+                if row['status'] == STATUS_QUEUED or conn.execute(
+                    'UPDATE background_jobs SET status = ? WHERE id = ? AND status = ? AND started_at = ?',
+                    (STATUS_QUEUED, row['id'], STATUS_RUNNING, row['started_at'])
+                ).rowcount:
+                    requeued.append(row['id'])
+            elif row['status'] == STATUS_RUNNING:
+                if conn.execute(
+                    'UPDATE background_jobs SET status = ?, error = ?, data = NULL, finished_at = ? '
+                    'WHERE id = ? AND status = ? AND started_at = ?',
+                    (STATUS_FAILED, f"Did not finish within {self.stale_after:.0f} seconds", time.time(),
+                     row['id'], STATUS_RUNNING, row['started_at'])
+                ).rowcount:
+                    failed.append(row)
+        conn.commit()
+        conn.close()
+
+        for job_id in requeued:
+            self._schedule(job_id)
+        for row in failed:
+            logger.error(f"{self.kind} job {row['id']} stuck for over {self.stale_after:.0f}s; marked failed")
+            if self.on_abandon is not None:
+                try:
+                    self.on_abandon(json.loads(row['payload']) if row['payload'] else {})
+                except Exception as e:
+                    logger.warning(f"on_abandon hook failed for job {row['id']}: {e}")
+        if requeued or failed:
+            self._notify()
+            logger.info(f"Stale {self.kind} jobs: {len(requeued)} re-queued, {len(failed)} failed")
+        return len(requeued) + len(failed)
@@ -1,30 +1,46 @@
-import requests
+# === job_scraper.py ===
+"""
+Standalone job lookups for scripts, backed by job_search.JobSearchClient.
 
-def get_jobs_for_role(role, max_results=5):
-    url = "https://jsearch.p.rapidapi.com/search"
-    querystring = {"query": role, "num_pages": "1"}
-    headers = {
-        "X-RapidAPI-Key": "d7c16a9efdmsh3f85b85a7b8ae51p14e8cfjsnfda220ee5c6f",  # Replace with your key
-        "X-RapidAPI-Host": "jsearch.p.rapidapi.com"
+The web app uses its own client (app.JOB_SEARCH); this module keeps the old
+get_jobs_for_role() interface for use outside it and shares the same cache
+database, so lookups made here and in the app reuse each other's results.
+"""
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
 
-    }
+from job_search import JobSearchClient
+
+JSEARCH_API_URL = os.environ.get('JSEARCH_API_URL', "https://jsearch.p.rapidapi.com/search")
+JSEARCH_API_KEY = os.environ.get('JSEARCH_API_KEY', "d7c16a9efdmsh3f85b85a7b8ae51p14e8cfjsnfda220ee5c6f")
+JSEARCH_API_HOST = "jsearch.p.rapidapi.com"
+JOB_CACHE_DB = os.environ.get('JOB_CACHE_DB', 'parse_cache.db')
+
+_client: Optional[JobSearchClient] = None
 
-    try:
-        response = requests.get(url, headers=headers, params=querystring)
-        if response.status_code != 200:
-            return [("Error fetching jobs (status {})".format(response.status_code), "#")]
 
-        data = response.json()
-        jobs = []
+def get_client() -> JobSearchClient:
+    global _client
+    if _client is None:
+        _client = JobSearchClient(JSEARCH_API_URL, JSEARCH_API_KEY, JSEARCH_API_HOST, JOB_CACHE_DB)
+    return _client
 
-        for job in data.get("data", [])[:max_results]:
-            title = job.get("job_title", "No Title")
-            link = job.get("job_apply_link") or job.get("job_google_link") or "#"
-            jobs.append((title, link))
 
-        if not jobs:
-            return [("No jobs found", "#")]
+def get_jobs_for_role(role: str, max_results: int = 5, timeout: float = 3) -> List[Tuple[str, str]]:
+    """(title, link) pairs for a role, or a single placeholder entry"""
+    jobs = get_client().search(role, timeout=timeout)
+    if jobs is None:
+        return [("Error fetching jobs", "#")]
+    if not jobs:
+        return [("No jobs found", "#")]
+    return jobs[:max_results]
 
-        return jobs
-    except Exception as e:
-        return [(f"Error fetching jobs: {e}", "#")]
+
+def get_jobs_for_roles(roles: Sequence[str], max_results: int = 5,
+                       timeout: float = 3) -> Dict[str, List[Tuple[str, str]]]:
+    """Concurrent get_jobs_for_role for several roles"""
+    found = get_client().search_roles(list(roles), timeout=timeout)
+    return {
+        role: (jobs[:max_results] if jobs else [("No jobs found" if jobs == [] else "Error fetching jobs", "#")])
+        for role, jobs in found.items()
+    }
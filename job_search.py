@@ -0,0 +1,355 @@
+# === job_search.py ===
+"""
+JSearch client with connection pooling, a role-keyed TTL cache and
+request coalescing.
+
+All lookups share one requests.Session, so repeat calls reuse pooled
+keep-alive connections instead of paying a TCP+TLS handshake each time.
+Results are cached per normalised role in two tiers: an in-process LRU
+(microsecond hits) and a SQLite table shared by every worker. When several
+threads miss on the same role at once, one of them calls the API and the
+others wait for its answer. If the API fails, a recently expired entry is
+served rather than nothing.
+
+search_roles() looks up several roles at once: an asyncio fan-out over a
+shared, bounded thread pool (the global cap on concurrent lookups), each
+lookup under its own timeout. Roles that time out come back as None while
+the others are returned, so the caller pays about one round trip. The
+fan-out runs on one event loop kept on a background thread, not a new loop
+per call.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+Job = Tuple[str, str]
+
+
+def role_key(role: str) -> str:
+    return ' '.join(role.lower().split())
+
+
+class JobSearchClient:
+    """
+    Cached JSearch lookups
+
+    Args:
+        api_url: Search endpoint; point it at a stub server for tests
+        api_key, api_host: RapidAPI credentials
+        db_path: SQLite database for the shared cache tier
+        ttl: Seconds a result stays fresh
+        stale_ttl: Seconds past expiry a result may still be served when
+            the API is failing
+        memory_size: Roles kept in the in-process tier
+        max_results: Jobs kept per role
+        pool_size: Pooled connections to the API host
+        fanout_workers: Lookups search_roles runs at once, across all callers
+        on_fetch: Called as on_fetch(role, results) with the raw API results
+            of every successful call (e.g. to keep a local corpus)
+    """
+
+    def __init__(self, api_url: str, api_key: str, api_host: str, db_path: str,
+                 ttl: float = 3600, stale_ttl: float = 86400, memory_size: int = 256,
+                 max_results: int = 5, pool_size: int = 10, fanout_workers: int = 8,
+                 on_fetch: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None):
+        self.api_url = api_url
+        self.db_path = db_path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.memory_size = memory_size
+        self.max_results = max_results
+        self.on_fetch = on_fetch
+
+        self.session = requests.Session()
+        self.session.headers.update({'X-RapidAPI-Key': api_key, 'X-RapidAPI-Host': api_host})
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._fanout = ThreadPoolExecutor(max_workers=fanout_workers, thread_name_prefix='job-search')
+
+        # role -> (expires_at, jobs)
+        self._memory: "OrderedDict[str, Tuple[float, List[Job]]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'upstream_calls': 0,
+            'upstream_errors': 0,
+            'stale_served': 0,
+            'refreshes': 0,
+            'fanout_timeouts': 0
+        }
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _init_db(self):
+        try:
+            conn = self._connect()
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS job_search_cache (
+                role TEXT PRIMARY KEY,
+                jobs TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            ''')
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Job search cache initialization error: {e}")
+
+    # ---------- cache tiers ----------
+    def _remember(self, key: str, expires_at: float, jobs: List[Job]):
+        # Caller holds self._lock
+        self._memory[key] = (expires_at, jobs)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _from_memory(self, key: str) -> Optional[List[Job]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            self._stats['memory_hits'] += 1
+            return entry[1]
+
+    def _from_disk(self, key: str, max_age_past_expiry: float = 0.0) -> Optional[Tuple[float, List[Job]]]:
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT expires_at, jobs FROM job_search_cache WHERE role = ? AND expires_at > ?',
+                (key, time.time() - max_age_past_expiry)
+            ).fetchone()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Job search cache read error: {e}")
+            return None
+        if not row:
+            return None
+        return row[0], [tuple(job) for job in json.loads(row[1])]
+
+    def _store(self, key: str, jobs: List[Job]):
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._remember(key, expires_at, jobs)
+        try:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO job_search_cache (role, jobs, fetched_at, expires_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(jobs), now, expires_at)
+            )
+            # Rows too old to be served even as stale results
+            conn.execute('DELETE FROM job_search_cache WHERE expires_at < ?', (now - self.stale_ttl,))
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Job search cache write error: {e}")
+
+    # ---------- upstream ----------
+    def fetch(self, role: str, timeout: float) -> List[Job]:
+        """Call the API directly, bypassing the cache; raises on failure"""
+        with self._lock:
+            self._stats['upstream_calls'] += 1
+        response = self.session.get(
+            self.api_url,
+            params={'query': role, 'num_pages': '1', 'page': '1'},
+            timeout=timeout
+        )
+        response.raise_for_status()
+        results = response.json().get('data', [])
+        if self.on_fetch is not None and results:
+            try:
+                self.on_fetch(role, results)
+            except Exception as e:
+                logger.warning(f"on_fetch hook failed for {role!r}: {e}")
+        jobs = []
+        for job in results[:self.max_results]:
+            # Same label and link precedence as job_corpus.normalize_posting
+            title = job.get('job_title') or 'No Title'
+            company = job.get('employer_name') or ''
+            link = job.get('job_apply_link') or job.get('job_google_link') or '#'
+            jobs.append((f"{title} at {company}" if company else title, link))
+        return jobs
+
+    def _load(self, key: str, role: str, timeout: float) -> Optional[List[Job]]:
+        """Second tier, then the API; run by exactly one thread per role"""
+        cached = self._from_disk(key)
+        if cached is not None:
+            with self._lock:
+                self._stats['disk_hits'] += 1
+                self._remember(key, *cached)
+            return cached[1]
+
+        with self._lock:
+            self._stats['misses'] += 1
+        try:
+            jobs = self.fetch(role, timeout)
+        except (requests.RequestException, ValueError) as e:
+            with self._lock:
+                self._stats['upstream_errors'] += 1
+            logger.warning(f"Job search for {role!r} failed: {e}")
+            return self._stale(key)
+        self._store(key, jobs)
+        return jobs
+
+    def _stale(self, key: str) -> Optional[List[Job]]:
+        """Expired entry still within stale_ttl, served when the API fails"""
+        stale = self._from_disk(key, max_age_past_expiry=self.stale_ttl)
+        if stale is None:
+            return None
+        with self._lock:
+            self._stats['stale_served'] += 1
+        return stale[1]
+
+    def _coalesced(self, key: str, load, timeout: float):
+        """Run load() unless the same role is already loading; then wait for that result"""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self._stats['coalesced'] += 1
+
+        if not leader:
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeout:
+                return None
+            except Exception:
+                # The leader failed (e.g. a background refresh) and reports the
+                # error itself; degrade the way a failed search() does
+                return self._stale(key)
+
+        try:
+            result = load()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def search(self, role: str, timeout: float = 3) -> Optional[List[Job]]:
+        """
+        Jobs for a role, served from cache when fresh
+
+        Returns:
+            Up to max_results (title, link) pairs, possibly empty, or None
+            when the API failed and nothing usable was cached
+        """
+        key = role_key(role)
+        jobs = self._from_memory(key)
+        if jobs is not None:
+            return jobs
+        return self._coalesced(key, lambda: self._load(key, role, timeout), timeout)
+
+    async def search_roles_async(self, roles: List[str], timeout: float = 3) -> Dict[str, Optional[List[Job]]]:
+        """Concurrent search() for each role; a role that fails or overruns timeout maps to None"""
+        loop = asyncio.get_running_loop()
+
+        async def one(role):
+            jobs = self._from_memory(role_key(role))
+            if jobs is not None:
+                return role, jobs
+            try:
+                return role, await asyncio.wait_for(
+                    loop.run_in_executor(self._fanout, self.search, role, timeout), timeout)
+            except asyncio.TimeoutError:
+                # The lookup keeps running in the pool; its result still lands in the cache
+                with self._lock:
+                    self._stats['fanout_timeouts'] += 1
+                return role, None
+            except Exception as e:
+                # One role's failure must not discard the others' results
+                logger.warning(f"Job search for {role!r} failed: {e}")
+                return role, None
+
+        return dict(await asyncio.gather(*(one(role) for role in dict.fromkeys(roles))))
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Fan-out event loop, started on first use and run on a daemon thread"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='job-search-loop', daemon=True).start()
+            return self._loop
+
+    def search_roles(self, roles: List[str], timeout: float = 3) -> Dict[str, Optional[List[Job]]]:
+        """
+        Jobs for several roles in about one round trip
+
+        Must be called from synchronous code (a request or worker thread);
+        the fan-out runs on the client's shared event loop.
+
+        Returns:
+            {role: jobs or None} in the order the roles were given
+        """
+        return asyncio.run_coroutine_threadsafe(self.search_roles_async(roles, timeout), self._event_loop()).result()
+
+    def expires_at(self, role: str) -> Optional[float]:
+        """When the cached entry for a role goes stale (shared tier), or None if uncached"""
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT expires_at FROM job_search_cache WHERE role = ?',
+                               (role_key(role),)).fetchone()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Job search cache read error: {e}")
+            return None
+        return row[0] if row else None
+
+    def refresh(self, role: str, timeout: float = 10) -> Optional[List[Job]]:
+        """
+        Fetch a role from the API and re-cache it ahead of expiry
+
+        Raises the API error when this call made the request. If the role
+        was already loading, waits for that lookup instead: returns its
+        jobs, the stale entry (or None) if it failed, or None if it is
+        still running after timeout.
+        """
+        key = role_key(role)
+
+        def load():
+            with self._lock:
+                self._stats['refreshes'] += 1
+            jobs = self.fetch(role, timeout)
+            self._store(key, jobs)
+            return jobs
+
+        return self._coalesced(key, load, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+            stats['inflight'] = len(self._inflight)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 3) if lookups else 0.0
+        return stats
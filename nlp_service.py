@@ -0,0 +1,285 @@
+# === nlp_service.py ===
+"""
+Optional NLP service: a few long-lived processes own the spaCy pipeline and
+serve entity extraction to every web worker over a Unix socket.
+
+Without it each gunicorn worker loads its own copy of the model. With it,
+web workers are thin clients and NLP memory no longer scales with web
+concurrency. The model is loaded once in the service's parent process and
+then the workers are forked, so they start with the pipeline in memory.
+Each worker accepts connections on the shared socket and batches requests
+that arrive within a few milliseconds of each other into one nlp.pipe call.
+
+Start the service, then point the web app at it:
+    python nlp_service.py --socket /tmp/pathpilot-nlp.sock --workers 2
+    NLP_SERVICE_SOCKET=/tmp/pathpilot-nlp.sock gunicorn app:app
+
+Wire format: each message is a 4-byte big-endian length followed by UTF-8
+JSON. Requests are {"op": "ents", "texts": [...]} or {"op": "ping"};
+responses are {"docs": [[[text, label, start, end], ...], ...]}, a ping
+reply, or {"error": "..."}.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_BATCH_SIZE = 16
+DEFAULT_BATCH_WAIT = 0.005
+
+_HEADER = struct.Struct('>I')
+_MAX_MESSAGE = 64 * 1024 * 1024
+
+
+class NLPServiceError(RuntimeError):
+    """Raised when the NLP service cannot be reached or fails a request"""
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]):
+    payload = json.dumps(message).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed mid-message")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _recv(sock: socket.socket) -> Dict[str, Any]:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    if size > _MAX_MESSAGE:
+        raise ConnectionError(f"message too large ({size} bytes)")
+    return json.loads(_recv_exact(sock, size).decode('utf-8'))
+
+
+# ==================== CLIENT ====================
+class RemoteEntity(NamedTuple):
+    text: str
+    label_: str
+    start_char: int
+    end_char: int
+
+
+class RemoteDoc:
+    """The parts of a spaCy Doc the parser reads: text and entities"""
+
+    def __init__(self, text: str, ents: List[RemoteEntity]):
+        self.text = text
+        self.ents = ents
+
+    def __len__(self):
+        return len(self.text)
+
+
+class NLPServiceClient:
+    """
+    Drop-in for the spaCy pipeline in resume_parser, backed by the service
+
+    Supports nlp(text) and nlp.pipe(texts, as_tuples=..., batch_size=...);
+    each call opens a short-lived connection, so the client is thread-safe.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = DEFAULT_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def _request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                _send(sock, message)
+                reply = _recv(sock)
+        except (OSError, ConnectionError, ValueError) as e:
+            raise NLPServiceError(f"NLP service at {self.socket_path} unavailable: {e}") from e
+        if 'error' in reply:
+            raise NLPServiceError(f"NLP service error: {reply['error']}")
+        return reply
+
+    def ping(self) -> Dict[str, Any]:
+        return self._request({'op': 'ping'})
+
+    def _docs(self, texts: List[str]) -> List[RemoteDoc]:
+        reply = self._request({'op': 'ents', 'texts': texts})
+        return [RemoteDoc(text, [RemoteEntity(*ent) for ent in ents])
+                for text, ents in zip(texts, reply['docs'])]
+
+    def __call__(self, text: str) -> RemoteDoc:
+        return self._docs([text])[0]
+
+    def pipe(self, texts: Iterable, as_tuples: bool = False,
+             batch_size: int = DEFAULT_BATCH_SIZE, **kwargs) -> Iterator:
+        """Stream docs in input order, sending batch_size texts per request"""
+        batch: List = []
+        for item in texts:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield from self._pipe_batch(batch, as_tuples)
+                batch = []
+        if batch:
+            yield from self._pipe_batch(batch, as_tuples)
+
+    def _pipe_batch(self, batch: List, as_tuples: bool) -> Iterator:
+        if not as_tuples:
+            yield from self._docs(batch)
+            return
+        docs = self._docs([text for text, _ in batch])
+        yield from ((doc, context) for doc, (_, context) in zip(docs, batch))
+
+
+# ==================== SERVER ====================
+class _Batcher:
+    """Collects concurrent requests in one worker and runs them through nlp.pipe together"""
+
+    def __init__(self, nlp, batch_size: int, batch_wait: float):
+        self.nlp = nlp
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.requests: "queue.Queue[Tuple[List[str], queue.Queue]]" = queue.Queue()
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def submit(self, texts: List[str]) -> List[List[list]]:
+        reply: queue.Queue = queue.Queue(maxsize=1)
+        self.requests.put((texts, reply))
+        result = reply.get()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _loop(self):
+        while True:
+            pending = [self.requests.get()]
+            count = len(pending[0][0])
+            deadline = time.monotonic() + self.batch_wait
+            while count < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                count += len(item[0])
+
+            texts = [text for request_texts, _ in pending for text in request_texts]
+            try:
+                docs = [[[ent.text, ent.label_, ent.start_char, ent.end_char] for ent in doc.ents]
+                        for doc in self.nlp.pipe(texts, batch_size=self.batch_size)]
+            except Exception as e:
+                logger.error(f"nlp.pipe failed: {e}")
+                for _, reply in pending:
+                    reply.put(e)
+                continue
+
+            offset = 0
+            for request_texts, reply in pending:
+                reply.put(docs[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+
+def _handle(conn: socket.socket, batcher: _Batcher, info: Dict[str, Any]):
+    with conn:
+        try:
+            message = _recv(conn)
+            if message.get('op') == 'ping':
+                _send(conn, dict(info, pid=os.getpid()))
+            elif message.get('op') == 'ents':
+                texts = [str(text) for text in message.get('texts', [])]
+                _send(conn, {'docs': batcher.submit(texts)})
+            else:
+                _send(conn, {'error': f"unknown op {message.get('op')!r}"})
+        except Exception as e:
+            try:
+                _send(conn, {'error': str(e)})
+            except OSError:
+                pass
+
+
+def _serve(listener: socket.socket, nlp, batch_size: int, batch_wait: float, info: Dict[str, Any]):
+    """Worker process: accept connections and hand each one to a thread"""
+    # Don't run the parent's shutdown handler (restarted workers inherit it):
+    # SIGTERM from the parent exits at once, Ctrl-C takes the default action
+    signal.signal(signal.SIGTERM, lambda *_: os._exit(0))
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    batcher = _Batcher(nlp, batch_size, batch_wait)
+    while True:
+        conn, _ = listener.accept()
+        threading.Thread(target=_handle, args=(conn, batcher, info), daemon=True).start()
+
+
+def serve(socket_path: str, workers: int = 2, batch_size: int = DEFAULT_BATCH_SIZE,
+          batch_wait: float = DEFAULT_BATCH_WAIT):
+    """Load the pipeline, fork the workers and supervise them until terminated"""
+    import resume_parser
+
+    nlp = resume_parser.load_nlp()
+    info = {'ok': True, 'model': resume_parser.NLP_MODEL, 'profile': resume_parser.NLP_PROFILE,
+            'pipes': nlp.pipe_names, 'parser_version': resume_parser.PARSER_VERSION}
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(128)
+
+    context = multiprocessing.get_context('fork')
+    processes: List[multiprocessing.Process] = []
+
+    def start_worker():
+        process = context.Process(target=_serve, args=(listener, nlp, batch_size, batch_wait, info), daemon=True)
+        process.start()
+        processes.append(process)
+
+    def stop(*_):
+        for process in processes:
+            process.terminate()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        sys.exit(0)
+
+    for _ in range(workers):
+        start_worker()
+    # Installed after the first fork, so those workers never inherit stop()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    logger.info(f"NLP service on {socket_path}: {workers} workers, pipes {nlp.pipe_names}")
+
+    # Replace workers that die so the socket always has someone accepting
+    while True:
+        time.sleep(1)
+        for process in list(processes):
+            if not process.is_alive():
+                logger.warning(f"NLP worker {process.pid} exited ({process.exitcode}); restarting")
+                processes.remove(process)
+                start_worker()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve spaCy entity extraction over a Unix socket")
+    parser.add_argument('--socket', default=os.environ.get('NLP_SERVICE_SOCKET', '/tmp/pathpilot-nlp.sock'))
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--batch-wait-ms', type=float, default=DEFAULT_BATCH_WAIT * 1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    serve(args.socket, args.workers, args.batch_size, args.batch_wait_ms / 1000)
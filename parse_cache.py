@@ -0,0 +1,148 @@
+# === parse_cache.py ===
+"""
+Content-addressed cache for parse results.
+
+Results are keyed by the SHA-256 of the uploaded bytes plus a namespace
+that names the producer and the taxonomy/model revision, so re-uploading
+the same file skips extraction and parsing entirely while any taxonomy
+change invalidates old entries. Two tiers: a small in-process LRU and a
+size-bounded SQLite table shared by every worker.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    """Two-tier (memory LRU + SQLite) cache of JSON-serialisable results"""
+
+    def __init__(self, db_path: str, memory_size: int = 128, max_entries: int = 5000):
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _init_db(self):
+        try:
+            conn = self._connect()
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_parse_cache_access ON parse_cache(last_access)')
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Parse cache initialization error: {e}")
+
+    @staticmethod
+    def make_key(data: bytes, namespace: str) -> str:
+        """Cache key for raw file bytes under a producer/version namespace"""
+        return f"{namespace}:{content_hash(data)}"
+
+    def _remember(self, key: str, value: str):
+        # Caller holds self._lock
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return json.loads(value)
+
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT value FROM parse_cache WHERE key = ?', (key,)).fetchone()
+            if row:
+                conn.execute('UPDATE parse_cache SET last_access = ? WHERE key = ?', (time.time(), key))
+                conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Parse cache read error: {e}")
+            row = None
+
+        with self._lock:
+            if row:
+                self._stats['disk_hits'] += 1
+                self._remember(key, row[0])
+                return json.loads(row[0])
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, key: str, result: Any):
+        value = json.dumps(result)
+        with self._lock:
+            self._remember(key, value)
+
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO parse_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)',
+                (key, value, now, now)
+            )
+            # Evict least recently used rows beyond the size bound
+            count = conn.execute('SELECT COUNT(*) FROM parse_cache').fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    'DELETE FROM parse_cache WHERE key IN '
+                    '(SELECT key FROM parse_cache ORDER BY last_access ASC LIMIT ?)',
+                    (overflow,)
+                )
+                with self._lock:
+                    self._stats['evictions'] += overflow
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Parse cache write error: {e}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any],
+                       cacheable: Callable[[Any], bool] = lambda result: True) -> Any:
+        """Return the cached result for key, computing and storing it on a miss"""
+        result = self.get(key)
+        if result is not None:
+            return result
+        result = compute()
+        if cacheable(result):
+            self.put(key, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._memory)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 3) if lookups else 0.0
+        return stats
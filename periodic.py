@@ -0,0 +1,83 @@
+# === periodic.py ===
+"""
+Values recomputed on a schedule in the background.
+
+A PeriodicRefresh holds the latest result of an expensive, user-independent
+computation (for example content that needs a network call). Readers get
+the held value immediately and never wait on the computation. The value
+starts from a cheap seed, is replaced once the first background run
+finishes, and is then refreshed every interval. A failed refresh keeps the
+previous value.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicRefresh:
+    """
+    Background-refreshed value
+
+    Args:
+        name: Used for the thread name and in logs
+        compute: Produces the full value; may block (network, disk)
+        interval: Seconds between refreshes
+        seed: Cheap function for the value served until compute first succeeds
+    """
+
+    def __init__(self, name: str, compute: Callable[[], Any], interval: float,
+                 seed: Optional[Callable[[], Any]] = None):
+        self.name = name
+        self.compute = compute
+        self.interval = interval
+        self._value = seed() if seed is not None else None
+        self._refreshed_at: Optional[float] = None
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'refreshes': 0, 'failures': 0, 'last_ms': None, 'last_error': None}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name=f"refresh-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def get(self) -> Any:
+        return self._value
+
+    def refresh_now(self):
+        """Wake the background thread for an early refresh"""
+        self._wake.set()
+
+    def refresh(self) -> bool:
+        """Recompute in the calling thread; returns False if compute raised and the previous value was kept"""
+        start = time.perf_counter()
+        try:
+            value = self.compute()
+        except Exception as e:
+            self._stats['failures'] += 1
+            self._stats['last_error'] = str(e)
+            logger.warning(f"Refreshing {self.name} failed, keeping previous value: {e}")
+            return False
+        # A single reference swap; readers see either the old or the new value
+        self._value = value
+        self._refreshed_at = time.time()
+        self._stats['refreshes'] += 1
+        self._stats['last_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        self._stats['last_error'] = None
+        return True
+
+    def _loop(self):
+        while True:
+            self.refresh()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats['interval'] = self.interval
+        stats['age_seconds'] = round(time.time() - self._refreshed_at, 1) if self._refreshed_at else None
+        return stats
@@ -0,0 +1,110 @@
+# === pipeline.py ===
+"""
+Deadline-aware stage runner for request pipelines.
+
+A request gets one overall deadline. Each stage runs in a worker thread
+with the smaller of its own budget and the time left on the deadline; the
+stage callable receives that number so it can pass it on (e.g. as a
+network timeout). A stage that overruns, raises, or starts after the
+deadline has passed is replaced by its cheap fallback, and the request
+carries on. Timings and fallbacks are recorded for every stage.
+
+A timed-out stage cannot be interrupted; its thread finishes in the
+background and its result is discarded (a cache write inside it still
+benefits the next request).
+"""
+import logging
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = 'ok'
+STATUS_TIMEOUT = 'timeout'
+STATUS_ERROR = 'error'
+STATUS_SKIPPED = 'skipped'
+
+
+class Deadline:
+    """Absolute point in time shared by every stage of one request"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+
+class StagedPipeline:
+    """Run named stages under per-stage budgets and one overall deadline"""
+
+    def __init__(self, executor: Executor, deadline_seconds: float,
+                 budgets: Optional[Dict[str, float]] = None):
+        self.executor = executor
+        self.deadline = Deadline(deadline_seconds)
+        self.budgets = budgets or {}
+        self.stages: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+
+    def run(self, name: str, func: Callable[[float], Any], fallback: Callable[[], Any]) -> Any:
+        """
+        Run one stage, falling back when it overruns or fails
+
+        Args:
+            name: Stage name, also the key into the budgets
+            func: Called with the stage's effective timeout in seconds
+            fallback: Cheap replacement result, run inline
+
+        Returns:
+            The stage result, or the fallback result
+        """
+        timeout = self.deadline.remaining()
+        if name in self.budgets:
+            timeout = min(timeout, self.budgets[name])
+
+        start = time.perf_counter()
+        if timeout <= 0:
+            status = STATUS_SKIPPED
+        else:
+            future = self.executor.submit(func, timeout)
+            try:
+                value = future.result(timeout=timeout)
+                status = STATUS_OK
+            except TimeoutError:
+                future.cancel()
+                status = STATUS_TIMEOUT
+            except Exception as e:
+                logger.warning(f"Stage {name} failed: {e}")
+                status = STATUS_ERROR
+
+        if status != STATUS_OK:
+            logger.info(f"Stage {name} {status} after {(time.perf_counter() - start) * 1000:.0f} ms; using fallback")
+            value = fallback()
+
+        self.stages.append({
+            'name': name,
+            'ms': round((time.perf_counter() - start) * 1000, 1),
+            'budget_ms': round(timeout * 1000, 1),
+            'status': status,
+            'fallback': status != STATUS_OK
+        })
+        return value
+
+    @property
+    def fallbacks(self) -> List[str]:
+        return [stage['name'] for stage in self.stages if stage['fallback']]
+
+    def report(self) -> Dict[str, Any]:
+        """Timings for storage alongside the request's result"""
+        return {
+            'deadline_ms': round(self.deadline.seconds * 1000, 1),
+            'total_ms': round((time.perf_counter() - self._started) * 1000, 1),
+            'stages': self.stages,
+            'fallbacks': self.fallbacks
+        }
@@ -0,0 +1,398 @@
+# === resume_analysis.py ===
+"""
+App-level resume analysis: the department skill taxonomy and the
+extractors behind /analyze (contact details, education, experience and
+skills).
+
+Kept free of Flask and app start-up side effects so the extraction pool,
+benchmarks and the artifact prebuild can import it on its own; app.py
+imports what it needs from here.
+"""
+import re
+
+from resume_sections import segment_resume
+from skill_matcher import MATCHER_VERSION, SkillMatcher
+from taxonomy_artifacts import load_or_build, taxonomy_fingerprint
+
+# --------------------------
+# COMPREHENSIVE SKILL DATABASE BY DEPARTMENT
+# --------------------------
+SKILL_DATABASE = {
+    # TECHNOLOGY SKILLS
+    'technology': {
+        'Programming Languages': [
+            'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Ruby', 'PHP', 'Swift', 
+            'Kotlin', 'Go', 'Rust', 'Scala', 'Perl', 'R', 'MATLAB', 'Dart', 'Elixir', 'Haskell'
+        ],
+        'Web Development': [
+            'HTML', 'HTML5', 'CSS', 'CSS3', 'SASS', 'LESS', 'React', 'React.js', 'Angular', 
+            'Angular.js', 'Vue', 'Vue.js', 'Next.js', 'Nuxt.js', 'Node.js', 'Express.js', 
+            'Django', 'Flask', 'FastAPI', 'Spring', 'Spring Boot', 'ASP.NET', 'Laravel', 
+            'Ruby on Rails', 'jQuery', 'Bootstrap', 'Tailwind', 'Material UI', 'Redux', 
+            'Webpack', 'Babel', 'REST API', 'GraphQL', 'API Development'
+        ],
+        'Databases': [
+            'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Cassandra', 'Oracle', 
+            'SQL Server', 'SQLite', 'DynamoDB', 'Firebase', 'MariaDB', 'CouchDB', 'Elasticsearch',
+            'Database Design', 'Data Modeling', 'Query Optimization'
+        ],
+        'Cloud & DevOps': [
+            'AWS', 'Amazon Web Services', 'Azure', 'Google Cloud', 'GCP', 'Docker', 
+            'Kubernetes', 'Jenkins', 'GitHub Actions', 'GitLab CI', 'CircleCI', 'Terraform', 
+            'Ansible', 'Puppet', 'Chef', 'CloudFormation', 'CI/CD', 'DevOps', 'Linux', 
+            'Unix', 'Bash', 'Shell Scripting', 'Nginx', 'Apache', 'Infrastructure as Code'
+        ],
+        'Data Science & ML': [
+            'Machine Learning', 'Deep Learning', 'Neural Networks', 'NLP', 'Natural Language Processing',
+            'Computer Vision', 'TensorFlow', 'PyTorch', 'Keras', 'Scikit-learn', 'Pandas', 
+            'NumPy', 'SciPy', 'Matplotlib', 'Seaborn', 'Plotly', 'Jupyter', 'Data Analysis',
+            'Data Visualization', 'Statistics', 'Statistical Analysis', 'Feature Engineering',
+            'Model Deployment', 'MLOps', 'Big Data', 'Spark', 'Hadoop', 'Data Mining'
+        ],
+        'Mobile Development': [
+            'iOS', 'Android', 'Swift', 'Kotlin', 'React Native', 'Flutter', 'Xamarin', 
+            'Ionic', 'Mobile App Development', 'UI/UX for Mobile'
+        ],
+        'Testing': [
+            'Testing', 'Unit Testing', 'Integration Testing', 'Jest', 'Mocha', 'Chai',
+            'Selenium', 'Cypress', 'Puppeteer', 'JUnit', 'PyTest', 'QA', 'Quality Assurance',
+            'Test Automation', 'Manual Testing'
+        ],
+        'Tools & Methodologies': [
+            'Git', 'GitHub', 'GitLab', 'Bitbucket', 'JIRA', 'Confluence', 'Slack', 'Trello',
+            'Agile', 'Scrum', 'Kanban', 'Waterfall', 'Project Management', 'VS Code', 
+            'IntelliJ', 'Eclipse', 'Postman', 'Swagger', 'Figma', 'Adobe XD'
+        ],
+        'Security': [
+            'Cybersecurity', 'Network Security', 'Information Security', 'Encryption',
+            'Penetration Testing', 'Ethical Hacking', 'Security Auditing', 'CISSP',
+            'CompTIA Security+', 'Firewalls', 'SIEM', 'Incident Response'
+        ]
+    },
+    
+    # FINANCE SKILLS
+    'finance': {
+        'Financial Analysis': [
+            'Financial Analysis', 'Financial Modeling', 'Valuation', 'DCF', 'LBO', 'M&A',
+            'Financial Planning', 'Budgeting', 'Forecasting', 'Financial Reporting',
+            'Investment Analysis', 'Portfolio Management', 'Risk Management'
+        ],
+        'Accounting': [
+            'Accounting', 'Bookkeeping', 'GAAP', 'IFRS', 'Tax Preparation', 'Auditing',
+            'Accounts Payable', 'Accounts Receivable', 'General Ledger', 'Financial Statements',
+            'Balance Sheet', 'Income Statement', 'Cash Flow'
+        ],
+        'Investment': [
+            'Investment Banking', 'Private Equity', 'Venture Capital', 'Asset Management',
+            'Equity Research', 'Fixed Income', 'Derivatives', 'Trading', 'Hedge Funds',
+            'Wealth Management', 'Financial Advisory'
+        ],
+        'Financial Software': [
+            'Excel', 'Advanced Excel', 'VBA', 'Bloomberg Terminal', 'Reuters Eikon',
+            'QuickBooks', 'SAP FI', 'Oracle Financials', 'Peachtree', 'Tableau', 'Power BI'
+        ],
+        'Banking': [
+            'Commercial Banking', 'Retail Banking', 'Corporate Banking', 'Credit Analysis',
+            'Loan Processing', 'Mortgage', 'Wealth Management', 'Private Banking'
+        ],
+        'FinTech': [
+            'Blockchain', 'Cryptocurrency', 'Smart Contracts', 'Payments', 'Digital Banking',
+            'FinTech Regulations', 'Payment Gateways', 'Mobile Payments'
+        ]
+    },
+    
+    # MARKETING SKILLS
+    'marketing': {
+        'Digital Marketing': [
+            'SEO', 'Search Engine Optimization', 'SEM', 'Search Engine Marketing',
+            'PPC', 'Pay Per Click', 'Google Ads', 'Facebook Ads', 'Social Media Marketing',
+            'Content Marketing', 'Email Marketing', 'Marketing Automation'
+        ],
+        'Analytics': [
+            'Google Analytics', 'Data Analytics', 'Marketing Analytics', 'Conversion Rate Optimization',
+            'A/B Testing', 'Customer Analytics', 'Market Research', 'Competitive Analysis'
+        ],
+        'Brand Management': [
+            'Brand Strategy', 'Brand Management', 'Brand Development', 'Brand Identity',
+            'Marketing Strategy', 'Campaign Management', 'Product Marketing'
+        ],
+        'Content Creation': [
+            'Copywriting', 'Content Writing', 'Blogging', 'Technical Writing', 'Creative Writing',
+            'Video Production', 'Photography', 'Graphic Design', 'Adobe Creative Suite',
+            'Photoshop', 'Illustrator', 'InDesign', 'Canva'
+        ],
+        'Social Media': [
+            'Social Media Management', 'Community Management', 'Instagram', 'Facebook',
+            'Twitter', 'LinkedIn', 'TikTok', 'YouTube', 'Social Media Strategy'
+        ],
+        'PR & Communications': [
+            'Public Relations', 'Media Relations', 'Corporate Communications',
+            'Crisis Communication', 'Press Releases', 'Event Planning'
+        ]
+    },
+    
+    # HUMAN RESOURCES SKILLS
+    'hr': {
+        'Recruitment': [
+            'Recruiting', 'Talent Acquisition', 'Sourcing', 'Interviewing', 'Candidate Screening',
+            'Headhunting', 'Executive Search', 'Applicant Tracking Systems', 'Workday', 'Greenhouse'
+        ],
+        'HR Operations': [
+            'HR Management', 'HRIS', 'Employee Relations', 'Performance Management',
+            'Compensation & Benefits', 'Payroll', 'HR Policies', 'Compliance'
+        ],
+        'Training & Development': [
+            'Training', 'Learning & Development', 'Onboarding', 'Employee Training',
+            'Talent Management', 'Succession Planning', 'Coaching', 'Mentoring'
+        ],
+        'HR Strategy': [
+            'HR Strategy', 'Organizational Development', 'Workforce Planning',
+            'Change Management', 'Culture Building', 'Employee Engagement'
+        ],
+        'HR Compliance': [
+            'Labor Law', 'Employment Law', 'HR Compliance', 'EEO', 'OSHA',
+            'Workplace Safety', 'HR Auditing'
+        ]
+    },
+    
+    # SALES SKILLS
+    'sales': {
+        'Sales Techniques': [
+            'Sales', 'Business Development', 'Account Management', 'Lead Generation',
+            'Cold Calling', 'Negotiation', 'Closing', 'Upselling', 'Cross-selling'
+        ],
+        'Sales Management': [
+            'Sales Management', 'Sales Strategy', 'Sales Operations', 'Sales Forecasting',
+            'Territory Management', 'Team Leadership', 'Sales Training'
+        ],
+        'CRM': [
+            'Salesforce', 'HubSpot', 'Zoho CRM', 'Microsoft Dynamics', 'CRM Software',
+            'Customer Relationship Management'
+        ],
+        'B2B Sales': [
+            'B2B Sales', 'Enterprise Sales', 'Solution Selling', 'Consultative Selling',
+            'Strategic Partnerships', 'Channel Sales'
+        ],
+        'B2C Sales': [
+            'B2C Sales', 'Retail Sales', 'E-commerce', 'Direct Sales', 'Inside Sales'
+        ]
+    }
+}
+
+# Flatten skills with department info for better matching
+ALL_SKILLS_WITH_DEPT = []
+for dept, categories in SKILL_DATABASE.items():
+    for category, skills in categories.items():
+        for skill in skills:
+            ALL_SKILLS_WITH_DEPT.append({
+                'skill': skill.lower(),
+                'display': skill,
+                'category': category,
+                'department': dept
+            })
+
+# Skill variations for better matching
+SKILL_VARIATIONS = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'k8s': 'kubernetes',
+    'tf': 'tensorflow',
+    'sklearn': 'scikit-learn',
+    'aws': 'amazon web services',
+    'gcp': 'google cloud platform',
+    'cpp': 'c++',
+    'csharp': 'c#',
+    'reactjs': 'react',
+    'vuejs': 'vue.js',
+    'nodejs': 'node.js',
+    'expressjs': 'express.js',
+    'd3': 'd3.js',
+    'ai': 'artificial intelligence',
+    'nlp': 'natural language processing',
+    'cv': 'computer vision',
+    'fintech': 'financial technology',
+    'seo': 'search engine optimization',
+    'sem': 'search engine marketing',
+    'ppc': 'pay per click',
+    'crm': 'customer relationship management',
+    'erp': 'enterprise resource planning',
+    'hris': 'human resource information system'
+}
+
+# --------------------------
+# EXTRACTORS
+# --------------------------
+def extract_contact_info(text):
+    """Extract contact information"""
+    contact = {
+        'name': None,
+        'email': None,
+        'phone': None,
+        'linkedin': None,
+        'github': None
+    }
+    
+    lines = text.split('\n')[:10]
+    
+    # Extract name (usually first non-empty line)
+    for line in lines:
+        line = line.strip()
+        if line and len(line.split()) <= 4 and not any(x in line.lower() for x in ['@', 'http', 'www', 'phone', 'email']):
+            contact['name'] = line
+            break
+    
+    # Extract email
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    emails = re.findall(email_pattern, text)
+    if emails:
+        contact['email'] = emails[0]
+    
+    # Extract phone
+    phone_pattern = r'(\+\d{1,3}[-.]?)?\(?\d{3}\)?[-.]?\d{3}[-.]?\d{4}'
+    phones = re.findall(phone_pattern, text)
+    if phones:
+        contact['phone'] = phones[0]
+    
+    # Extract LinkedIn
+    linkedin_pattern = r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+'
+    linkedin = re.findall(linkedin_pattern, text, re.IGNORECASE)
+    if linkedin:
+        contact['linkedin'] = linkedin[0]
+    
+    # Extract GitHub
+    github_pattern = r'(?:https?://)?(?:www\.)?github\.com/[\w-]+'
+    github = re.findall(github_pattern, text, re.IGNORECASE)
+    if github:
+        contact['github'] = github[0]
+    
+    return contact
+
+def extract_education(text):
+    """Extract education information"""
+    education = []
+    edu_keywords = ['bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'b.e', 'm.e', 'b.sc', 'm.sc', 
+                    'bca', 'mca', 'mba', 'degree', 'university', 'college', 'institute']
+    
+    lines = text.split('\n')
+    for i, line in enumerate(lines):
+        line_lower = line.lower()
+        if any(keyword in line_lower for keyword in edu_keywords):
+            edu_text = line.strip()
+            # Get next line if it's part of education
+            if i + 1 < len(lines) and len(lines[i + 1].strip()) > 0:
+                next_line = lines[i + 1].strip()
+                if not any(x in next_line.lower() for x in ['experience', 'skill', 'project']):
+                    edu_text += " " + next_line
+            education.append(edu_text)
+    
+    return list(set(education))[:3]
+
+def extract_experience_summary(text, in_section=False):
+    """Extract work experience summary (in_section: text is already the experience section)"""
+    exp_keywords = ['experience', 'work', 'employment', 'job']
+    experience = []
+    
+    lines = text.split('\n')
+    # Headings like "Career History" or "Internships" match no keyword above
+    exp_section = in_section
+    
+    for i, line in enumerate(lines):
+        line_lower = line.lower()
+        
+        # Find experience section
+        if any(keyword in line_lower for keyword in exp_keywords) and 'summary' not in line_lower:
+            exp_section = True
+            continue
+        
+        # Extract experience entries (usually with dates)
+        if exp_section and re.search(r'\b(19|20)\d{2}\b', line):
+            exp_text = line.strip()
+            # Get next few lines for context
+            for j in range(1, 4):
+                if i + j < len(lines) and lines[i + j].strip():
+                    next_line = lines[i + j].strip()
+                    if not any(x in next_line.lower() for x in ['education', 'skill', 'project']):
+                        exp_text += " " + next_line
+                    else:
+                        break
+            experience.append(exp_text)
+        
+        # End of experience section
+        if exp_section and any(keyword in line_lower for keyword in ['education', 'skill', 'project']):
+            exp_section = False
+    
+    return experience[:5]
+
+def build_skill_matcher():
+    """Compile the skill taxonomy and its variations into a single automaton"""
+    index_by_skill = {}
+    keywords = []
+    for idx, skill_info in enumerate(ALL_SKILLS_WITH_DEPT):
+        index_by_skill.setdefault(skill_info['skill'], idx)
+        keywords.append((skill_info['skill'], ('skill', idx)))
+    
+    # Variations only count when their full form is part of the taxonomy
+    for order, (abbr, full) in enumerate(SKILL_VARIATIONS.items()):
+        if full in index_by_skill:
+            keywords.append((abbr, ('variation', order, index_by_skill[full])))
+    
+    return SkillMatcher(keywords)
+
+APP_TAXONOMY_FINGERPRINT = taxonomy_fingerprint(SKILL_DATABASE, SKILL_VARIATIONS)
+
+# Compiled once per taxonomy revision and loaded from disk on later boots
+SKILL_MATCHER = load_or_build('app_skill_matcher', APP_TAXONOMY_FINGERPRINT, build_skill_matcher,
+                              code_version=MATCHER_VERSION)
+
+def extract_skills_from_text(text):
+    """Extract ALL skills from text with department categorization"""
+    direct_hits = set()
+    variation_hits = {}
+    
+    for _, _, payload in SKILL_MATCHER.iter_matches(text):
+        if payload[0] == 'skill':
+            direct_hits.add(payload[1])
+        else:
+            variation_hits.setdefault(payload[1], payload[2])
+    
+    # Direct matches keep taxonomy order, variations follow in declaration order
+    ordered = sorted(direct_hits) + [variation_hits[k] for k in sorted(variation_hits)]
+    
+    unique_skills = []
+    skills_by_department = {}
+    for idx in ordered:
+        skill_info = ALL_SKILLS_WITH_DEPT[idx]
+        display = skill_info['display']
+        if display not in unique_skills:
+            unique_skills.append(display)
+        
+        # Track by department
+        dept = skill_info['department']
+        if dept not in skills_by_department:
+            skills_by_department[dept] = []
+        if display not in skills_by_department[dept]:
+            skills_by_department[dept].append(display)
+    
+    return {
+        'all': unique_skills[:30],
+        'by_department': skills_by_department
+    }
+
+def run_extractors(resume_text):
+    """Run every app-level extractor over resume text (one extraction pool task)"""
+    # Segment once so section-specific extractors only scan their own region
+    sections = segment_resume(resume_text)
+    experience_text = sections.text_of('experience')
+    return {
+        'contact_info': extract_contact_info(resume_text),
+        'education': extract_education(sections.section_text('education')),
+        'experience': (extract_experience_summary(experience_text, in_section=True) if experience_text
+                       else extract_experience_summary(resume_text)),
+        'skills': extract_skills_from_text(resume_text)
+    }
+
+# Small resume that exercises every extractor, used to warm pool workers
+EXTRACTION_WARMUP_TEXT = "Jane Doe\njane@example.com\nExperience\n2020 - 2023 Engineer\nEducation\nB.Tech University\nSkills\nPython, SQL"
@@ -2,19 +2,36 @@
 import spacy
 from spacy.matcher import Matcher
 from spacy.tokens import Span
+import os
 import re
-import fitz  # PyMuPDF
-from typing import Dict, List, Set, Optional
-import docx
-from pathlib import Path
+import threading
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from functools import cached_property
+from resume_sections import segment_resume
+from text_extraction import (DocumentExtractionError, Source, UnsupportedDocumentError,
+                             extract_text, extract_texts)
+from taxonomy_artifacts import (artifact_path, is_current, load_or_build,
+                                save_directory, taxonomy_fingerprint)
+
+# ==================== SPACY PIPELINE ====================
+# Components excluded per profile. Only NER and the entity ruler feed the
+# parser's output, so the default profile skips tagging, parsing and
+# lemmatization entirely.
+PIPELINE_PROFILES = {
+    "full": [],
+    "trimmed": ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"],
+}
+
+NLP_MODEL = os.environ.get("RESUME_NLP_MODEL", "en_core_web_sm")
+NLP_PROFILE = os.environ.get("RESUME_NLP_PROFILE", "trimmed")
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    import os
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+# When set, entity extraction is served by nlp_service.py over this socket
+# and the model is never loaded in this process
+NLP_SERVICE_SOCKET = os.environ.get("NLP_SERVICE_SOCKET")
+NLP_SERVICE_TIMEOUT = float(os.environ.get("NLP_SERVICE_TIMEOUT", "10"))
+
+_nlp = None
+_nlp_lock = threading.Lock()
 
 
 # ==================== COMPREHENSIVE SKILL TAXONOMY ====================
@@ -129,22 +146,100 @@ class RegexPatterns:
     '''
 
 
-# ==================== ENTITY RULER SETUP ====================
-def setup_entity_ruler(nlp):
-    """Add entity ruler for better skill and entity detection"""
-    if "entity_ruler" not in nlp.pipe_names:
-        ruler = nlp.add_pipe("entity_ruler", before="ner")
-    else:
-        ruler = nlp.get_pipe("entity_ruler")
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+# Bump when build_skill_regex / build_skill_prefixes or the code using their
+# output changes; the pickled skill artifact is then rebuilt
+SKILL_REGEX_VERSION = 1
+
+
+def build_skill_regex(skills: List[str]) -> str:
+    """
+    Compile the whole skill list into one trie-ordered alternation.
     
+    Longer skills are tried before their prefixes at every position, and
+    each skill only needs a trailing boundary when it ends in a word
+    character, so "c++" and "c#" are matched like any other token.
+    """
+    trie: Dict = {}
+    for skill in skills:
+        node = trie
+        for ch in skill:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    
+    def to_regex(node: Dict, last_char: str) -> str:
+        branches = [re.escape(ch) + to_regex(child, ch)
+                    for ch, child in sorted(node.items()) if ch]
+        if '' in node:
+            branches.append(r'(?!\w)' if _is_word_char(last_char) else '')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+    
+    return r'(?<!\w)(?=(' + to_regex(trie, '') + '))'
+
+
+def build_skill_prefixes(skills: List[str]) -> Dict[str, List[str]]:
+    """Map each skill to the shorter skills that also match at its start"""
+    prefixes = {}
+    for skill in skills:
+        nested = [other for other in skills
+                  if other != skill and skill.startswith(other)
+                  and not (_is_word_char(other[-1]) and _is_word_char(skill[len(other)]))]
+        if nested:
+            prefixes[skill] = nested
+    return prefixes
+
+
+# Identifies the taxonomy every compiled artifact below was built from
+TAXONOMY_FINGERPRINT = taxonomy_fingerprint(SKILL_DATABASE, SKILL_VARIATIONS, EDUCATION_KEYWORDS)
+
+
+def _build_skill_artifact() -> Dict:
+    return {
+        "regex": build_skill_regex(ALL_SKILLS),
+        "prefixes": build_skill_prefixes(ALL_SKILLS)
+    }
+
+
+# Bump when parse_resume output changes for the same input text
+PARSER_REVISION = 5
+
+# Identifies parse_resume output for result caches
+PARSER_VERSION = f"{PARSER_REVISION}:{TAXONOMY_FINGERPRINT[:16]}:{NLP_MODEL}:{NLP_PROFILE}"
+
+_SKILL_ARTIFACT = load_or_build("resume_skill_regex", TAXONOMY_FINGERPRINT, _build_skill_artifact,
+                                code_version=SKILL_REGEX_VERSION)
+
+
+class CompiledPatterns:
+    """Module-level registry of precompiled patterns, built once at import"""
+    EMAIL = re.compile(RegexPatterns.EMAIL)
+    PHONE = re.compile(RegexPatterns.PHONE, re.VERBOSE)
+    PHONE_CLEAN = re.compile(r'[^\d+]')
+    GITHUB = re.compile(RegexPatterns.GITHUB, re.IGNORECASE)
+    LINKEDIN = re.compile(RegexPatterns.LINKEDIN, re.IGNORECASE)
+    DATE_RANGE = re.compile(RegexPatterns.DATE_RANGE, re.VERBOSE | re.IGNORECASE)
+    YEAR = re.compile(r'\d{4}')
+    DEGREES = [re.compile(pattern, re.IGNORECASE) for pattern in DEGREE_PATTERNS]
+    SKILLS = re.compile(_SKILL_ARTIFACT["regex"])
+    SKILL_PREFIXES = _SKILL_ARTIFACT["prefixes"]
+
+
+# ==================== ENTITY RULER SETUP ====================
+ENTITY_RULER_ARTIFACT = "entity_ruler"
+
+
+def build_ruler_patterns() -> List[Dict[str, str]]:
+    """One lowercase phrase pattern per term; the ruler matches on LOWER"""
     patterns = []
     
     # Add skill patterns
     for skill in ALL_SKILLS:
         patterns.append({"label": "SKILL", "pattern": skill})
-        # Add case variations
-        patterns.append({"label": "SKILL", "pattern": skill.upper()})
-        patterns.append({"label": "SKILL", "pattern": skill.title()})
     
     # Add skill variations
     for abbr, full in SKILL_VARIATIONS.items():
@@ -154,25 +249,74 @@ def setup_entity_ruler(nlp):
     for edu in EDUCATION_KEYWORDS:
         patterns.append({"label": "EDUCATION", "pattern": edu})
     
-    ruler.add_patterns(patterns)
+    return patterns
+
+
+def setup_entity_ruler(nlp):
+    """Add entity ruler for better skill and entity detection"""
+    if "entity_ruler" not in nlp.pipe_names:
+        # First in the pipeline so adding phrase patterns only runs the tokenizer
+        ruler = nlp.add_pipe("entity_ruler", first=True,
+                             config={"phrase_matcher_attr": "LOWER"})
+    else:
+        ruler = nlp.get_pipe("entity_ruler")
+    
+    if is_current(ENTITY_RULER_ARTIFACT, TAXONOMY_FINGERPRINT):
+        ruler.from_disk(artifact_path(ENTITY_RULER_ARTIFACT))
+    else:
+        ruler.add_patterns(build_ruler_patterns())
+        save_directory(ENTITY_RULER_ARTIFACT, TAXONOMY_FINGERPRINT, ruler.to_disk)
     return nlp
 
 
-# Initialize entity ruler
-nlp = setup_entity_ruler(nlp)
+def load_nlp(profile: Optional[str] = None):
+    """Load the spaCy model for a pipeline profile and attach the entity ruler"""
+    profile = profile or NLP_PROFILE
+    if profile not in PIPELINE_PROFILES:
+        raise ValueError(f"Unknown pipeline profile: {profile}")
+    exclude = PIPELINE_PROFILES[profile]
+    
+    try:
+        nlp = spacy.load(NLP_MODEL, exclude=exclude)
+    except OSError:
+        os.system(f"python -m spacy download {NLP_MODEL}")
+        nlp = spacy.load(NLP_MODEL, exclude=exclude)
+    
+    # The shared tok2vec is dead weight once nothing listens to it
+    if exclude and "tok2vec" in nlp.pipe_names:
+        if not getattr(nlp.get_pipe("tok2vec"), "listening_components", None):
+            nlp.remove_pipe("tok2vec")
+    
+    return setup_entity_ruler(nlp)
+
+
+def get_nlp():
+    """Return the shared pipeline (or the NLP service client), loading it on first use"""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                if NLP_SERVICE_SOCKET:
+                    from nlp_service import NLPServiceClient
+                    _nlp = NLPServiceClient(NLP_SERVICE_SOCKET, timeout=NLP_SERVICE_TIMEOUT)
+                else:
+                    _nlp = load_nlp()
+    return _nlp
+
+
+def __getattr__(name):
+    # Keeps `from resume_parser import nlp` working without loading at import
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ==================== TEXT EXTRACTION ====================
 def extract_text_from_pdf(pdf_path: str) -> str:
     """Extract text from PDF with better error handling"""
     try:
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        return text.strip()
-    except Exception as e:
+        return extract_text(pdf_path)
+    except DocumentExtractionError as e:
         print(f"Error extracting PDF: {e}")
         return ""
 
@@ -180,39 +324,42 @@ def extract_text_from_pdf(pdf_path: str) -> str:
 def extract_text_from_docx(docx_path: str) -> str:
     """Extract text from DOCX files"""
     try:
-        doc = docx.Document(docx_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text.strip()
-    except Exception as e:
+        return extract_text(docx_path)
+    except DocumentExtractionError as e:
         print(f"Error extracting DOCX: {e}")
         return ""
 
 
-def extract_text_from_file(file_path: str) -> str:
-    """Universal text extraction based on file type"""
-    path = Path(file_path)
+def extract_text_from_file(file_path: Source) -> str:
+    """
+    Universal text extraction; the format is detected from the file content
     
-    if path.suffix.lower() == '.pdf':
-        return extract_text_from_pdf(file_path)
-    elif path.suffix.lower() in ['.docx', '.doc']:
-        return extract_text_from_docx(file_path)
-    elif path.suffix.lower() == '.txt':
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    else:
-        raise ValueError(f"Unsupported file type: {path.suffix}")
+    Args:
+        file_path: Path to the file, or its raw bytes / binary stream
+    
+    Raises:
+        UnsupportedDocumentError: the file is not a PDF, DOCX or text file
+    """
+    try:
+        return extract_text(file_path)
+    except UnsupportedDocumentError:
+        raise
+    except DocumentExtractionError as e:
+        print(f"Error extracting text: {e}")
+        return ""
 
 
 # ==================== INFORMATION EXTRACTION ====================
-def extract_name(text: str, doc) -> Optional[str]:
+def extract_name(text: str, doc, lines: Optional[List[str]] = None) -> Optional[str]:
     """Extract candidate name using NER"""
     # First few lines usually contain name
-    first_lines = text.split('\n')[:5]
-    first_text = ' '.join(first_lines)
-    
-    doc_first = nlp(first_text)
+    first_lines = (lines if lines is not None else text.split('\n'))[:5]
+    cutoff = sum(len(line) + 1 for line in first_lines)
     
-    for ent in doc_first.ents:
+    # Reuse the entities of the full document instead of re-running the pipeline
+    for ent in (doc.ents if doc is not None else ()):
+        if ent.start_char >= cutoff:
+            break
         if ent.label_ == "PERSON":
             return ent.text.strip()
     
@@ -225,17 +372,17 @@ def extract_name(text: str, doc) -> Optional[str]:
 
 def extract_emails(text: str) -> List[str]:
     """Extract all email addresses"""
-    emails = re.findall(RegexPatterns.EMAIL, text)
+    emails = CompiledPatterns.EMAIL.findall(text)
     return list(set(emails))  # Remove duplicates
 
 
 def extract_phone_numbers(text: str) -> List[str]:
     """Extract phone numbers"""
-    phones = re.findall(RegexPatterns.PHONE, text, re.VERBOSE)
+    phones = CompiledPatterns.PHONE.findall(text)
     # Clean and deduplicate
     cleaned = []
     for phone in phones:
-        phone_clean = re.sub(r'[^\d+]', '', phone)
+        phone_clean = CompiledPatterns.PHONE_CLEAN.sub('', phone)
         if 10 <= len(phone_clean) <= 15:  # Valid phone length
             cleaned.append(phone)
     return list(set(cleaned))
@@ -244,36 +391,47 @@ def extract_phone_numbers(text: str) -> List[str]:
 def extract_links(text: str) -> Dict[str, List[str]]:
     """Extract social and professional links"""
     return {
-        "github": list(set(re.findall(RegexPatterns.GITHUB, text, re.IGNORECASE))),
-        "linkedin": list(set(re.findall(RegexPatterns.LINKEDIN, text, re.IGNORECASE)))
+        "github": list(set(CompiledPatterns.GITHUB.findall(text))),
+        "linkedin": list(set(CompiledPatterns.LINKEDIN.findall(text)))
     }
 
 
-def extract_skills_advanced(text: str, doc) -> Dict[str, List[str]]:
-    """Advanced skill extraction using NER + pattern matching"""
-    text_lower = text.lower()
-    
-    # Extract using entity ruler
-    skills_from_ner = set()
-    for ent in doc.ents:
+def match_skills(text: str) -> Set[str]:
+    """Find every taxonomy skill in a single pass of the combined pattern"""
+    found = set()
+    for match in CompiledPatterns.SKILLS.finditer(text.lower()):
+        skill = match.group(1)
+        found.add(skill)
+        found.update(CompiledPatterns.SKILL_PREFIXES.get(skill, ()))
+    return found
+
+
+def skills_from_entities(ents) -> Set[str]:
+    """Canonical skill names for SKILL entities"""
+    skills = set()
+    for ent in ents:
         if ent.label_ == "SKILL":
             skill = ent.text.lower()
             # Map variations to full names
             skill = SKILL_VARIATIONS.get(skill, skill)
-            skills_from_ner.add(skill)
+            skills.add(skill)
+    return skills
+
+
+def extract_skills_advanced(text: str, doc) -> Dict[str, List[str]]:
+    """Advanced skill extraction using NER + pattern matching (doc may be None)"""
+    # Extract using entity ruler
+    skills_from_ner = skills_from_entities(doc.ents) if doc is not None else set()
     
     # Extract using direct matching
-    skills_from_matching = set()
-    for skill in ALL_SKILLS:
-        # Use word boundaries for better matching
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            skills_from_matching.add(skill)
+    skills_from_matching = match_skills(text)
     
     # Combine both methods
-    all_found_skills = skills_from_ner | skills_from_matching
-    
-    # Categorize skills
+    return categorize_skills(skills_from_ner | skills_from_matching)
+
+
+def categorize_skills(all_found_skills: Set[str]) -> Dict[str, List[str]]:
+    """Shape a set of canonical skills like extract_skills_advanced output"""
     categorized = {category: [] for category in SKILL_DATABASE.keys()}
     for skill in all_found_skills:
         for category, skills_list in SKILL_DATABASE.items():
@@ -287,6 +445,101 @@ def extract_skills_advanced(text: str, doc) -> Dict[str, List[str]]:
     }
 
 
+# ==================== CHUNKED NLP ====================
+# Long documents (job descriptions pasted from portals, multi-page postings)
+# are run through nlp.pipe in paragraph-aligned chunks instead of one Doc, so
+# memory is bounded by the chunk size and processing can stop early.
+CHUNK_CHARS = int(os.environ.get("NLP_CHUNK_CHARS", "5000"))
+CHUNK_CHAR_BUDGET = int(os.environ.get("NLP_CHAR_BUDGET", "200000"))
+# Stop after this many consecutive chunks without a new skill
+CHUNK_SATURATION = int(os.environ.get("NLP_SKILL_SATURATION_CHUNKS", "8"))
+
+# Identifies chunked-analysis settings for result caches
+CHUNKING_VERSION = f"{CHUNK_CHARS}:{CHUNK_CHAR_BUDGET}:{CHUNK_SATURATION}"
+
+
+class ChunkEntity(NamedTuple):
+    text: str
+    label_: str
+    start_char: int
+    end_char: int
+
+
+def iter_text_chunks(text: str, max_chars: int = CHUNK_CHARS) -> Iterator[Tuple[int, str]]:
+    """
+    Split text into (offset, chunk) pieces of at most max_chars characters
+
+    Cuts prefer a blank line (paragraph or section boundary), then a line
+    break, then whitespace, searching only the back half of each window so
+    chunks never get tiny.
+    """
+    start, length = 0, len(text)
+    while start < length:
+        end = start + max_chars
+        if end >= length:
+            yield start, text[start:]
+            return
+        floor = start + max_chars // 2
+        cut = text.rfind("\n\n", floor, end)
+        if cut < 0:
+            cut = text.rfind("\n", floor, end)
+        if cut < 0:
+            cut = text.rfind(" ", floor, end)
+        cut = end if cut < 0 else cut + 1
+        yield start, text[start:cut]
+        start = cut
+
+
+def analyze_text_chunked(text: str, char_budget: int = CHUNK_CHAR_BUDGET,
+                         saturation: int = CHUNK_SATURATION,
+                         chunk_chars: int = CHUNK_CHARS,
+                         batch_size: int = 8) -> Dict:
+    """
+    Skill and entity extraction over arbitrarily long text in bounded memory
+    
+    Args:
+        text: Document text
+        char_budget: Stop once this many characters have been processed
+        saturation: Stop after this many consecutive chunks add no new skill
+            (0 disables)
+        chunk_chars: Maximum characters per spaCy Doc
+        batch_size: Chunks per nlp.pipe batch
+    
+    Returns:
+        Skills shaped like extract_skills_advanced, entities with offsets
+        into the original text, and how much of the text was processed
+    """
+    def budgeted_chunks():
+        for offset, chunk in iter_text_chunks(text[:char_budget], chunk_chars):
+            yield chunk, offset
+
+    found: Set[str] = set()
+    entities: List[ChunkEntity] = []
+    processed = 0
+    stale_chunks = 0
+    stopped = "end" if len(text) <= char_budget else "budget"
+
+    # Docs are consumed one at a time and dropped; only entities are kept
+    for doc, offset in get_nlp().pipe(budgeted_chunks(), as_tuples=True, batch_size=batch_size):
+        entities.extend(
+            ChunkEntity(ent.text, ent.label_, offset + ent.start_char, offset + ent.end_char)
+            for ent in doc.ents
+        )
+        new_skills = (skills_from_entities(doc.ents) | match_skills(doc.text)) - found
+        found |= new_skills
+        processed = offset + len(doc.text)
+        stale_chunks = 0 if new_skills else stale_chunks + 1
+        if saturation and found and stale_chunks >= saturation and processed < len(text):
+            stopped = "saturated"
+            break
+
+    result = categorize_skills(found)
+    result["entities"] = entities
+    result["chars_processed"] = processed
+    result["stopped"] = stopped
+    return result
+
+
 # ==================== BACKWARD COMPATIBILITY ====================
 def extract_skills_from_text(text: str) -> List[str]:
     """
@@ -302,7 +555,7 @@ def extract_skills_from_text(text: str) -> List[str]:
         return []
     
     try:
-        doc = nlp(text)
+        doc = get_nlp()(text)
         result = extract_skills_advanced(text, doc)
         return result["all_skills"]
     except Exception as e:
@@ -310,17 +563,18 @@ def extract_skills_from_text(text: str) -> List[str]:
         return []
 
 
-def extract_education(text: str) -> List[str]:
+def extract_education(text: str, lines: Optional[List[str]] = None) -> List[str]:
     """Extract education information"""
     education = []
-    lines = text.split('\n')
+    if lines is None:
+        lines = text.split('\n')
     
     for i, line in enumerate(lines):
         line_lower = line.lower()
         
         # Check for degree patterns
-        for pattern in DEGREE_PATTERNS:
-            matches = re.findall(pattern, line, re.IGNORECASE)
+        for pattern in CompiledPatterns.DEGREES:
+            matches = pattern.findall(line)
             if matches:
                 # Get context (current and next lines)
                 context = line
@@ -334,7 +588,7 @@ def extract_education(text: str) -> List[str]:
 def extract_experience(text: str) -> List[Dict[str, str]]:
     """Extract work experience with date ranges"""
     experiences = []
-    date_ranges = re.findall(RegexPatterns.DATE_RANGE, text, re.VERBOSE | re.IGNORECASE)
+    date_ranges = CompiledPatterns.DATE_RANGE.findall(text)
     
     for date_range in date_ranges:
         experiences.append({
@@ -348,7 +602,7 @@ def extract_experience(text: str) -> List[Dict[str, str]]:
 def calculate_years(date_range: str) -> float:
     """Calculate years from date range"""
     try:
-        years = re.findall(r'\d{4}', date_range)
+        years = CompiledPatterns.YEAR.findall(date_range)
         if len(years) >= 2:
             start_year = int(years[0])
             end_year = int(years[1]) if years[1].isdigit() else 2025
@@ -361,22 +615,165 @@ def calculate_years(date_range: str) -> float:
 def extract_organizations(doc) -> List[str]:
     """Extract company/organization names"""
     orgs = []
-    for ent in doc.ents:
+    for ent in (doc.ents if doc is not None else ()):
         if ent.label_ == "ORG":
             orgs.append(ent.text)
     return list(set(orgs))
 
 
+# ==================== PARSING TIERS ====================
+# "lite" uses only the compiled matchers (contacts, skills, education, date
+# ranges); "full" adds spaCy NER for names, organizations and skill aliases.
+TIER_LITE = "lite"
+TIER_FULL = "full"
+PARSE_TIERS = (TIER_LITE, TIER_FULL)
+
+# Documents at least this long are parsed lite unless full is requested
+LITE_TIER_MIN_CHARS = int(os.environ.get("LITE_TIER_MIN_CHARS", "30000"))
+# Fall back to lite while this many full parses are already running
+LITE_TIER_QUEUE_DEPTH = int(os.environ.get("LITE_TIER_QUEUE_DEPTH", "4"))
+
+_full_parses = 0
+_full_parses_lock = threading.Lock()
+
+
+def full_parses_in_flight() -> int:
+    return _full_parses
+
+
+def choose_tier(text_length: int, requested: Optional[str] = None,
+                queue_depth: Optional[int] = None) -> str:
+    """
+    Pick the parsing tier for one document
+    
+    An explicit, valid request wins. Otherwise large documents and a busy
+    process get the lite tier, and everything else gets full NER.
+    """
+    if requested in PARSE_TIERS:
+        return requested
+    if queue_depth is None:
+        queue_depth = full_parses_in_flight()
+    if text_length >= LITE_TIER_MIN_CHARS or queue_depth >= LITE_TIER_QUEUE_DEPTH:
+        return TIER_LITE
+    return TIER_FULL
+
+
 # ==================== MAIN PARSING FUNCTION ====================
-def parse_resume(file_path: str) -> Dict:
+# Sections whose entities are used: names, organizations and skill aliases
+NER_SECTIONS = ('header', 'contact', 'summary', 'experience', 'skills', 'projects')
+
+
+class ResumeContext:
+    """
+    Per-document cache of parsing artifacts.
+    
+    Every artifact is computed on first access and reused afterwards, so the
+    summary fields are derived from the same results as the detailed ones.
+    """
+    
+    def __init__(self, text: str, doc=None, tier: str = TIER_FULL):
+        self.text = text
+        self.tier = tier
+        self._doc = doc
+    
+    @cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+    
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.text.split('\n')
+    
+    @cached_property
+    def sections(self):
+        return segment_resume(self.text)
+    
+    @cached_property
+    def ner_text(self) -> str:
+        """Only the sections that need NER go through the spaCy pipeline"""
+        if not self.sections.has_headings:
+            return self.text
+        return self.sections.text_of(*NER_SECTIONS) or self.text
+    
+    @cached_property
+    def doc(self):
+        """spaCy Doc over ner_text; None for the lite tier"""
+        if self.tier == TIER_LITE:
+            return None
+        return self._doc if self._doc is not None else get_nlp()(self.ner_text)
+    
+    @cached_property
+    def name(self) -> Optional[str]:
+        return extract_name(self.ner_text, self.doc)
+    
+    @cached_property
+    def emails(self) -> List[str]:
+        return extract_emails(self.text)
+    
+    @cached_property
+    def phones(self) -> List[str]:
+        return extract_phone_numbers(self.text)
+    
+    @cached_property
+    def links(self) -> Dict[str, List[str]]:
+        return extract_links(self.text)
+    
+    @cached_property
+    def skills(self) -> Dict[str, List[str]]:
+        return extract_skills_advanced(self.text_lower, self.doc)
+    
+    @cached_property
+    def education(self) -> List[str]:
+        education_text = self.sections.text_of('education')
+        if not education_text:
+            return extract_education(self.text, self.lines)
+        return extract_education(education_text)
+    
+    @cached_property
+    def experience(self) -> List[Dict[str, str]]:
+        return extract_experience(self.sections.section_text('experience'))
+    
+    @cached_property
+    def organizations(self) -> List[str]:
+        return extract_organizations(self.doc)
+    
+    def to_dict(self) -> Dict:
+        """Assemble the parse_resume result from the cached artifacts"""
+        return {
+            "tier": self.tier,
+            "name": self.name,
+            "contact": {
+                "emails": self.emails,
+                "phones": self.phones,
+                "links": self.links
+            },
+            "skills": self.skills,
+            "education": self.education,
+            "experience": {
+                "positions": self.experience,
+                "total_years": sum(exp["years"] for exp in self.experience),
+                "organizations": self.organizations
+            },
+            "summary": {
+                "total_skills": len(self.skills["all_skills"]),
+                "has_email": bool(self.emails),
+                "has_phone": bool(self.phones),
+                "education_count": len(self.education),
+                "experience_count": len(self.experience)
+            }
+        }
+
+
+def parse_resume(file_path: Source, tier: Optional[str] = None) -> Dict:
     """
     Comprehensive resume parser
     
     Args:
-        file_path: Path to resume file (PDF, DOCX, or TXT)
+        file_path: Path to resume file (PDF, DOCX, or TXT), or its raw bytes
+        tier: "lite" or "full"; None lets choose_tier decide
     
     Returns:
-        Dictionary containing all extracted information
+        Dictionary containing all extracted information, tagged with the tier
     """
     # Extract text
     text = extract_text_from_file(file_path)
@@ -384,34 +781,59 @@ def parse_resume(file_path: str) -> Dict:
     if not text:
         return {"error": "Could not extract text from file"}
     
-    # Process with spaCy
-    doc = nlp(text)
-    
-    # Extract all information
-    parsed_data = {
-        "name": extract_name(text, doc),
-        "contact": {
-            "emails": extract_emails(text),
-            "phones": extract_phone_numbers(text),
-            "links": extract_links(text)
-        },
-        "skills": extract_skills_advanced(text, doc),
-        "education": extract_education(text),
-        "experience": {
-            "positions": extract_experience(text),
-            "total_years": sum(exp["years"] for exp in extract_experience(text)),
-            "organizations": extract_organizations(doc)
-        },
-        "summary": {
-            "total_skills": len(extract_skills_advanced(text, doc)["all_skills"]),
-            "has_email": bool(extract_emails(text)),
-            "has_phone": bool(extract_phone_numbers(text)),
-            "education_count": len(extract_education(text)),
-            "experience_count": len(extract_experience(text))
-        }
-    }
+    tier = choose_tier(len(text), tier)
+    if tier == TIER_LITE:
+        return ResumeContext(text, tier=tier).to_dict()
+    
+    global _full_parses
+    with _full_parses_lock:
+        _full_parses += 1
+    try:
+        return ResumeContext(text, tier=tier).to_dict()
+    finally:
+        with _full_parses_lock:
+            _full_parses -= 1
+
+
+def parse_resumes(paths: Iterable[str], n_process: int = 1, batch_size: int = 16,
+                  tier: Optional[str] = None) -> List[Dict]:
+    """
+    Parse many resumes, batching the spaCy pass through nlp.pipe
     
-    return parsed_data
+    Args:
+        paths: Resume files (PDF, DOCX, or TXT)
+        n_process: Worker processes used by nlp.pipe
+        batch_size: Documents per nlp.pipe batch
+        tier: "lite" or "full" for every document; None decides by size
+    
+    Returns:
+        One result per path, in input order, shaped like parse_resume
+    """
+    paths = list(paths)
+    results: List[Dict] = [{"error": "Could not extract text from file"} for _ in paths]
+    
+    # Documents are extracted concurrently in the text_extraction process pool
+    contexts = []
+    for index, text in enumerate(extract_texts(paths)):
+        if isinstance(text, UnsupportedDocumentError):
+            results[index] = {"error": str(text)}
+        elif isinstance(text, DocumentExtractionError):
+            print(f"Error extracting text: {text}")
+        elif text:
+            # A batch job is its own queue, so only size and the request count
+            context = ResumeContext(text, tier=choose_tier(len(text), tier, queue_depth=0))
+            if context.tier == TIER_LITE:
+                results[index] = context.to_dict()
+            else:
+                contexts.append((index, context))
+    
+    docs = get_nlp().pipe((context.ner_text for _, context in contexts),
+                          n_process=n_process, batch_size=batch_size)
+    for (index, context), doc in zip(contexts, docs):
+        context.doc = doc
+        results[index] = context.to_dict()
+    
+    return results
 
 
 # ==================== UTILITY FUNCTIONS ====================
@@ -0,0 +1,138 @@
+# === resume_sections.py ===
+"""
+Single-pass resume section segmenter.
+
+Walks the text line by line once, recognises section headings, and labels
+every line as header, contact, summary, experience, education, skills,
+projects or other. Extractors can then scan only the section they care
+about instead of re-splitting and re-scanning the whole document.
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    'contact': [
+        'contact', 'contact information', 'contact info', 'contact details',
+        'personal details', 'personal information', 'personal info'
+    ],
+    'summary': [
+        'summary', 'professional summary', 'career summary', 'profile',
+        'professional profile', 'objective', 'career objective', 'about',
+        'about me', 'overview'
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience',
+        'relevant experience', 'employment', 'employment history',
+        'work history', 'career history', 'professional background',
+        'internship', 'internships', 'internship experience'
+    ],
+    'education': [
+        'education', 'academic background', 'academics', 'academic details',
+        'educational background', 'educational qualification',
+        'educational qualifications', 'academic qualifications', 'qualifications',
+        'education and training'
+    ],
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'skill set',
+        'skillset', 'core competencies', 'competencies', 'technologies',
+        'tech stack', 'tools', 'tools and technologies', 'expertise',
+        'areas of expertise'
+    ],
+    'projects': [
+        'projects', 'project', 'personal projects', 'academic projects',
+        'key projects', 'selected projects', 'portfolio'
+    ],
+    'other': [
+        'certifications', 'certificates', 'certification', 'courses',
+        'achievements', 'awards', 'honors', 'languages', 'interests',
+        'hobbies', 'publications', 'references', 'activities', 'volunteering',
+        'volunteer experience', 'extracurricular activities', 'declaration',
+        'training', 'accomplishments'
+    ]
+}
+
+SECTION_LABELS = ('header', 'contact', 'summary', 'experience', 'education',
+                  'skills', 'projects', 'other')
+
+_HEADING_LOOKUP = {
+    heading: label
+    for label, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+_MAX_HEADING_WORDS = 4
+_NON_ALNUM_EDGES = re.compile(r'^[^\w]+|[^\w]+$')
+_WHITESPACE = re.compile(r'\s+')
+_CONTACT_CUE = re.compile(
+    r'@|https?://|www\.|linkedin|github|\+?\d[\d\s().-]{7,}\d',
+    re.IGNORECASE
+)
+
+
+class Section(NamedTuple):
+    label: str
+    start: int
+    end: int
+    heading: Optional[str]
+
+
+def _heading_label(line: str) -> Optional[str]:
+    """Return the section label if the line is a section heading"""
+    # "Skills:" is a heading; "Tools: Git, JIRA" is content inside a section
+    if ':' in line and line.split(':', 1)[1].strip():
+        return None
+    candidate = _NON_ALNUM_EDGES.sub('', line.replace('&', ' and ')).lower()
+    candidate = _WHITESPACE.sub(' ', candidate)
+    if not candidate or len(candidate.split(' ')) > _MAX_HEADING_WORDS:
+        return None
+    return _HEADING_LOOKUP.get(candidate)
+
+
+class ResumeSections:
+    """Labelled, contiguous spans over the original resume text"""
+
+    def __init__(self, text: str, spans: List[Section]):
+        self.text = text
+        self.spans = spans
+        self.has_headings = any(span.heading for span in spans)
+
+    def text_of(self, *labels: str) -> str:
+        """Concatenate every span carrying one of the labels, in document order"""
+        return ''.join(self.text[span.start:span.end]
+                       for span in self.spans if span.label in labels)
+
+    def section_text(self, *labels: str) -> str:
+        """Text of the given sections, or the full text when none were found"""
+        return self.text_of(*labels) or self.text
+
+    def labels(self) -> List[str]:
+        return [span.label for span in self.spans]
+
+
+def segment_resume(text: str) -> ResumeSections:
+    """Label every line of the resume in one linear pass"""
+    spans: List[Section] = []
+    current = None
+    position = 0
+
+    for line in text.splitlines(keepends=True):
+        start, position = position, position + len(line)
+        stripped = line.strip()
+
+        heading_label = _heading_label(stripped) if stripped else None
+        if heading_label:
+            current = heading_label
+            label, heading = heading_label, stripped
+        elif current is None:
+            # Everything above the first heading: name, title and contact lines
+            label = 'contact' if _CONTACT_CUE.search(stripped) else 'header'
+            heading = None
+        else:
+            label, heading = current, None
+
+        if spans and spans[-1].label == label and not heading:
+            spans[-1] = spans[-1]._replace(end=position)
+        else:
+            spans.append(Section(label, start, position, heading))
+
+    return ResumeSections(text, spans)
@@ -0,0 +1,103 @@
+# === skill_matcher.py ===
+"""
+Aho-Corasick multi-pattern matcher for skill taxonomies.
+
+The automaton is compiled once from (keyword, payload) pairs and then finds
+every keyword occurrence in a single left-to-right pass over the text.
+Matches are only reported on token boundaries, so short aliases such as
+"ai" or "cv" never fire inside longer words.
+"""
+from collections import deque
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+# Bump when the automaton layout or matching code changes; pickled matchers
+# built by an older version are rebuilt instead of loaded
+MATCHER_VERSION = 1
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """Compiled keyword automaton with token-boundary aware matching."""
+
+    def __init__(self, keywords: Iterable[Tuple[str, Hashable]]):
+        # goto[state] maps a character to the next state. After compilation
+        # every state carries the full transition table for the alphabet, so
+        # the scan never has to follow failure links at runtime.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[Tuple[int, Hashable]]] = [[]]
+        self.size = 0
+
+        for keyword, payload in keywords:
+            keyword = keyword.lower().strip()
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._output.append([])
+                state = nxt
+            self._output[state].append((len(keyword), payload))
+            self.size += 1
+
+        self._compile()
+
+    def _compile(self):
+        """Compute failure links and fold them into a deterministic automaton"""
+        goto, output = self._goto, self._output
+        fail = [0] * len(goto)
+        order = []
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                output[nxt] = output[nxt] + output[fail[nxt]]
+
+        # Breadth-first order guarantees a state's failure target is complete
+        # before the state itself inherits its missing transitions.
+        for state in order:
+            for ch, nxt in goto[fail[state]].items():
+                goto[state].setdefault(ch, nxt)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Hashable]]:
+        """Yield (start, end, payload) for every boundary-aligned keyword hit"""
+        text_lower = text.lower()
+        goto, output = self._goto, self._output
+        length = len(text_lower)
+        state = 0
+
+        for end, ch in enumerate(text_lower, 1):
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            # A keyword ending in a word character must not run into the next word
+            if end < length and _is_word_char(ch) and _is_word_char(text_lower[end]):
+                continue
+            for key_len, payload in output[state]:
+                start = end - key_len
+                if start > 0 and _is_word_char(text_lower[start]) and _is_word_char(text_lower[start - 1]):
+                    continue
+                yield start, end, payload
+
+    def find_payloads(self, text: str) -> List[Hashable]:
+        """Return distinct payloads in order of first occurrence"""
+        seen = set()
+        found = []
+        for _, _, payload in self.iter_matches(text):
+            if payload not in seen:
+                seen.add(payload)
+                found.append(payload)
+        return found
@@ -0,0 +1,120 @@
+# === taxonomy_artifacts.py ===
+"""
+On-disk cache for compiled skill taxonomy artifacts.
+
+Each artifact is stored next to a fingerprint of the data it was built
+from. Loading an artifact whose fingerprint still matches skips the build
+entirely; a changed taxonomy (or ARTIFACT_VERSION bump) triggers a rebuild
+that replaces the stale copy atomically, so concurrent workers never see a
+half-written file.
+
+Run this module directly to rebuild every artifact ahead of deployment:
+    python taxonomy_artifacts.py
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of any artifact changes
+ARTIFACT_VERSION = 1
+
+ARTIFACT_DIR = os.environ.get(
+    "TAXONOMY_ARTIFACT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+)
+
+FINGERPRINT_FILE = "fingerprint.txt"
+
+
+def taxonomy_fingerprint(*parts: Any) -> str:
+    """Stable SHA-256 over JSON-serialisable taxonomy data"""
+    payload = json.dumps([ARTIFACT_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def artifact_path(name: str) -> str:
+    return os.path.join(ARTIFACT_DIR, name)
+
+
+def _read_fingerprint(directory: str) -> str:
+    try:
+        with open(os.path.join(directory, FINGERPRINT_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def is_current(name: str, fingerprint: str) -> bool:
+    """True when a directory artifact exists and was built from this fingerprint"""
+    return _read_fingerprint(artifact_path(name)) == fingerprint
+
+
+def save_directory(name: str, fingerprint: str, write: Callable[[str], None]):
+    """Write a directory artifact via write(path) and publish it atomically"""
+    os.makedirs(ARTIFACT_DIR, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{name}-", dir=ARTIFACT_DIR)
+    try:
+        write(staging)
+        with open(os.path.join(staging, FINGERPRINT_FILE), "w", encoding="utf-8") as f:
+            f.write(fingerprint)
+        target = artifact_path(name)
+        if os.path.isdir(target):
+            shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+    except OSError as e:
+        # Another worker may have published the same artifact first
+        logger.warning(f"Could not save artifact {name}: {e}")
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def load_or_build(name: str, fingerprint: str, build: Callable[[], Any], *, code_version: int) -> Any:
+    """
+    Return the pickled artifact for this fingerprint, building it if needed
+
+    code_version belongs to the code that builds and uses the artifact; bump
+    it when that code changes, so a pickle of the old object is not reused.
+    """
+    path = artifact_path(name + ".pkl")
+    fingerprint = taxonomy_fingerprint(fingerprint, name, code_version)
+    try:
+        with open(path, "rb") as f:
+            stored = pickle.load(f)
+        if stored.get("fingerprint") == fingerprint:
+            return stored["payload"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Unreadable, or pickled from a class that has since moved or changed
+        logger.warning(f"Discarding artifact {name}: {type(e).__name__}: {e}")
+
+    payload = build()
+    try:
+        os.makedirs(ARTIFACT_DIR, exist_ok=True)
+        fd, staging = tempfile.mkstemp(prefix=f".{name}-", dir=ARTIFACT_DIR)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump({"fingerprint": fingerprint, "payload": payload}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, path)
+    except OSError as e:
+        logger.warning(f"Could not save artifact {name}: {e}")
+    return payload
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    shutil.rmtree(ARTIFACT_DIR, ignore_errors=True)
+
+    import resume_parser
+    resume_parser.get_nlp()
+    import resume_analysis  # noqa: F401  builds the Aho-Corasick skill matcher
+
+    for entry in sorted(os.listdir(ARTIFACT_DIR)):
+        print(f"built {os.path.join(ARTIFACT_DIR, entry)}")
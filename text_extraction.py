@@ -0,0 +1,476 @@
+# === text_extraction.py ===
+"""
+Unified document text extraction.
+
+The format is detected from magic bytes rather than the file extension, and
+anything that is not a PDF, DOCX or plain text fails fast instead of being
+decoded as garbage. Pages are streamed through a generator and collected
+under page and character budgets, then joined once. Sources may be a
+filesystem path, raw bytes or a binary file-like object.
+
+PDF backends are tried in PDF_BACKENDS order; PyMuPDF comes first because
+it was ~7x faster than PyPDF2 on the PDFs in uploads/
+(see benchmarks/bench_pdf_backends.py). DOCX files are stream-parsed with
+lxml rather than loaded through python-docx, which also picks up table
+cells and text boxes (see benchmarks/bench_docx_extraction.py).
+
+PDFs with at least PARALLEL_PAGE_THRESHOLD pages (after max_pages) are split
+into page ranges that PyMuPDF reads in a shared process pool; below that the
+pool round trip costs more than it saves and the serial path is kept
+(see benchmarks/bench_parallel_pdf.py for the crossover).
+"""
+import codecs
+import io
+import logging
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+Source = Union[str, Path, bytes, bytearray, BinaryIO]
+
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_CHARS = 500000
+
+PDF_BACKENDS = ('pymupdf', 'pypdf2')
+
+PARALLEL_PAGE_THRESHOLD = int(os.environ.get('EXTRACT_PARALLEL_PAGES', '32'))
+PARALLEL_WORKERS = int(os.environ.get('EXTRACT_WORKERS', str(min(os.cpu_count() or 1, 4))))
+
+_SNIFF_BYTES = 4096
+_PDF_MAGIC = b'%PDF-'
+_ZIP_MAGIC = b'PK\x03\x04'
+_OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+_DOCX_MAIN_PART = 'word/document.xml'
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_PARAGRAPH = _W + 'p'
+_W_ROW = _W + 'tr'
+_W_CELL = _W + 'tc'
+_W_TEXT = _W + 't'
+_W_TAB = _W + 'tab'
+_W_BREAK = _W + 'br'
+_W_CARRIAGE_RETURN = _W + 'cr'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_DOCX_STREAM_TAGS = (_W_PARAGRAPH, _W_ROW, _W_CELL, _MC_FALLBACK)
+_TEXT_ENCODINGS = ('utf-8', 'cp1252')
+_ALLOWED_CONTROL = set('\t\n\r\f\v')
+_MAX_CONTROL_RATIO = 0.02
+
+
+class DocumentExtractionError(ValueError):
+    """Raised when text cannot be extracted from a document"""
+
+
+class UnsupportedDocumentError(DocumentExtractionError):
+    """Raised when the data is not a supported document format"""
+
+
+def _read_bytes(source: Source) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            return f.read()
+    position = source.tell()
+    data = source.read()
+    source.seek(position)
+    return data
+
+
+def _head(source: Source) -> bytes:
+    """First bytes of the source, without consuming a file-like object"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source[:_SNIFF_BYTES])
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            return f.read(_SNIFF_BYTES)
+    position = source.tell()
+    head = source.read(_SNIFF_BYTES)
+    source.seek(position)
+    return head
+
+
+def _text_encoding(head: bytes) -> Optional[str]:
+    """Encoding that decodes the sample as mostly printable text, if any"""
+    if not head:
+        return 'utf-8'
+    for encoding in _TEXT_ENCODINGS:
+        try:
+            # Incremental decoding tolerates a multi-byte character cut at the end
+            sample = codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+        except UnicodeDecodeError:
+            continue
+        control = sum(1 for ch in sample if ch < ' ' and ch not in _ALLOWED_CONTROL)
+        if control <= len(sample) * _MAX_CONTROL_RATIO:
+            return encoding
+    return None
+
+
+def sniff_format(source: Source) -> str:
+    """Detect 'pdf', 'docx' or 'txt' from the content; raise if unsupported"""
+    head = _head(source)
+
+    # The PDF header may be preceded by junk within the first kilobyte
+    if _PDF_MAGIC in head[:1024]:
+        return 'pdf'
+    if head.startswith(_ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(_as_file(source)) as archive:
+                if _DOCX_MAIN_PART in archive.namelist():
+                    return 'docx'
+        except zipfile.BadZipFile:
+            pass
+        raise UnsupportedDocumentError("Unsupported archive: not a DOCX document")
+    if head.startswith(_OLE_MAGIC):
+        raise UnsupportedDocumentError("Legacy .doc files are not supported; save as DOCX or PDF")
+    if _text_encoding(head):
+        return 'txt'
+    raise UnsupportedDocumentError("Unsupported file type: binary data")
+
+
+def _as_file(source: Source):
+    """Path or seekable binary stream suitable for zipfile / python-docx"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    if isinstance(source, Path):
+        return str(source)
+    return source
+
+
+# ==================== PARALLEL PDF EXTRACTION ====================
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=PARALLEL_WORKERS)
+    return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _picklable_source(source: Source) -> Union[str, bytes]:
+    """Picklable form of the source: a path string or the raw bytes"""
+    if isinstance(source, (str, Path)):
+        return str(source)
+    return _read_bytes(source)
+
+
+def _pdf_page_count(source: Union[str, bytes]) -> int:
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(source) if isinstance(source, str) else fitz.open(stream=source, filetype='pdf')
+    try:
+        return doc.page_count
+    finally:
+        doc.close()
+
+
+def _read_page_range(source: Union[str, bytes], start: int, stop: int) -> List[str]:
+    """Worker: open the document with PyMuPDF and read pages [start, stop)"""
+    import fitz  # PyMuPDF
+
+    doc = fitz.open(source) if isinstance(source, str) else fitz.open(stream=source, filetype='pdf')
+    try:
+        return [doc.load_page(page_number).get_text() for page_number in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def _page_ranges(page_count: int, parts: int) -> List[range]:
+    """Split [0, page_count) into at most `parts` contiguous, near-equal ranges"""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges, start = [], 0
+    for index in range(parts):
+        stop = start + size + (1 if index < extra else 0)
+        ranges.append(range(start, stop))
+        start = stop
+    return ranges
+
+
+def _iter_pdf_parallel(source: Union[str, bytes], page_count: int) -> Iterator[str]:
+    """Read page ranges concurrently, yielding pages in document order"""
+    pool = _get_pool()
+    futures = [pool.submit(_read_page_range, source, pages.start, pages.stop)
+               for pages in _page_ranges(page_count, PARALLEL_WORKERS)]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        # The consumer may stop early once its character budget is spent
+        for future in futures:
+            future.cancel()
+
+
+def _parallel_page_count(source: Source, max_pages: int, parallel: Optional[bool]) -> int:
+    """Pages to read in parallel, or 0 when the serial path should be used"""
+    if parallel is False or (parallel is None and PARALLEL_WORKERS < 2):
+        return 0
+    # The page count can never reach the threshold, so skip opening the PDF to count
+    if parallel is None and max_pages < PARALLEL_PAGE_THRESHOLD:
+        return 0
+    try:
+        page_count = min(_pdf_page_count(_picklable_source(source)), max_pages)
+    except Exception:
+        # Let the serial backends report (or recover from) the problem
+        return 0
+    if parallel or page_count >= PARALLEL_PAGE_THRESHOLD:
+        return page_count
+    return 0
+
+
+# ==================== PAGE GENERATORS ====================
+def _iter_pdf_pymupdf(source: Source, max_pages: int) -> Iterator[str]:
+    import fitz  # PyMuPDF
+
+    if isinstance(source, (str, Path)):
+        doc = fitz.open(str(source))
+    else:
+        doc = fitz.open(stream=_read_bytes(source), filetype='pdf')
+    try:
+        for page_number in range(min(doc.page_count, max_pages)):
+            yield doc.load_page(page_number).get_text()
+    finally:
+        doc.close()
+
+
+def _iter_pdf_pypdf2(source: Source, max_pages: int) -> Iterator[str]:
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(_as_file(source))
+    for page in reader.pages[:max_pages]:
+        yield (page.extract_text() or '') + '\n'
+
+
+_PDF_PAGE_ITERATORS = {
+    'pymupdf': _iter_pdf_pymupdf,
+    'pypdf2': _iter_pdf_pypdf2
+}
+
+
+def _iter_pdf(source: Source, max_pages: int, parallel: Optional[bool] = None) -> Iterator[str]:
+    page_count = _parallel_page_count(source, max_pages, parallel)
+    if page_count:
+        pages = _iter_pdf_parallel(_picklable_source(source), page_count)
+        try:
+            first = next(pages, None)
+        except BrokenProcessPool as e:
+            logger.warning(f"PDF worker pool failed, reading serially: {e}")
+            _reset_pool()
+        else:
+            if first is None:
+                return
+            yield first
+            yield from pages
+            return
+
+    errors = []
+    for backend in PDF_BACKENDS:
+        pages = _PDF_PAGE_ITERATORS[backend](source, max_pages)
+        try:
+            first = next(pages, None)
+        except ImportError as e:
+            errors.append(f"{backend}: {e}")
+            continue
+        except Exception as e:
+            errors.append(f"{backend}: {e}")
+            logger.warning(f"PDF backend {backend} failed: {e}")
+            continue
+        if first is None:
+            return
+        yield first
+        yield from pages
+        return
+    raise DocumentExtractionError("Could not read PDF (" + "; ".join(errors) + ")")
+
+
+def _paragraph_text(paragraph) -> str:
+    parts = []
+    for node in paragraph.iter(_W_TEXT, _W_TAB, _W_BREAK, _W_CARRIAGE_RETURN):
+        if node.tag == _W_TEXT:
+            parts.append(node.text or '')
+        elif node.tag == _W_TAB:
+            parts.append('\t')
+        else:
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def _release(element):
+    """Drop a handled element and the already-handled siblings before it"""
+    element.clear(keep_tail=False)
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _iter_docx(source: Source, max_pages: int, parallel: Optional[bool] = None) -> Iterator[str]:
+    """
+    Stream paragraphs and table rows from word/document.xml in document order
+
+    Table rows are emitted as their cell texts joined by tabs. Handled
+    elements are cleared as the parse goes, so memory stays flat however
+    long the document is. Text boxes appear twice in the XML (mc:Choice and
+    the legacy mc:Fallback copy); only the first copy is read.
+    """
+    from lxml import etree
+
+    cells: List[List[str]] = []
+    rows: List[List[str]] = []
+    fallback_depth = 0
+
+    with zipfile.ZipFile(_as_file(source)) as archive, archive.open(_DOCX_MAIN_PART) as part:
+        events = etree.iterparse(part, events=('start', 'end'), tag=_DOCX_STREAM_TAGS,
+                                 resolve_entities=False, no_network=True, huge_tree=True)
+        for event, element in events:
+            tag = element.tag
+            if tag == _MC_FALLBACK:
+                if event == 'start':
+                    fallback_depth += 1
+                else:
+                    fallback_depth -= 1
+                    # Drop the legacy copy, or the anchor paragraph reads its text again
+                    element.clear(keep_tail=False)
+                continue
+            if fallback_depth:
+                continue
+            if event == 'start':
+                if tag == _W_CELL:
+                    cells.append([])
+                elif tag == _W_ROW:
+                    rows.append([])
+                continue
+
+            if tag == _W_PARAGRAPH:
+                text = _paragraph_text(element)
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    yield text + '\n'
+                    _release(element)
+                    continue
+            elif tag == _W_CELL:
+                cell = ' '.join(t.strip() for t in cells.pop() if t.strip())
+                if rows:
+                    rows[-1].append(cell)
+            elif tag == _W_ROW:
+                row = '\t'.join(cell for cell in rows.pop() if cell)
+                if cells:
+                    # Nested table: its rows belong to the enclosing cell
+                    cells[-1].append(row)
+                else:
+                    yield row + '\n'
+                    _release(element)
+                    continue
+            element.clear(keep_tail=False)
+
+
+def _iter_txt(source: Source, max_pages: int, parallel: Optional[bool] = None) -> Iterator[str]:
+    data = _read_bytes(source)
+    encoding = _text_encoding(data[:_SNIFF_BYTES]) or 'utf-8'
+    yield data.decode(encoding, errors='replace')
+
+
+_PAGE_ITERATORS = {
+    'pdf': _iter_pdf,
+    'docx': _iter_docx,
+    'txt': _iter_txt
+}
+
+
+def iter_pages(source: Source, fmt: Optional[str] = None,
+               max_pages: int = DEFAULT_MAX_PAGES,
+               parallel: Optional[bool] = None) -> Iterator[str]:
+    """Stream the text of each page (PDF), paragraph (DOCX) or file (TXT)"""
+    fmt = fmt or sniff_format(source)
+    return _PAGE_ITERATORS[fmt](source, max_pages, parallel)
+
+
+def extract_text(source: Source, max_pages: int = DEFAULT_MAX_PAGES,
+                 max_chars: int = DEFAULT_MAX_CHARS,
+                 parallel: Optional[bool] = None) -> str:
+    """
+    Extract text from a PDF, DOCX or TXT document
+
+    Args:
+        source: Path, bytes or binary file-like object
+        max_pages: Stop after this many PDF pages
+        max_chars: Stop once this many characters have been collected
+        parallel: Read PDF page ranges in the process pool; None decides
+            by PARALLEL_PAGE_THRESHOLD, False always reads serially
+
+    Returns:
+        Extracted text, stripped
+
+    Raises:
+        UnsupportedDocumentError: the data is not a supported format
+        DocumentExtractionError: the document could not be read
+    """
+    fmt = sniff_format(source)
+    parts = []
+    remaining = max_chars
+
+    pages = iter_pages(source, fmt, max_pages, parallel)
+    try:
+        for text in pages:
+            if len(text) >= remaining:
+                parts.append(text[:remaining])
+                break
+            parts.append(text)
+            remaining -= len(text)
+    except DocumentExtractionError:
+        raise
+    except Exception as e:
+        raise DocumentExtractionError(f"Could not read {fmt.upper()} document: {e}") from e
+    finally:
+        pages.close()
+
+    return ''.join(parts).strip()
+
+
+def _extract_or_error(source: Source, max_pages: int, max_chars: int) -> Union[str, DocumentExtractionError]:
+    """Worker: extract one document serially, returning the error instead of raising"""
+    try:
+        return extract_text(source, max_pages, max_chars, parallel=False)
+    except DocumentExtractionError as e:
+        return e
+    except OSError as e:
+        return DocumentExtractionError(f"Could not open document: {e}")
+
+
+def extract_texts(sources: Iterable[Source], max_pages: int = DEFAULT_MAX_PAGES,
+                  max_chars: int = DEFAULT_MAX_CHARS) -> List[Union[str, DocumentExtractionError]]:
+    """
+    Extract several documents concurrently in the process pool
+
+    Returns:
+        One entry per source, in input order: the extracted text, or the
+        DocumentExtractionError raised for that document
+    """
+    sources = [_picklable_source(source) for source in sources]
+    if len(sources) < 2 or PARALLEL_WORKERS < 2:
+        return [_extract_or_error(source, max_pages, max_chars) for source in sources]
+    try:
+        return list(_get_pool().map(_extract_or_error, sources,
+                                    [max_pages] * len(sources), [max_chars] * len(sources)))
+    except BrokenProcessPool as e:
+        logger.warning(f"Extraction worker pool failed, reading serially: {e}")
+        _reset_pool()
+        return [_extract_or_error(source, max_pages, max_chars) for source in sources]